@@ -0,0 +1,80 @@
+"""
+OpenClaw decision latency: pooled gateway client vs one CLI process per call.
+Runs against the stub gateway unless --gateway points at a real one.
+
+    python bench_openclaw.py --calls 50
+    python bench_openclaw.py --gateway http://127.0.0.1:18789 --cli openclaw
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import openclaw_client
+from openclaw_stub_gateway import start_stub_gateway
+
+STATE = {"down": 3, "yards_to_go": 7, "field_position": 45, "user_play": "PASS"}
+
+
+def timed(fn, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies, baseline=None):
+    p50 = statistics.median(latencies)
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    speedup = f"  ({baseline / p50:.1f}x faster)" if baseline else ""
+    print(f"⏱️  {name:<12} p50 {p50:8.2f} ms   p95 {p95:8.2f} ms{speedup}")
+    return p50
+
+
+async def concurrent(calls, width):
+    """`width` decisions in flight at once over the shared pool"""
+    start = time.perf_counter()
+    for _ in range(0, calls, width):
+        await asyncio.gather(*[openclaw_client.get_ai_decision_async(STATE) for _ in range(width)])
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--delay", type=float, default=0.0, help="Stub gateway model latency (seconds)")
+    parser.add_argument("--gateway", help="Real gateway URL (default: start the stub)")
+    parser.add_argument("--cli", default=f"{sys.executable} {os.path.abspath('openclaw_stub_gateway.py')}",
+                        help="CLI command for the subprocess path")
+    args = parser.parse_args()
+
+    server = None
+    if args.gateway:
+        openclaw_client.OPENCLAW_GATEWAY = args.gateway
+    else:
+        server, openclaw_client.OPENCLAW_GATEWAY = start_stub_gateway(delay=args.delay)
+    os.environ["OPENCLAW_GATEWAY"] = openclaw_client.OPENCLAW_GATEWAY
+    openclaw_client.OPENCLAW_CLI = args.cli
+
+    cli = report("cli", timed(lambda: openclaw_client.get_ai_decision_cli(STATE), max(5, args.calls // 5)))
+    report("http (sync)", timed(lambda: openclaw_client.get_ai_decision(STATE), args.calls), cli)
+
+    async def run_async():
+        latencies = []
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            await openclaw_client.get_ai_decision_async(STATE)
+            latencies.append((time.perf_counter() - start) * 1000)
+        report("http (async)", latencies, cli)
+        per_call = await concurrent(args.calls, 8)
+        print(f"⏱️  {'async x8':<12} {per_call:8.2f} ms per decision (8 in flight)")
+    asyncio.run(run_async())
+
+    if server:
+        print(f"🔌 stub served {server.RequestHandlerClass.requests_served} requests "
+              f"over {len(server.RequestHandlerClass.connections)} connections")
+        server.shutdown()
@@ -0,0 +1,92 @@
+"""
+Physics engine benchmark: plays and steps per second for each backend.
+
+Plays run to full length by default so both engines time the same work; with
+--early-stop each engine ends plays on its own dead ball, so compare steps/sec.
+
+    python bench_physics.py --plays 200
+    python bench_physics.py --headless --keyframes 10   (record=False only skips frame
+        building, so expect ~1.15x (numpy) to ~1.25x (pymunk): the physics step dominates)
+    python bench_physics.py --early-stop   (stop DEAD_BALL_TAIL steps after the dead ball)
+    python bench_physics.py --setup        (formation setup cost: pooled vs rebuilt bodies)
+"""
+import argparse
+import random
+import time
+
+from nfl_physics import NFLPhysicsWorld, OFFENSE_FORMATION, DEFENSE_FORMATION
+from run_nfl_sim import PHYSICS_ENGINES
+
+PLAYS = [(25, 'PASS'), (40, 'RUN'), (60, 'PASS'), (10, 'RUN'), (75, 'PASS')]
+
+
+def bench_engine(engine, num_plays, steps=120, record=True, keyframe_every=0, tail=None):
+    world = PHYSICS_ENGINES[engine](rng=random.Random(0))
+    total_steps = 0
+    start = time.perf_counter()
+    for n in range(num_plays):
+        yard_line, action = PLAYS[n % len(PLAYS)]
+        world.setup_formation(yard_line)
+        summary = world.run_play(action, steps=steps, record=record, keyframe_every=keyframe_every, tail=tail)
+        total_steps += summary["steps"]
+        world.frames = []
+    elapsed = time.perf_counter() - start
+    return num_plays / elapsed, elapsed, total_steps / elapsed
+
+
+def rebuild_formation(world, yard_line):
+    """The old setup_formation: tear down the Space and build 22 new bodies"""
+    x_start = yard_line - 50.0
+    for b in list(world.space.bodies):
+        world.space.remove(b, *b.shapes)
+    world.offense = {}
+    world.defense = {}
+    for role, dx, y in OFFENSE_FORMATION:
+        world.add_player(1, (x_start + dx, y), role)
+    for role, dx, y in DEFENSE_FORMATION:
+        world.add_player(2, (x_start + dx, y), role)
+    world.reset_ball()
+
+
+def bench_setup(num_plays):
+    """Microseconds per formation setup, pooled bodies vs rebuilt"""
+    world = NFLPhysicsWorld(rng=random.Random(0))
+    timings = {}
+    for name, setup in (("rebuilt", rebuild_formation), ("pooled", NFLPhysicsWorld.setup_formation)):
+        start = time.perf_counter()
+        for n in range(num_plays):
+            setup(world, PLAYS[n % len(PLAYS)][0])
+        timings[name] = (time.perf_counter() - start) / num_plays * 1e6
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plays", type=int, default=100, help="Plays per engine")
+    parser.add_argument("--steps", type=int, default=120, help="Play steps (after snap)")
+    parser.add_argument("--headless", action="store_true", help="Also time outcome-only plays (record=False)")
+    parser.add_argument("--keyframes", type=int, default=0, help="Headless keyframe interval (0 = none)")
+    parser.add_argument("--early-stop", action="store_true", help="End plays after the dead ball (engines then run different lengths)")
+    parser.add_argument("--setup", action="store_true", help="Only time formation setup (pymunk)")
+    args = parser.parse_args()
+
+    if args.setup:
+        timings = bench_setup(args.plays * 20)
+        for name, usec in timings.items():
+            print(f"🏗️  {name:<8} {usec:8.1f} µs/setup")
+        print(f"📈 pooled vs rebuilt: {timings['rebuilt'] / timings['pooled']:.1f}x")
+        raise SystemExit
+    tail = NFLPhysicsWorld.DEAD_BALL_TAIL if args.early_stop else None
+
+    results = {}
+    for engine in PHYSICS_ENGINES:
+        rate, elapsed, results[engine] = bench_engine(engine, args.plays, args.steps, tail=tail)
+        print(f"⚙️  {engine:<8} {rate:8.1f} plays/sec {results[engine]:9.0f} steps/sec ({elapsed:.2f}s for {args.plays} plays)")
+        if args.headless:
+            _, elapsed, step_rate = bench_engine(engine, args.plays, args.steps, record=False, keyframe_every=args.keyframes, tail=tail)
+            print(f"   headless {step_rate:9.0f} steps/sec ({step_rate / results[engine]:.2f}x vs recorded)")
+
+    if "pymunk" in results:
+        for engine, step_rate in results.items():
+            if engine != "pymunk":
+                print(f"📈 {engine} vs pymunk: {step_rate / results['pymunk']:.2f}x steps/sec")
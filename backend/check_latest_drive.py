@@ -10,8 +10,8 @@ async def check():
     uri = os.getenv("MONGO_URI")
     client = motor.motor_asyncio.AsyncIOMotorClient(uri)
     db = client.supersim_ai
-    drives = db.drives
-    latest = await drives.find().sort('created_at', -1).limit(1).to_list(1)
+    drive_summaries = db.drive_summaries
+    latest = await drive_summaries.find().sort('created_at', -1).limit(1).to_list(1)
     if latest:
         drive = latest[0]
         print(f"Latest Drive ID: {drive['_id']}")
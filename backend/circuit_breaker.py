@@ -0,0 +1,183 @@
+"""
+Circuit Breaker for LLM backends
+Replaces the sticky LLM_OFFLINE flag: one failure no longer downgrades a
+process forever, and a slow backend stops costing a full timeout per play.
+
+- closed:    calls go through; outcomes land in a rolling window
+- open:      too many failures (or slow calls) in the window; calls are
+             rejected immediately for LLM_BREAKER_OPEN_SECONDS
+- half_open: after that, a few probe calls are let through; success
+             closes the circuit, failure reopens it
+
+Wrap each allowed call in `with breaker.call():` so its outcome is always
+recorded: success on a normal exit, failure on an exception, and a neutral
+release of the probe slot if the call is cancelled.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))  # Recent calls considered
+BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_SECONDS", "2.0"))
+BREAKER_SLOW_RATE = float(os.getenv("LLM_BREAKER_SLOW_RATE", "0.8"))
+BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", "2"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 failure_rate=BREAKER_FAILURE_RATE, slow_seconds=BREAKER_SLOW_SECONDS,
+                 slow_rate=BREAKER_SLOW_RATE, open_seconds=BREAKER_OPEN_SECONDS,
+                 half_open_probes=BREAKER_HALF_OPEN_PROBES):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_seconds = slow_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.outcomes = deque(maxlen=window)  # (failed, slow) per call
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.last_error = None
+        self.lock = threading.Lock()
+        self.counters = {"calls": 0, "successes": 0, "failures": 0, "slow": 0, "rejected": 0, "fallbacks": 0,
+                         "cancelled": 0, "opened": 0}
+
+    def allow(self):
+        """May a call go to the backend now? Rejected calls should fall back."""
+        with self.lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self.counters["rejected"] += 1
+                    return False
+                self.state = HALF_OPEN
+                self.probes_in_flight = 0
+                self.probe_successes = 0
+            if self.state == HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_probes:
+                    self.counters["rejected"] += 1
+                    return False
+                self.probes_in_flight += 1
+            self.counters["calls"] += 1
+            return True
+
+    @contextmanager
+    def call(self):
+        """
+        Record the outcome of one allowed call (after allow() returned True).
+        Exceptions are recorded as failures and re-raised; cancellation
+        (or any other BaseException) just gives the probe slot back.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success(time.perf_counter() - started)
+
+    def _end_probe(self):
+        self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def release(self):
+        """An allowed call ended with no verdict (cancelled): free its probe slot"""
+        with self.lock:
+            self.counters["cancelled"] += 1
+            if self.state == HALF_OPEN:
+                self._end_probe()
+
+    def record_success(self, latency):
+        with self.lock:
+            slow = latency >= self.slow_seconds
+            self.counters["successes"] += 1
+            self.counters["slow"] += slow
+            if self.state == HALF_OPEN:
+                self._end_probe()
+                if slow:
+                    self._open("slow probe")
+                    return
+                self.probe_successes += 1
+                if self.probe_successes >= self.half_open_probes:
+                    self.state = CLOSED
+                    self.outcomes.clear()
+                return
+            self.outcomes.append((False, slow))
+            self._check()
+
+    def record_failure(self, error=None):
+        with self.lock:
+            self.counters["failures"] += 1
+            self.last_error = repr(error) if error is not None else None
+            if self.state == HALF_OPEN:
+                self._end_probe()
+                self._open("failed probe")
+                return
+            self.outcomes.append((True, False))
+            self._check()
+
+    def record_fallback(self):
+        """A decision was made without the backend (rejected or failed call)"""
+        with self.lock:
+            self.counters["fallbacks"] += 1
+
+    def _check(self):
+        if self.state != CLOSED or len(self.outcomes) < self.min_calls:
+            return
+        n = len(self.outcomes)
+        failures = sum(failed for failed, _ in self.outcomes)
+        slow = sum(s for _, s in self.outcomes)
+        if failures / n >= self.failure_rate:
+            self._open(f"{failures}/{n} calls failed")
+        elif slow / n >= self.slow_rate:
+            self._open(f"{slow}/{n} calls slower than {self.slow_seconds}s")
+
+    def _open(self, reason):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.counters["opened"] += 1
+        print(f"LOG:> 🔌 LLM circuit '{self.name}' opened: {reason}")
+
+    def snapshot(self):
+        with self.lock:
+            n = len(self.outcomes)
+            return {
+                "state": self.state,
+                "open_for_s": round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+                if self.state == OPEN else 0.0,
+                "window": n,
+                "failure_rate": round(sum(f for f, _ in self.outcomes) / n, 3) if n else 0.0,
+                "slow_rate": round(sum(s for _, s in self.outcomes) / n, 3) if n else 0.0,
+                "last_error": self.last_error,
+                **self.counters,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Process-wide breaker for backend `name`"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def breaker_snapshot():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
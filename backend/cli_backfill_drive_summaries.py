@@ -0,0 +1,41 @@
+"""
+Backfill drive_summaries for drives archived before summaries were split
+out of the drives collection. Safe to re-run (upserts by drive _id).
+
+    python cli_backfill_drive_summaries.py
+"""
+import asyncio
+from pymongo import UpdateOne
+
+from database import drives, drive_summaries
+
+SUMMARY_FIELDS = [
+    "team_id", "team_name", "opponent", "outcome", "score", "xp_earned",
+    "strategy_prompt", "created_at", "stats", "moltbook_url"
+]
+BATCH_SIZE = 500
+
+
+async def backfill():
+    # Legacy drive docs carry their summary fields inline
+    projection = {field: 1 for field in SUMMARY_FIELDS}
+    cursor = drives.find({"outcome": {"$exists": True}}, projection)
+
+    ops = []
+    total = 0
+    async for drive in cursor:
+        summary = {field: drive.get(field) for field in SUMMARY_FIELDS}
+        ops.append(UpdateOne({"_id": drive["_id"]}, {"$setOnInsert": summary}, upsert=True))
+        if len(ops) >= BATCH_SIZE:
+            await drive_summaries.bulk_write(ops, ordered=False)
+            total += len(ops)
+            ops = []
+    if ops:
+        await drive_summaries.bulk_write(ops, ordered=False)
+        total += len(ops)
+
+    print(f"✅ Backfilled {total} drive summaries")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,66 @@
+"""
+Prune stored replay chunks for old drives that can be re-simulated.
+A drive qualifies when it recorded its seed + coach decisions and was
+simulated by the current ENGINE_VERSION. Each replay is regenerated and
+compared with the archived chunks first; only exact matches are pruned
+(manifest store becomes "regen", GET /drives/{id} rebuilds on demand).
+
+    python cli_prune_replays.py --days 30
+    python cli_prune_replays.py --days 30 --dry-run
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from database import db, drives
+from replay_store import get_replay_store, ReplayChunkMissing
+from run_nfl_sim import regenerate_replay, ENGINE_VERSION
+
+
+async def prune(days, dry_run=False):
+    store = get_replay_store(db)
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    cursor = drives.find({
+        "created_at": {"$lt": cutoff},
+        "seed": {"$exists": True},
+        "engine_version": ENGINE_VERSION,
+        "replay.play_count": {"$exists": True},
+        "replay.store": {"$ne": "regen"},
+    }, {"replay": 1, "seed": 1, "decisions": 1, "engine": 1, "engine_version": 1})
+
+    pruned = mismatched = missing = 0
+    async for drive in cursor:
+        manifest = drive["replay"]
+        try:
+            stored = [json.loads(raw) async for raw in store.iter_play_json(drive["_id"], manifest["play_count"])]
+        except ReplayChunkMissing as e:
+            missing += 1
+            print(f"⚠️  {drive['_id']}: {e}, can't verify regeneration, keeping it")
+            continue
+        replay = await asyncio.to_thread(
+            regenerate_replay, drive["seed"], drive["decisions"], drive["engine"], drive["engine_version"]
+        )
+        # Round-trip through JSON so tuples/lists compare like the stored chunks
+        if json.loads(json.dumps(replay["plays"])) != stored:
+            mismatched += 1
+            print(f"⚠️  {drive['_id']}: regenerated replay differs, keeping chunks")
+            continue
+
+        pruned += 1
+        if dry_run:
+            print(f"🔍 {drive['_id']}: would prune {manifest['play_count']} chunks")
+            continue
+        await drives.update_one({"_id": drive["_id"]}, {"$set": {"replay.store": "regen"}})
+        await store.delete(drive["_id"])
+        print(f"🗑️  {drive['_id']}: pruned {manifest['play_count']} chunks")
+
+    print(f"✅ {'Would prune' if dry_run else 'Pruned'} {pruned} replays ({mismatched} kept, regeneration mismatch; {missing} kept, chunks missing)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=30, help="Only prune drives older than this")
+    parser.add_argument("--dry-run", action="store_true", help="Verify regeneration without deleting")
+    args = parser.parse_args()
+    asyncio.run(prune(args.days, args.dry_run))
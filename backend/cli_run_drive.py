@@ -2,6 +2,7 @@ import requests
 import sys
 import json
 import argparse
+import time
 
 BACKEND_URL = "http://localhost:8000"
 
@@ -45,7 +46,18 @@ def run_drive(team_id, wallet="0xAgent"):
             headers={"x-wallet-address": wallet}
         )
         res.raise_for_status()
-        data = res.json()
+        job = res.json()
+        
+        # Drive runs as a background job: poll until it settles
+        while job["status"] not in ("done", "failed", "cancelled"):
+            time.sleep(2)
+            res = requests.get(f"{BACKEND_URL}/drive/jobs/{job['job_id']}")
+            res.raise_for_status()
+            job = res.json()
+        if job["status"] != "done":
+            print(f"❌ Drive {job['status']}: {job.get('error')}")
+            return None
+        data = job["result"]
         
         # Parse result
         result = data.get("result", {})
@@ -0,0 +1,229 @@
+"""
+Coach Decision Cache
+Most drives share a handful of strategies ("Play to win", ...), and the
+coach only sees down, distance, field position and score, so the same
+prompt reaches Ollama over and over. Decisions are cached per
+(normalized strategy hash, bucketed game situation):
+
+- bounded LRU with a TTL per entry
+- up to COACH_CACHE_VARIANTS decisions per key; a hit picks one at random,
+  and COACH_CACHE_EXPLORE of lookups skip the cache to add fresh variety
+- hit/miss/explore/eviction counters (stats())
+- optional shared Mongo backend (COACH_CACHE_BACKEND=mongo) behind the
+  in-process LRU, so every drive worker benefits from the others' calls;
+  async callers (get_async/put_async) reach it from a thread, never the loop
+"""
+import asyncio
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+COACH_CACHE_SIZE = int(os.getenv("COACH_CACHE_SIZE", "2048"))
+COACH_CACHE_TTL = float(os.getenv("COACH_CACHE_TTL", "21600"))  # 6h
+COACH_CACHE_EXPLORE = float(os.getenv("COACH_CACHE_EXPLORE", "0.1"))  # Fraction of lookups sent to the LLM anyway
+COACH_CACHE_VARIANTS = int(os.getenv("COACH_CACHE_VARIANTS", "4"))
+COACH_CACHE_BACKEND = os.getenv("COACH_CACHE_BACKEND", "memory")  # memory | mongo
+
+
+def strategy_hash(strategy_prompt):
+    """Case/whitespace/punctuation-insensitive hash of a strategy"""
+    normalized = re.sub(r"[^a-z0-9 ]", "", " ".join((strategy_prompt or "").lower().split()))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _bucket(value, edges):
+    """Index of the first edge value is <= to (len(edges) if above all)"""
+    for i, edge in enumerate(edges):
+        if value <= edge:
+            return i
+    return len(edges)
+
+
+def situation_key(game_state):
+    """Bucketed (down, to_go, yard line, score differential)"""
+    team, opponent = (int(p) for p in game_state["score"].split("-"))
+    return (
+        game_state["down"],
+        _bucket(game_state["to_go"], [2, 6, 10]),            # short / medium / long / very long
+        _bucket(game_state["yards"], [20, 50, 80, 90]),      # own territory ... red zone, goal line
+        _bucket(team - opponent, [-9, -1, 0, 8]),            # down 2 scores, down, tied, up, up 2 scores
+    )
+
+
+def cache_key(strategy_prompt, game_state):
+    down, to_go, yards, diff = situation_key(game_state)
+    return f"{strategy_hash(strategy_prompt)}:{down}:{to_go}:{yards}:{diff}"
+
+
+class MongoCoachBackend:
+    """Shared decisions in `coach_decisions` (sync pymongo: drive workers aren't async)"""
+
+    def __init__(self, ttl=COACH_CACHE_TTL):
+        from pymongo import MongoClient
+        from query_profiler import query_profiler
+        self.ttl = ttl
+        client = MongoClient(os.getenv("MONGO_URI"), event_listeners=[query_profiler])  # Slow queries logged in the worker
+        self.collection = client.supersim_ai.coach_decisions
+        self.indexed = False
+
+    def ensure_index(self):
+        """TTL index, created on first use (not at import: every process imports this)"""
+        if not self.indexed:
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self.indexed = True
+
+    def get(self, key):
+        self.ensure_index()
+        doc = self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        return doc["decisions"] if doc else None
+
+    def add(self, key, decision, max_variants):
+        self.ensure_index()
+        self.collection.update_one(
+            {"_id": key},
+            {
+                "$push": {"decisions": {"$each": [list(decision)], "$slice": -max_variants}},
+                "$set": {"expires_at": datetime.utcnow() + timedelta(seconds=self.ttl)},
+            },
+            upsert=True
+        )
+
+
+class CoachDecisionCache:
+    def __init__(self, max_size=COACH_CACHE_SIZE, ttl=COACH_CACHE_TTL, explore=COACH_CACHE_EXPLORE,
+                 max_variants=COACH_CACHE_VARIANTS, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.explore = explore
+        self.max_variants = max_variants
+        self.backend = backend
+        self.entries = OrderedDict()  # key -> (expires_at, [[action, reason], ...])
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "explores": 0, "evictions": 0, "expired": 0, "shared_hits": 0}
+
+    def _local(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            self.counters["expired"] += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, decisions):
+        self.entries[key] = (time.monotonic() + self.ttl, decisions)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def get(self, strategy_prompt, game_state, rng=None, counters=None):
+        """
+        A cached (action, reason), or None to ask the coach (miss or exploration).
+        `counters` (e.g. one drive's) gets the same hits/misses/explores counts.
+        """
+        key = cache_key(strategy_prompt, game_state)
+        with self.lock:
+            decisions = self._local(key)
+        if decisions is None and self.backend is not None:
+            decisions = self._shared_fill(key)
+        return self._choose(decisions, rng, counters)
+
+    async def get_async(self, strategy_prompt, game_state, rng=None, counters=None):
+        """get() for the event loop: the shared backend is queried from a thread"""
+        key = cache_key(strategy_prompt, game_state)
+        with self.lock:
+            decisions = self._local(key)
+        if decisions is None and self.backend is not None:
+            decisions = await asyncio.to_thread(self._shared_fill, key)
+        return self._choose(decisions, rng, counters)
+
+    def _shared_fill(self, key):
+        decisions = self._shared_get(key)
+        if decisions:
+            with self.lock:
+                self._store(key, decisions)
+                self.counters["shared_hits"] += 1
+        return decisions
+
+    def _choose(self, decisions, rng, counters):
+        rng = rng or random
+        with self.lock:
+            if not decisions:
+                outcome = "misses"
+            # Keep some variety: occasionally ask the coach even on a hit
+            elif len(decisions) < self.max_variants and rng.random() < self.explore:
+                outcome = "explores"
+            else:
+                outcome = "hits"
+            self.counters[outcome] += 1
+        if counters is not None:
+            counters[outcome] = counters.get(outcome, 0) + 1
+        if outcome != "hits":
+            return None
+        action, reason = rng.choice(decisions)
+        return action, reason
+
+    def _put_local(self, strategy_prompt, game_state, action, reason):
+        key = cache_key(strategy_prompt, game_state)
+        decision = [action, reason]
+        with self.lock:
+            decisions = list(self._local(key) or [])
+            if decision not in decisions:
+                decisions = (decisions + [decision])[-self.max_variants:]
+            self._store(key, decisions)
+        return key, decision
+
+    def put(self, strategy_prompt, game_state, action, reason):
+        key, decision = self._put_local(strategy_prompt, game_state, action, reason)
+        if self.backend is not None:
+            self._shared_add(key, decision)
+
+    async def put_async(self, strategy_prompt, game_state, action, reason):
+        """put() for the event loop: the shared backend is written from a thread"""
+        key, decision = self._put_local(strategy_prompt, game_state, action, reason)
+        if self.backend is not None:
+            await asyncio.to_thread(self._shared_add, key, decision)
+
+    def _shared_get(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"LOG:> ⚠️ Coach cache backend unavailable: {e}")
+            return None
+
+    def _shared_add(self, key, decision):
+        try:
+            self.backend.add(key, decision, self.max_variants)
+        except Exception as e:
+            print(f"LOG:> ⚠️ Coach cache backend unavailable: {e}")
+
+    def stats(self):
+        with self.lock:
+            lookups = self.counters["hits"] + self.counters["misses"] + self.counters["explores"]
+            return {
+                **self.counters,
+                "size": len(self.entries),
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+def build_coach_cache():
+    """The configured per-process cache (COACH_CACHE_BACKEND=memory|mongo)"""
+    backend = None
+    if COACH_CACHE_BACKEND == "mongo":
+        try:
+            backend = MongoCoachBackend()
+        except Exception as e:
+            print(f"LOG:> ⚠️ Coach cache: Mongo backend disabled ({e})")
+    return CoachDecisionCache(backend=backend)
+
+
+coach_cache = build_coach_cache()
@@ -5,6 +5,8 @@ from typing import Optional, List, Annotated
 
 from dotenv import load_dotenv
 
+from query_profiler import query_profiler
+
 load_dotenv()
 
 # MongoDB Config
@@ -12,11 +14,13 @@ MONGO_URI = os.getenv("MONGO_URI")
 if not MONGO_URI:
     raise ValueError("MONGO_URI is not set in environment or .env file")
 
-client = AsyncIOMotorClient(MONGO_URI)
+client = AsyncIOMotorClient(MONGO_URI, event_listeners=[query_profiler])  # Per-collection timings (/health/db)
 db = client.supersim_ai
 
 teams = db.get_collection("teams")
-drives = db.get_collection("drives")
+drives = db.get_collection("drives")  # Replay payloads (manifest + logs)
+drive_summaries = db.get_collection("drive_summaries")  # Slim rows for history/stats
+tournaments = db.get_collection("tournaments")  # One doc per tournament, matches appended as played
 
 # Helper for ObjectId
 PyObjectId = Annotated[str, BeforeValidator(str)]
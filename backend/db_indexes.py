@@ -0,0 +1,92 @@
+"""
+Database Indexes
+Every index the app needs, declared in one place (INDEXES), next to the
+queries they serve (QUERIES).
+
+- ensure_indexes(): create them all at API startup (idempotent)
+- missing_indexes(): what the server doesn't have yet (/health/db)
+- covering_index(): which declared index serves a query shape
+  (test_db_indexes checks every entry in QUERIES has one, and with
+  MONGO_URI set, that the server's plan for each is neither a COLLSCAN
+  nor an in-memory SORT)
+
+Store-specific TTL indexes stay with their stores (game_sessions,
+coach_cache) since they only exist when that backend is configured.
+"""
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+INDEXES = {
+    "teams": [
+        IndexModel([("owner_wallet", ASCENDING), ("_id", ASCENDING)]),
+    ],
+    "drive_summaries": [
+        IndexModel([("team_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "drives": [
+        IndexModel([("created_at", ASCENDING)]),
+    ],
+    "tournaments": [
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("runner.heartbeat", ASCENDING)]),
+    ],
+    "replays.files": [
+        IndexModel([("metadata.drive_id", ASCENDING)]),
+    ],
+}
+
+# (collection, filter fields, sort [(field, direction)], used by)
+# Keyset cursors filter on the sort keys themselves, so they add no filter fields here.
+QUERIES = [
+    ("teams", ["owner_wallet"], [("_id", ASCENDING)], "GET /teams/mine, POST /teams team limit"),
+    ("teams", [], [("_id", ASCENDING)], "GET /teams (keyset on _id)"),
+    ("teams", ["_id"], [], "team lookups, tournament seeding"),
+    ("drive_summaries", ["team_id"], [("created_at", DESCENDING), ("_id", DESCENDING)],
+     "GET /teams/{id}/drives (keyset on created_at, _id)"),
+    ("drive_summaries", [], [("created_at", DESCENDING)], "check_latest_drive"),
+    ("drives", ["_id"], [], "GET /drives/{id}"),
+    ("drives", ["created_at"], [], "cli_prune_replays"),
+    ("tournaments", ["status"], [("created_at", DESCENDING)], "GET /tournaments"),
+    ("tournaments", ["status", "runner.heartbeat"], [], "tournament resumer (stale leases)"),
+    ("replays.files", ["metadata.drive_id"], [], "GridFSReplayStore.delete"),
+]
+ID_INDEX = IndexModel([("_id", ASCENDING)], name="_id_")  # Every collection has it
+
+
+def index_name(model: IndexModel) -> str:
+    return model.document["name"]
+
+
+def index_fields(model: IndexModel) -> list:
+    return list(model.document["key"])
+
+
+def covering_index(collection: str, filter_fields: list, sort: list = ()):
+    """
+    Name of the declared index (or _id_) whose key prefix is the filter
+    fields then the sort, walked either way (None if none)
+    """
+    sort = list(sort)
+    reversed_sort = [(field, -direction) for field, direction in sort]
+    for model in INDEXES.get(collection, []) + [ID_INDEX]:
+        keys = list(model.document["key"].items())
+        n = len(filter_fields)
+        if {field for field, _ in keys[:n]} == set(filter_fields) and keys[n:n + len(sort)] in (sort, reversed_sort):
+            return index_name(model)
+    return None
+
+
+async def ensure_indexes(database):
+    """Create every declared index (no-op for the ones that exist)"""
+    for collection, models in INDEXES.items():
+        await database.get_collection(collection).create_indexes(models)
+    print(f"LOG:> 🗂️ Indexes ensured ({sum(len(m) for m in INDEXES.values())} on {len(INDEXES)} collections)")
+
+
+async def missing_indexes(database) -> list:
+    """'collection.index_name' for each declared index the server doesn't have"""
+    missing = []
+    for collection, models in INDEXES.items():
+        existing = {index["name"] async for index in database.get_collection(collection).list_indexes()}
+        missing += [f"{collection}.{index_name(m)}" for m in models if index_name(m) not in existing]
+    return missing
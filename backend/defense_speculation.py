@@ -0,0 +1,85 @@
+"""
+Defense Speculation
+The AI's defensive call depends only on the session state and the user's
+play, and there are just four user plays. As soon as a play session reaches
+a new state, DefenseSpeculator asks OpenClaw for the defense against all
+four in parallel; when the user picks, that answer is (usually) already in.
+
+Calls made for the plays the user didn't pick are counted as wasted.
+Not used with OPENCLAW_TRANSPORT=cli: a CLI call runs in a thread that
+cancelling can't stop, so every state would cost four full CLI runs.
+"""
+import asyncio
+
+import openclaw_client
+from openclaw_client import get_ai_decision_async
+
+USER_PLAYS = ("RUN", "PASS", "PUNT", "FG")
+STATE_KEYS = ("down", "yards_to_go", "field_position", "score_user", "score_ai")
+
+# Totals across all sessions in this process (see /health/llm)
+totals = {"sessions": 0, "speculated": 0, "hits": 0, "misses": 0, "wasted": 0}
+
+
+def state_key(state: dict) -> tuple:
+    return tuple(state.get(k) for k in STATE_KEYS)
+
+
+def speculation_stats(counters: dict) -> dict:
+    resolved = counters["hits"] + counters["misses"]
+    return {**counters, "hit_rate": round(counters["hits"] / resolved, 3) if resolved else None}
+
+
+class DefenseSpeculator:
+    """Precomputed AI defense for every user play from one session state"""
+
+    def __init__(self, decide=get_ai_decision_async, enabled=None):
+        self.decide = decide
+        self.enabled = openclaw_client.OPENCLAW_TRANSPORT != "cli" if enabled is None else enabled
+        self.key = None
+        self.tasks = {}  # user play -> task
+        self.counters = {"speculated": 0, "hits": 0, "misses": 0, "wasted": 0}
+        totals["sessions"] += 1
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+        totals[name] += n
+
+    def speculate(self, state: dict):
+        """Start the defensive call for each possible user play from `state`"""
+        self.discard()
+        if not self.enabled:
+            return
+        self.key = state_key(state)
+        self.tasks = {
+            play: asyncio.ensure_future(self.decide({**state, "user_play": play}, "defense"))
+            for play in USER_PLAYS
+        }
+        self.count("speculated", len(self.tasks))
+
+    def discard(self):
+        """Drop speculative calls nobody will use"""
+        for task in self.tasks.values():
+            task.cancel()
+        self.count("wasted", len(self.tasks))
+        self.tasks = {}
+
+    async def resolve(self, state: dict, user_play: str):
+        """
+        The AI's defense against `user_play` from `state`.
+        Returns (decision, hit): hit means it came from speculation.
+        """
+        task = self.tasks.pop(user_play, None) if state_key(state) == self.key else None
+        self.discard()
+        if task is None:
+            self.count("misses")
+            return await self.decide({**state, "user_play": user_play}, "defense"), False
+        self.count("hits")
+        return await task, True
+
+    def stats(self) -> dict:
+        return speculation_stats(self.counters)
+
+
+def totals_snapshot() -> dict:
+    return speculation_stats(totals)
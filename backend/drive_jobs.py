@@ -0,0 +1,268 @@
+"""
+Drive Job Queue
+Runs drive simulations in a bounded pool of worker processes so the
+API event loop stays free while physics and coach calls are running.
+Streaming jobs also send per-play events back from the worker as they
+happen (job.events).
+"""
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DRIVE_WORKERS = int(os.getenv("DRIVE_WORKERS", "2"))
+DRIVE_QUEUE_DEPTH = int(os.getenv("DRIVE_QUEUE_DEPTH", "8"))  # queued + running
+DRIVE_JOB_TTL = float(os.getenv("DRIVE_JOB_TTL", "600"))  # keep finished jobs for polling (sec)
+DRIVE_CLIENT_TIMEOUT = float(os.getenv("DRIVE_CLIENT_TIMEOUT", "30"))  # no poll for this long = client gone
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Drive queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class DriveJob:
+    """A single queued drive simulation"""
+
+    def __init__(self, team_id=None):
+        self.id = uuid.uuid4().hex
+        self.team_id = team_id
+        self.status = "queued"  # queued, running, done, failed, cancelled
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.last_seen = self.created_at
+        self.cancel_requested = False
+        self.task = None
+        self.done = asyncio.Event()
+        self.events = []  # Per-play events from a streaming worker, in order
+        self.progress = asyncio.Event()  # Set (and replaced) on each new event or when finished
+        self.stop = None  # Streaming jobs: set to ask the worker to stop early
+
+    def add_event(self, event):
+        self.events.append(event)
+        self.progress.set()
+        self.progress = asyncio.Event()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "team_id": self.team_id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "queued_for": round((self.started_at or time.time()) - self.created_at, 2),
+            "running_for": round((self.finished_at or time.time()) - self.started_at, 2) if self.started_at else 0,
+        }
+
+
+class DriveJobQueue:
+    """
+    Bounded job queue in front of a process pool.
+
+    At most `max_workers` jobs run at once; the rest wait here (not in the
+    pool) so they can still be cancelled. Submissions beyond `max_depth`
+    are rejected with a QueueFullError carrying a Retry-After estimate.
+    """
+
+    def __init__(self, max_workers=DRIVE_WORKERS, max_depth=DRIVE_QUEUE_DEPTH):
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.jobs = {}
+        self._pool = None
+        self._manager = None  # Queues/events shared with streaming workers
+        self._slots = None
+        self._avg_duration = 30.0  # seconds, refined as jobs finish
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _get_manager(self):
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    def _active(self):
+        return [j for j in self.jobs.values() if not j.finished]
+
+    def retry_after(self):
+        """Rough seconds until a slot frees up"""
+        backlog = len(self._active()) - self.max_workers + 1
+        waves = max(1, -(-backlog // self.max_workers))
+        return max(1, int(self._avg_duration * waves))
+
+    def active_for(self, team_id):
+        for job in self._active():
+            if job.team_id == team_id:
+                return job
+        return None
+
+    def get(self, job_id):
+        job = self.jobs.get(job_id)
+        if job:
+            job.last_seen = time.time()
+        return job
+
+    def submit(self, fn, *args, on_complete=None, on_abandon=None, team_id=None, stream=False):
+        """
+        Queue fn(*args) to run in a worker process. Returns the DriveJob.
+        on_abandon() is awaited if the job ends without a result (failed/cancelled).
+        stream=True runs fn(events, stop, *args): whatever the worker puts on
+        `events` lands in job.events, and `stop` is set when the job is cancelled.
+        """
+        if len(self._active()) >= self.max_depth:
+            raise QueueFullError(self.retry_after())
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        job = DriveJob(team_id=team_id)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, fn, args, on_complete, stream))
+        if on_abandon:
+            def abandoned(_):
+                if job.status != "done":
+                    asyncio.ensure_future(on_abandon())
+            job.task.add_done_callback(abandoned)
+        return job
+
+    async def _run(self, job, fn, args, on_complete, stream=False):
+        try:
+            async with self._slots:
+                job.status = "running"
+                job.started_at = time.time()
+                loop = asyncio.get_running_loop()
+                if stream:
+                    result = await self._run_streaming(job, fn, args)
+                else:
+                    result = await loop.run_in_executor(self._get_pool(), fn, *args)
+                duration = time.time() - job.started_at
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+            if job.cancel_requested:
+                job.status = "cancelled"
+                print(f"LOG:> Drive job {job.id} finished after cancel, result discarded")
+                return
+
+            if on_complete:
+                result = await on_complete(result)
+            job.result = result
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except BrokenProcessPool as e:
+            # A worker died (OOM, segfault); start a fresh pool for the next job
+            print(f"⚠️ Drive worker crashed on job {job.id}: {e}")
+            self._pool = None
+            job.status = "failed"
+            job.error = "Simulation worker crashed"
+        except Exception as e:
+            print(f"⚠️ Drive job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.done.set()
+            job.progress.set()
+
+    async def _run_streaming(self, job, fn, args):
+        manager = await asyncio.to_thread(self._get_manager)
+        events = manager.Queue()
+        job.stop = manager.Event()
+        if job.cancel_requested:
+            job.stop.set()
+        loop = asyncio.get_running_loop()
+        running = loop.run_in_executor(self._get_pool(), fn, events, job.stop, *args)
+        pump = asyncio.create_task(self._pump(job, events, running))
+        try:
+            return await running
+        finally:
+            await pump  # Drains what the worker put before it returned
+
+    async def _pump(self, job, events, running):
+        """Move a streaming worker's events into job.events until it's done and drained"""
+        while True:
+            try:
+                event = await asyncio.to_thread(events.get, True, 0.2)
+            except queue.Empty:
+                if running.done():
+                    return
+                continue
+            except (EOFError, OSError):
+                return  # Manager went away (shutdown)
+            job.add_event(event)
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool outside the job table (still bounded by the worker slots)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued jobs never start; a running job can't be
+        interrupted inside its worker, so its result is discarded instead.
+        """
+        job = self.jobs.get(job_id)
+        if not job or job.finished:
+            return False
+        job.cancel_requested = True
+        if job.status == "queued":
+            job.task.cancel()
+        elif job.stop is not None:
+            job.stop.set()  # A streaming worker stops after its current play
+        return True
+
+    def sweep(self):
+        """Cancel jobs whose client stopped polling and drop expired ones"""
+        now = time.time()
+        for job in list(self.jobs.values()):
+            if job.finished:
+                if now - job.finished_at > DRIVE_JOB_TTL:
+                    del self.jobs[job.id]
+            elif now - job.last_seen > DRIVE_CLIENT_TIMEOUT:
+                print(f"LOG:> Client gone for drive job {job.id}, cancelling")
+                self.cancel(job.id)
+
+    async def run_sweeper(self, interval=5.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def stats(self):
+        active = self._active()
+        return {
+            "workers": self.max_workers,
+            "max_depth": self.max_depth,
+            "running": sum(1 for j in active if j.status == "running"),
+            "queued": sum(1 for j in active if j.status == "queued"),
+            "avg_duration": round(self._avg_duration, 2),
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
@@ -0,0 +1,253 @@
+"""
+Game Session Store
+State of interactive /drive/play drives, keyed by team id.
+
+Sessions are kept packed (a short list instead of a dict of dicts) with
+only the last SESSION_RECENT_PLAYS plays, and expire after SESSION_TTL
+seconds without a play.
+
+A play holds its team's session from load to save (store.playing()), so two
+plays for one team can't overwrite each other: a per-team lock within the
+process, and a version check on save across processes (SessionConflict).
+
+Backends (SESSION_STORE):
+- memory: per-process LRU, at most SESSION_MAX sessions (default)
+- mongo:  `play_sessions` collection with a TTL index, shared by every
+          uvicorn worker so a team's next play can land anywhere
+"""
+import abc
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")  # memory | mongo
+SESSION_TTL = float(os.getenv("SESSION_TTL", "1800"))  # Idle seconds before a session is dropped
+SESSION_MAX = int(os.getenv("SESSION_MAX", "10000"))  # Memory backend: LRU size
+SESSION_RECENT_PLAYS = int(os.getenv("SESSION_RECENT_PLAYS", "10"))  # Plays kept per session
+
+
+def new_session() -> dict:
+    return {
+        "down": 1,
+        "yards_to_go": 10,
+        "field_position": 20,
+        "score_user": 0,
+        "score_ai": 0,
+        "play_count": 0,
+        "plays": [],
+        "version": 0  # Saves so far (not packed: the store keeps it alongside)
+    }
+
+
+def pack(session: dict) -> list:
+    """[down, to_go, field_position, score_user, score_ai, play_count, [[user, ai, yards, event], ...]]"""
+    return [
+        session["down"], session["yards_to_go"], session["field_position"],
+        session["score_user"], session["score_ai"], session["play_count"],
+        [[p["user"], p["ai"], p["yards"], p["event"]] for p in session["plays"][-SESSION_RECENT_PLAYS:]]
+    ]
+
+
+def unpack(packed: list, version: int = 0) -> dict:
+    down, to_go, field_position, score_user, score_ai, play_count, plays = packed
+    return {
+        "down": down,
+        "yards_to_go": to_go,
+        "field_position": field_position,
+        "score_user": score_user,
+        "score_ai": score_ai,
+        "play_count": play_count,
+        "plays": [{"user": u, "ai": a, "yards": y, "event": e} for u, a, y, e in plays],
+        "version": version
+    }
+
+
+class SessionConflict(Exception):
+    """The session was saved by another play since it was loaded"""
+
+
+class SessionStore(abc.ABC):
+    """get_or_create / save / reset by team id, playing() for a whole play, plus stats()"""
+    name = None
+
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self.counters = {"created": 0, "expired": 0, "evictions": 0, "resets": 0, "conflicts": 0}
+        self.locks = {}  # team id -> [lock, plays holding or waiting]
+
+    @abc.abstractmethod
+    async def load(self, team_id):
+        """(packed session, version), or None if missing/expired"""
+
+    @abc.abstractmethod
+    async def store(self, team_id, packed, version):
+        """Save as version + 1; SessionConflict unless `version` is still the stored one"""
+
+    @abc.abstractmethod
+    async def delete(self, team_id):
+        pass
+
+    @abc.abstractmethod
+    async def live(self) -> int:
+        pass
+
+    async def get_or_create(self, team_id: str) -> dict:
+        loaded = await self.load(team_id)
+        return new_session() if loaded is None else unpack(*loaded)
+
+    async def save(self, team_id: str, session: dict):
+        try:
+            await self.store(team_id, pack(session), session["version"])
+        except SessionConflict:
+            self.counters["conflicts"] += 1
+            raise
+        session["version"] += 1
+
+    @asynccontextmanager
+    async def playing(self, team_id: str):
+        """
+        The team's session for one play (load, decide, save/reset): other
+        plays for the team in this process wait until the block exits.
+        """
+        entry = self.locks.setdefault(team_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield await self.get_or_create(team_id)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.locks[team_id]
+
+    async def reset(self, team_id: str):
+        self.counters["resets"] += 1
+        await self.delete(team_id)
+
+    async def stats(self) -> dict:
+        return {"backend": self.name, "live": await self.live(), "ttl_s": self.ttl, **self.counters}
+
+    async def run_sweeper(self, interval=60.0):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """LRU of packed sessions; the least recently played drop out first"""
+    name = "memory"
+
+    def __init__(self, ttl=SESSION_TTL, max_size=SESSION_MAX):
+        super().__init__(ttl)
+        self.max_size = max_size
+        self.entries = OrderedDict()  # team id -> (expires_at, packed, version), least recently used first
+
+    async def load(self, team_id):
+        entry = self.entries.get(team_id)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if entry[0] <= now:
+            del self.entries[team_id]
+            self.counters["expired"] += 1
+            return None
+        # A look counts as activity: stays live and moves to the back of the LRU
+        self.entries[team_id] = (now + self.ttl, entry[1], entry[2])
+        self.entries.move_to_end(team_id)
+        return entry[1], entry[2]
+
+    async def store(self, team_id, packed, version):
+        entry = self.entries.get(team_id)
+        if entry is not None and entry[0] <= time.monotonic():
+            entry = None  # Expired, not swept yet
+        if (entry[2] if entry else 0) != version:
+            raise SessionConflict(team_id)
+        if entry is None:
+            self.counters["created"] += 1
+        self.entries[team_id] = (time.monotonic() + self.ttl, packed, version + 1)
+        self.entries.move_to_end(team_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def delete(self, team_id):
+        self.entries.pop(team_id, None)
+
+    def sweep(self):
+        """Drop expired sessions (idle TTL, so they're all at the front)"""
+        now = time.monotonic()
+        while self.entries:
+            team_id, (expires_at, _, _) = next(iter(self.entries.items()))
+            if expires_at > now:
+                break
+            del self.entries[team_id]
+            self.counters["expired"] += 1
+
+    async def live(self):
+        self.sweep()
+        return len(self.entries)
+
+    async def run_sweeper(self, interval=60.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+
+class MongoSessionStore(SessionStore):
+    """Shared sessions in `play_sessions`; Mongo's TTL monitor deletes idle ones"""
+    name = "mongo"
+
+    def __init__(self, database, ttl=SESSION_TTL):
+        super().__init__(ttl)
+        self.collection = database.get_collection("play_sessions")
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def load(self, team_id):
+        # The TTL monitor runs about once a minute: filter out what it hasn't reached yet
+        doc = await self.collection.find_one({"_id": team_id})
+        if doc is None:
+            return None
+        if doc["expires_at"] <= datetime.utcnow():
+            self.counters["expired"] += 1
+            return None
+        return doc["s"], doc.get("v", 0)
+
+    async def store(self, team_id, packed, version):
+        """Conditional on the version that was loaded, so a play saved by another worker isn't overwritten"""
+        now = datetime.utcnow()
+        update = {"$set": {"s": packed, "expires_at": now + timedelta(seconds=self.ttl), "v": version + 1}}
+        if version:
+            result = await self.collection.update_one({"_id": team_id, "v": version}, update)
+            if not result.matched_count:
+                raise SessionConflict(team_id)
+            return
+        # A new session: nothing there yet (or only an expired one the TTL monitor hasn't reached)
+        try:
+            result = await self.collection.update_one(
+                {"_id": team_id, "$or": [{"v": None}, {"expires_at": {"$lte": now}}]},
+                update,
+                upsert=True
+            )
+        except DuplicateKeyError:
+            raise SessionConflict(team_id)
+        if result.upserted_id is not None:
+            self.counters["created"] += 1
+
+    async def delete(self, team_id):
+        await self.collection.delete_one({"_id": team_id})
+
+    async def live(self):
+        return await self.collection.count_documents({"expires_at": {"$gt": datetime.utcnow()}})
+
+
+def get_session_store(database=None):
+    """Build the configured session store (SESSION_STORE=memory|mongo)"""
+    if SESSION_STORE == "mongo":
+        if database is None:
+            from database import db as database
+        return MongoSessionStore(database)
+    return MemorySessionStore()
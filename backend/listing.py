@@ -0,0 +1,84 @@
+"""
+Listing helpers
+Keyset pagination, field selection and weak ETags for list endpoints.
+
+Bodies stay plain JSON arrays; the next page is in a `Link: <...>; rel="next"`
+header (absent on the last page). A weak ETag over the page's BSON lets
+a repeat poll with If-None-Match get a 304 before anything is serialized.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+import bson
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def parse_fields(fields: Optional[str], allowed: set, default: list) -> dict:
+    """?fields=a,b -> Mongo projection (400 on fields outside `allowed`)"""
+    names = [f.strip() for f in fields.split(",") if f.strip()] if fields else default
+    unknown = [f for f in names if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)} (choose from {', '.join(sorted(allowed))})")
+    return {name: 1 for name in names}
+
+
+def parse_object_id(value: str, what: str = "cursor") -> ObjectId:
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail=f"Bad {what} '{value}'")
+
+
+def time_cursor(created_at: datetime, _id) -> str:
+    """Opaque (created_at, _id) cursor: '<epoch ms>_<id>' (Mongo dates are ms precise)"""
+    return f"{(created_at - EPOCH) // timedelta(milliseconds=1)}_{_id}"
+
+
+def after_time_cursor(cursor: str) -> dict:
+    """Filter for documents after a time_cursor in (created_at, _id) descending order"""
+    try:
+        ms, _id = cursor.split("_", 1)
+        created_at = EPOCH + timedelta(milliseconds=int(ms))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Bad cursor '{cursor}'")
+    _id = parse_object_id(_id)
+    return {"$or": [{"created_at": {"$lt": created_at}}, {"created_at": created_at, "_id": {"$lt": _id}}]}
+
+
+def weak_etag(docs: list) -> str:
+    digest = hashlib.md5()
+    for doc in docs:
+        digest.update(bson.encode(doc))
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 7232): W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def list_response(request: Request, docs: list, next_cursor: Optional[str] = None) -> Response:
+    """JSON array of `docs` (ids as strings) with ETag/Link headers, or 304 if the client has it"""
+    etag = weak_etag(docs)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["Link"] = f'<{request.url.include_query_params(after=next_cursor)}>; rel="next"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    for doc in docs:
+        for key, value in doc.items():
+            if isinstance(value, ObjectId):
+                doc[key] = str(value)
+    return JSONResponse(jsonable_encoder(docs), headers=headers)
@@ -0,0 +1,75 @@
+"""
+Async LLM Client
+One pooled httpx.AsyncClient per backend (base URL + headers + timeout)
+and event loop: keep-alive connections shared by every drive on that loop
+(run_nfl_sim.run_drive keeps one loop per worker thread), a per-backend
+concurrency limit, and timeouts from config. Replaces a fresh
+requests.post (new TCP connection, blocked thread) per coach decision.
+"""
+import asyncio
+import os
+from urllib.parse import urlsplit
+
+import httpx
+
+LLM_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "5.0"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "2.0"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "4"))  # Keep-alive pool per backend
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # In-flight requests per backend
+
+
+class AsyncLLMClient:
+    def __init__(self, base_url, max_connections=LLM_MAX_CONNECTIONS,
+                 max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT, headers=None):
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._loop = None
+        self._client = None
+        self._slots = None
+
+    def _bind(self):
+        """httpx clients and semaphores belong to one event loop; rebuild on a new one"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=min(LLM_CONNECT_TIMEOUT, self.timeout)),
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def post_json(self, path, payload, timeout=None):
+        """POST JSON, return the decoded body. Raises on HTTP errors and timeouts."""
+        client = self._bind()
+        async with self._slots:
+            kwargs = {"timeout": timeout} if timeout is not None else {}
+            response = await client.post(path, json=payload, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = self._loop = None
+
+
+_clients = {}
+
+
+def get_llm_client(url, headers=None, **kwargs):
+    """Shared client for the backend serving `url` (scheme://host:port) with these headers/options"""
+    parts = urlsplit(url)
+    base_url = f"{parts.scheme}://{parts.netloc}"
+    key = (base_url, tuple(sorted((headers or {}).items())), tuple(sorted(kwargs.items())))
+    if key not in _clients:
+        _clients[key] = AsyncLLMClient(base_url, headers=headers, **kwargs)
+    return _clients[key]
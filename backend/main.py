@@ -1,22 +1,56 @@
-from fastapi import FastAPI, HTTPException, Body, Header
+from fastapi import FastAPI, HTTPException, Body, Header, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
 from bson import ObjectId
 import os
+import json
+import math
+import time
+import random
+import asyncio
 
 from datetime import datetime, timedelta
-from run_nfl_sim import get_simulation_result, run_drive
-from database import db, teams, drives, PyObjectId
+from run_nfl_sim import run_drive, run_drive_streaming, regenerate_replay, PHYSICS_ENGINES
+from database import db, teams, drives, drive_summaries, PyObjectId
 from schemas import NFLTeamModel, CreateTeamRequest
 from moltbook_agent import MoltbookAgent
+from drive_jobs import DriveJobQueue, QueueFullError
+from replay_codec import encode_replay, expand_play, expand_replay
+from replay_store import get_replay_store, ReplayChunkMissing
+from circuit_breaker import breaker_snapshot
+from openclaw_client import get_ai_decision_async
+from game_sessions import get_session_store, MongoSessionStore, SessionConflict, SESSION_RECENT_PLAYS
+from defense_speculation import DefenseSpeculator, USER_PLAYS, totals_snapshot as speculation_totals
+import tournaments
+from tournaments import TournamentStore
+from team_cache import TeamCache
+from db_indexes import ensure_indexes, missing_indexes
+from query_profiler import query_profiler
+from listing import list_response, parse_fields, parse_object_id, time_cursor, after_time_cursor
+from replay_cache import ReplayResponseCache, negotiate_encoding, replay_etag, held_etag, IMMUTABLE
+from pymongo import ReturnDocument
 import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 load_dotenv()
 
+REGEN_CACHE_SIZE = int(os.getenv("REGEN_CACHE_SIZE", "32"))  # Regenerated replays kept in memory
+REPLAY_FRAMES_EXPANSION = 6  # format=frames JSON vs. the compact replay (measured ~5.6x)
+REPLAY_PLAY_BYTES = 32 * 1024  # Compact play JSON estimate, for manifests without "bytes"
+DRIVE_COOLDOWN = timedelta(minutes=5)  # Rest between a team's drives
+LEVEL_THRESHOLDS = [(2000, 5), (1000, 4), (500, 3), (200, 2)]  # (coach_xp, coach_level), highest first
+
 app = FastAPI(title="Super Sim AI API")
+drive_queue = DriveJobQueue()
+session_store = get_session_store(db)  # Interactive /drive/play sessions
+team_cache = TeamCache(teams)  # Existence/ownership/level checks
+replay_store = get_replay_store(db)
+replay_cache = ReplayResponseCache()  # Encoded GET /drives/{id} bodies
 
 # CORS (Open for dev)
 app.add_middleware(
@@ -33,17 +67,29 @@ app.add_middleware(
 class DriveRequest(BaseModel):
     team_id: str
     strategy_prompt: Optional[str] = None  # Custom strategy for this drive
+    engine: Optional[str] = None  # Physics backend: "pymunk" or "numpy"
 
 
-@app.post("/drive/start")
-async def start_drive(
-    request: DriveRequest = Body(...),
-    x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
-):
-    """Start a Single Drive Challenge with selected team"""
+@app.on_event("startup")
+async def start_drive_queue():
+    await ensure_indexes(db)
+    asyncio.create_task(drive_queue.run_sweeper())
+    asyncio.create_task(tournaments.run_resumer())  # Pick up tournaments whose worker died
+    if isinstance(session_store, MongoSessionStore):
+        await session_store.ensure_indexes()
+    asyncio.create_task(session_store.run_sweeper())
+
+
+@app.on_event("shutdown")
+async def stop_drive_queue():
+    drive_queue.shutdown()
+
+
+async def load_drive_team(request: DriveRequest, x_wallet_address: Optional[str]):
+    """Checks shared by queued and streamed drives. Returns (team, strategy)."""
     
-    # 1. Fetch team from MongoDB
-    team = await teams.find_one({"_id": ObjectId(request.team_id)})
+    # 1. Fetch team (cached; every team write refreshes it)
+    team = await team_cache.get(request.team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -51,83 +97,221 @@ async def start_drive(
     if team.get("owner_wallet") and team["owner_wallet"] != x_wallet_address:
         raise HTTPException(status_code=403, detail="This is not your team")
     
-    # 2.5 Rate Limit (5 mins)
-    last_played = team.get("last_played_at")
-    if last_played:
-        # Simple check assuming datetime object
-        if (datetime.utcnow() - last_played) < timedelta(minutes=5):
-            remaining = 5 - int((datetime.utcnow() - last_played).total_seconds() / 60)
-            raise HTTPException(
-                status_code=429,
-                detail=f"⏳ Coach is resting! Drills available in {remaining} min."
-            )
-    
-    # 3. Run the drive simulation (use custom strategy if provided)
-    strategy = request.strategy_prompt if request.strategy_prompt else team.get("strategy_prompt", "Play to win")
-    result = run_drive(
-        team_name=team.get("name", "My Team"),
-        strategy_prompt=strategy
+    return team, request.strategy_prompt if request.strategy_prompt else team.get("strategy_prompt", "Play to win")
+
+
+def check_drive_allowed(request: DriveRequest):
+    """Request checks that don't touch the team"""
+    if request.engine and request.engine not in PHYSICS_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown physics engine '{request.engine}'")
+
+
+async def reserve_drive(team_id: str, team: dict) -> dict:
+    """
+    2.5 Rate limit: start the cooldown in one conditional update, so two
+    simultaneous requests can't both get past it.
+    Returns the reservation for release_drive.
+    """
+    now = datetime.utcnow()
+    reserved = await teams.find_one_and_update(
+        {
+            "_id": ObjectId(team_id),
+            "$or": [{"last_played_at": None}, {"last_played_at": {"$lte": now - DRIVE_COOLDOWN}}]
+        },
+        {"$set": {"last_played_at": now}},
+        return_document=ReturnDocument.AFTER
+    )
+    if reserved:
+        team_cache.store(reserved)
+        return {"team_id": team_id, "at": reserved["last_played_at"], "previous": team.get("last_played_at")}
+    
+    # Resting (or gone): the cached copy was stale
+    team_cache.invalidate(team_id)
+    current = await teams.find_one({"_id": ObjectId(team_id)}, {"last_played_at": 1})
+    if not current:
+        raise HTTPException(status_code=404, detail="Team not found")
+    resting = DRIVE_COOLDOWN - (now - current["last_played_at"])
+    remaining = max(1, math.ceil(resting.total_seconds() / 60))
+    raise HTTPException(
+        status_code=429,
+        detail=f"⏳ Coach is resting! Drills available in {remaining} min."
+    )
+
+
+async def release_drive(reservation: dict):
+    """Give the cooldown back for a drive that never got committed"""
+    previous = reservation["previous"]
+    await teams.update_one(
+        {"_id": ObjectId(reservation["team_id"]), "last_played_at": reservation["at"]},
+        {"$set": {"last_played_at": previous}} if previous else {"$unset": {"last_played_at": ""}}
     )
+    team_cache.invalidate(reservation["team_id"])
+
+
+@app.post("/drive/start", status_code=202)
+async def start_drive(
+    request: DriveRequest = Body(...),
+    x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
+):
+    """Queue a Single Drive Challenge with selected team (poll /drive/jobs/{job_id})"""
+    team, strategy = await load_drive_team(request, x_wallet_address)
     
-    # 4. Update team stats in database
-    update_data = {
-        "$inc": {
-            "coach_xp": result["xp_earned"]
-        }
-    }
+    # Already on the field? Hand back the running job instead of a second drive
+    active = drive_queue.active_for(request.team_id)
+    if active:
+        return active.to_dict()
     
-    if result["outcome"] == "win":
-        update_data["$inc"]["wins"] = 1
-    else:
-        update_data["$inc"]["losses"] = 1
-    
-    # Calculate new level based on XP
-    current_xp = team.get("coach_xp", 0) + result["xp_earned"]
-    new_level = 1
-    if current_xp >= 2000:
-        new_level = 5
-    elif current_xp >= 1000:
-        new_level = 4
-    elif current_xp >= 500:
-        new_level = 3
-    elif current_xp >= 200:
-        new_level = 2
-    
-    update_data["$set"] = {
-        "coach_level": new_level,
-        "last_played_at": datetime.utcnow()
-    }
+    check_drive_allowed(request)
+    reservation = await reserve_drive(request.team_id, team)
     
-    await teams.update_one(
-        {"_id": ObjectId(request.team_id)},
-        update_data
+    # 3. Queue the drive simulation (use custom strategy if provided)
+    async def on_complete(result):
+        return await commit_drive(request.team_id, team, strategy, result)
+    
+    try:
+        job = drive_queue.submit(
+            run_drive, team.get("name", "My Team"), strategy, request.engine,
+            on_complete=on_complete,
+            on_abandon=lambda: release_drive(reservation),
+            team_id=request.team_id
+        )
+    except QueueFullError as e:
+        await release_drive(reservation)
+        raise HTTPException(
+            status_code=503,
+            detail="🏟️ All fields are busy! Try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    return job.to_dict()
+
+
+@app.post("/drive/stream")
+async def stream_drive(
+    http_request: Request,
+    request: DriveRequest = Body(...),
+    x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
+):
+    """
+    Play a Drive Challenge live over Server-Sent Events.
+    Queued like /drive/start (same workers, same limits); `play` events carry
+    the coach's call, the result and that play's compact replay chunk as soon
+    as the worker simulates it; `result` is the committed drive.
+    Disconnecting abandons the drive (nothing is saved).
+    """
+    team, strategy = await load_drive_team(request, x_wallet_address)
+    if drive_queue.active_for(request.team_id):
+        raise HTTPException(status_code=409, detail="🏈 This team is already on the field!")
+    check_drive_allowed(request)
+    reservation = await reserve_drive(request.team_id, team)
+    
+    async def on_complete(result):
+        result = await commit_drive(request.team_id, team, strategy, result)
+        result.pop("replay")  # Already streamed
+        return result
+    
+    try:
+        job = drive_queue.submit(
+            run_drive_streaming, team.get("name", "My Team"), strategy, request.engine,
+            on_complete=on_complete,
+            on_abandon=lambda: release_drive(reservation),
+            team_id=request.team_id,
+            stream=True
+        )
+    except QueueFullError as e:
+        await release_drive(reservation)
+        raise HTTPException(
+            status_code=503,
+            detail="🏟️ All fields are busy! Try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    async def events():
+        async for event in job_events(job, http_request):
+            yield event
+        if job.status == "done":
+            yield f"event: result\ndata: {json.dumps(jsonable_encoder(job.result), default=str)}\n\n"
+        elif job.finished:
+            yield f"event: failed\ndata: {json.dumps({'error': job.error or job.status})}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def commit_drive(team_id: str, team: dict, strategy: str, result: dict) -> dict:
+    """Persist a finished drive: XP/level, replay archive and Moltbook post"""
+    record_worker_health(result.pop("llm_health", None))
+    
+    # 4. Update team stats in database: one pipeline update, the level is
+    #    worked out from the new XP on the server and the team comes back
+    won = result["outcome"] == "win"
+    updated_team = await teams.find_one_and_update(
+        {"_id": ObjectId(team_id)},
+        [
+            {"$set": {
+                "coach_xp": {"$add": [{"$ifNull": ["$coach_xp", 0]}, result["xp_earned"]]},
+                "wins": {"$add": [{"$ifNull": ["$wins", 0]}, int(won)]},
+                "losses": {"$add": [{"$ifNull": ["$losses", 0]}, int(not won)]},
+                "last_played_at": datetime.utcnow()
+            }},
+            {"$set": {"coach_level": {"$switch": {
+                "branches": [{"case": {"$gte": ["$coach_xp", xp]}, "then": level} for xp, level in LEVEL_THRESHOLDS],
+                "default": 1
+            }}}}
+        ],
+        return_document=ReturnDocument.AFTER
     )
+    if not updated_team:
+        raise ValueError("Team was deleted during the drive")
+    team_cache.store(updated_team)
     
     
-    # 5. Archive the drive (Replay)
-    drive_record = {
-        "team_id": ObjectId(request.team_id),
+    # 5. Archive the drive (Replay): compact per-play chunks in the replay store
+    if "replay" not in result:  # Streamed drives arrive already encoded
+        result["replay"] = encode_replay(
+            result.pop("frames"),
+            [play["frame_count"] for play in result["plays"]]
+        )
+    drive_id = ObjectId()
+    replay_manifest = await replay_store.put_replay(drive_id, result["replay"])
+    
+    created_at = datetime.utcnow()
+    
+    # Slim summary row (history, latest drive, Moltbook stats) ...
+    drive_summary = {
+        "_id": drive_id,
+        "team_id": ObjectId(team_id),
         "team_name": team.get("name"),
         "opponent": "Commanders", # Currently hardcoded in run_drive
         "outcome": result["outcome"], # win/loss
         "score": result["score"], # e.g. "24-17"
         "xp_earned": result["xp_earned"],
         "strategy_prompt": strategy,
-        "created_at": datetime.utcnow(),
-        "frames": result["frames"],
-        "logs": result["logs"],
+        "created_at": created_at,
         "stats": result["stats"],
         "moltbook_url": None
     }
+    # ... and the replay payload, only read on replay
+    drive_record = {
+        "_id": drive_id,
+        "team_id": ObjectId(team_id),
+        "created_at": created_at,
+        "replay": replay_manifest,  # {v, scale, play_count, bytes, store}
+        "logs": result["logs"],
+        # Enough to re-simulate the replay bit-for-bit (see regenerate_replay)
+        "seed": result["seed"],
+        "decisions": result["decisions"],
+        "engine": result["engine"],
+        "engine_version": result["engine_version"]
+    }
     
-    # 5.5 Post to Moltbook
+    # 5.5 Post to Moltbook (blocking HTTP, keep it off the event loop)
     print(f"DEBUG:> Attempting Moltbook post for {team.get('name')}...")
     try:
         agent = MoltbookAgent()
-        post_url = agent.post_drive_result_highlight(result)
+        post_url = await asyncio.to_thread(agent.post_drive_result_highlight, result)
         if post_url:
             print(f"DEBUG:> Moltbook post success: {post_url}")
-            drive_record["moltbook_url"] = post_url
+            drive_summary["moltbook_url"] = post_url
             result["moltbook_url"] = post_url
         else:
             print("DEBUG:> Moltbook post returned None (likely rate limit or missing API key)")
@@ -136,52 +320,369 @@ async def start_drive(
         import traceback
         traceback.print_exc()
     
-    new_drive = await drives.insert_one(drive_record)
+    # Payload first: a summary row always points at a stored replay
+    await drives.insert_one(drive_record)
+    await drive_summaries.insert_one(drive_summary)
     
     # Return result with new Level and Drive ID
-    result["new_level"] = new_level
-    result["team"] = await teams.find_one({"_id": ObjectId(request.team_id)})
+    result["new_level"] = updated_team["coach_level"]
+    result["team"] = updated_team
     # Convert ObjectIds for JSON
     result["team"]["_id"] = str(result["team"]["_id"])
-    result["drive_id"] = str(new_drive.inserted_id)
+    result["drive_id"] = str(drive_id)
     
     return result
 
 
+@app.get("/drive/jobs/{job_id}")
+async def get_drive_job(job_id: str):
+    """Poll a queued drive. `result` is filled in once status is `done`."""
+    job = drive_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Drive job not found")
+    return job.to_dict()
+
+
+async def job_events(job, request: Request):
+    """
+    SSE for a running job until it finishes: `status` heartbeats and, for
+    streaming jobs, each `play` as the worker sends it. Disconnecting cancels the job.
+    """
+    sent = 0
+    try:
+        while True:
+            finished = job.finished  # Read first: a finished job has no events still to come
+            progress = job.progress
+            new = job.events[sent:]
+            sent += len(new)
+            for event in new:
+                yield f"event: play\ndata: {json.dumps(event, default=str)}\n\n"
+            if finished:
+                return
+            if await request.is_disconnected():
+                return
+            job.last_seen = time.time()
+            yield f"event: status\ndata: {json.dumps({'status': job.status})}\n\n"
+            try:
+                await asyncio.wait_for(progress.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if not job.finished:
+            drive_queue.cancel(job.id)
+
+
+@app.get("/drive/jobs/{job_id}/events")
+async def stream_drive_job(job_id: str, request: Request):
+    """Subscribe to a drive job over Server-Sent Events. Disconnecting cancels the job."""
+    job = drive_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Drive job not found")
+    
+    async def events():
+        async for event in job_events(job, request):
+            yield event
+        if job.finished:
+            yield f"event: {job.status}\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.delete("/drive/jobs/{job_id}")
+async def cancel_drive_job(job_id: str):
+    """Cancel a queued or running drive"""
+    if job_id not in drive_queue.jobs:
+        raise HTTPException(status_code=404, detail="Drive job not found")
+    cancelled = drive_queue.cancel(job_id)
+    return {"job_id": job_id, "cancelled": cancelled}
+
+
+DRIVE_LIST_FIELDS = ["outcome", "score", "opponent", "xp_earned", "created_at", "moltbook_url"]  # History view
+DRIVE_SUMMARY_FIELDS = set(DRIVE_LIST_FIELDS) | {"team_id", "team_name", "strategy_prompt", "stats"}
+
+
 @app.get("/teams/{team_id}/drives")
-async def get_team_drives(team_id: str):
-    """Get history of drives for a team (without frames/logs to save bandwidth)"""
-    cursor = drives.find(
-        {"team_id": ObjectId(team_id)},
-        {"frames": 0, "logs": 0} # Exclude heavy data
-    ).sort("created_at", -1).limit(20)
-    
-    history = []
-    async for drive in cursor:
-        drive["_id"] = str(drive["_id"])
-        drive["team_id"] = str(drive["team_id"])
-        history.append(drive)
-        
-    return history
+async def get_team_drives(
+    request: Request,
+    team_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Get history of drives for a team, newest first (summaries only, never touches replay payloads).
+    Pages with ?after= from the Link header; ?fields=a,b picks summary fields.
+    """
+    query = {"team_id": parse_object_id(team_id, "team id")}
+    if after:
+        query.update(after_time_cursor(after))
+    projection = parse_fields(fields, DRIVE_SUMMARY_FIELDS, DRIVE_LIST_FIELDS)
+    projection["created_at"] = 1  # Needed for the cursor
+    
+    history = await drive_summaries.find(query, projection).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(history) > limit:
+        history = history[:limit]
+        next_cursor = time_cursor(history[-1]["created_at"], history[-1]["_id"])
+    return list_response(request, history, next_cursor)
 
-@app.get("/drives/{drive_id}")
-async def get_drive_replay(drive_id: str):
-    """Get full replay data for a drive"""
-    drive = await drives.find_one({"_id": ObjectId(drive_id)})
+def is_chunked(drive: dict) -> bool:
+    """Replay lives in the replay store (vs. frames/replay embedded in older drive docs)"""
+    return "play_count" in drive.get("replay", {})
+
+
+def is_pruned(drive: dict) -> bool:
+    """Replay chunks were dropped by cli_prune_replays; rebuild from seed + decisions"""
+    return drive.get("replay", {}).get("store") == "regen"
+
+
+regen_cache = OrderedDict()  # drive_id -> compact replay (LRU)
+
+
+async def regenerate(drive: dict) -> dict:
+    """Re-simulate a pruned drive's compact replay in the worker pool"""
+    key = str(drive["_id"])
+    if key in regen_cache:
+        regen_cache.move_to_end(key)
+        return regen_cache[key]
+    try:
+        replay = await drive_queue.run(
+            regenerate_replay,
+            drive["seed"], drive["decisions"], drive["engine"], drive["engine_version"]
+        )
+    except ValueError as e:
+        # Simulation code changed since the drive was pruned
+        raise HTTPException(status_code=410, detail=str(e))
+    regen_cache[key] = replay
+    while len(regen_cache) > REGEN_CACHE_SIZE:
+        regen_cache.popitem(last=False)
+    return replay
+
+
+async def stream_replay(drive: dict, manifest: dict, format: str):
+    """Yield the drive JSON with its replay appended one play chunk at a time"""
+    head = json.dumps(jsonable_encoder(drive))[:-1]
+    drive_id = drive["_id"]
+    
+    if format == "compact":
+        yield head + f', "replay": {{"v": {manifest["v"]}, "scale": {manifest["scale"]}, "plays": ['
+        index = 0
+        async for raw in replay_store.iter_play_json(drive_id, manifest["play_count"]):
+            yield ("," if index else "") + raw.decode()
+            index += 1
+        yield "]}}"
+    else:
+        yield head + ', "frames": ['
+        index = 0
+        async for raw in replay_store.iter_play_json(drive_id, manifest["play_count"]):
+            frames = expand_play(json.loads(raw), manifest["scale"])
+            yield ("," if index and frames else "") + json.dumps(frames)[1:-1]
+            index += len(frames)
+        yield "]}"
+
+
+def replay_size(manifest: dict, format: str) -> int:
+    """Estimated body size of a chunked replay, from its manifest alone"""
+    size = manifest.get("bytes", manifest["play_count"] * REPLAY_PLAY_BYTES)
+    return size * REPLAY_FRAMES_EXPANSION if format == "frames" else size
+
+
+async def load_drive(drive_id: str) -> dict:
+    """Drive doc merged with its summary, ids as strings"""
+    summary, drive = await asyncio.gather(
+        drive_summaries.find_one({"_id": ObjectId(drive_id)}),
+        drives.find_one({"_id": ObjectId(drive_id)})
+    )
     if not drive:
         raise HTTPException(status_code=404, detail="Drive not found")
+    if summary:
+        drive = {**summary, **drive}
         
     drive["_id"] = str(drive["_id"])
     drive["team_id"] = str(drive["team_id"])
     return drive
 
 
+async def load_replay_body(drive_id: str, format: str, drive: Optional[dict] = None) -> bytes:
+    """The full GET /drives/{id} JSON for one format, as bytes"""
+    if drive is None:
+        drive = await load_drive(drive_id)
+    
+    if is_pruned(drive):
+        drive["replay"] = await regenerate(drive)
+    elif is_chunked(drive):
+        manifest = drive.pop("replay")
+        return "".join([part async for part in stream_replay(drive, manifest, format)]).encode()
+    
+    # Older (and regenerated) drives keep frames or the compact replay inline
+    if format == "compact":
+        if "frames" in drive:
+            drive["replay"] = encode_replay(drive.pop("frames"))
+    elif "replay" in drive:
+        drive["frames"] = expand_replay(drive.pop("replay"))
+    return json.dumps(jsonable_encoder(drive)).encode()
+
+
+@app.get("/drives/{drive_id}")
+async def get_drive_replay(request: Request, drive_id: str, format: str = "frames"):
+    """
+    Get full replay data for a drive.
+    format=frames (default) expands to the legacy `frames` list,
+    format=compact returns the encoded `replay`.
+    Replays never change: bodies come from replay_cache, gzip/br by Accept-Encoding,
+    with a strong ETag and Cache-Control: immutable. Replays too big for the
+    cache (sized from the manifest) are streamed uncompressed instead.
+    """
+    format = "compact" if format == "compact" else "frames"
+    parse_object_id(drive_id, "drive id")
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"ETag": replay_etag(drive_id, format, encoding), "Cache-Control": IMMUTABLE, "Vary": "Accept-Encoding"}
+    held = held_etag(request.headers.get("if-none-match"), drive_id, format, encoding)
+    
+    key = (drive_id, format)
+    drive = None
+    if not replay_cache.holds(key):
+        # Not cached: look the drive up first, so a deleted drive 404s even on revalidation
+        drive = await load_drive(drive_id)
+    if held:
+        headers["ETag"] = held
+        return Response(status_code=304, headers=headers)
+    
+    if drive is not None and is_chunked(drive) and not is_pruned(drive) and not replay_cache.admits(replay_size(drive["replay"], format)):
+        # Too big to keep: stream it play by play (uncompressed) instead of building it in memory
+        headers["ETag"] = replay_etag(drive_id, format, "identity")
+        manifest = drive.pop("replay")
+        return StreamingResponse(stream_replay(drive, manifest, format), media_type="application/json", headers=headers)
+    
+    try:
+        body = await replay_cache.body(key, lambda: load_replay_body(drive_id, format, drive))
+    except ReplayChunkMissing as e:
+        print(f"⚠️ {e}")
+        raise HTTPException(status_code=410, detail="Replay data for this drive is no longer available")
+    content = await replay_cache.encoded(key, body, encoding)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@app.get("/drives/{drive_id}/plays/{play_index}")
+async def get_drive_play(drive_id: str, play_index: int, format: str = "frames"):
+    """Get a single play of a replay without loading the rest of the drive"""
+    drive = await drives.find_one(
+        {"_id": parse_object_id(drive_id, "drive id")},
+        {"replay": 1, "frames": 1, "seed": 1, "decisions": 1, "engine": 1, "engine_version": 1}
+    )
+    if not drive:
+        raise HTTPException(status_code=404, detail="Drive not found")
+    
+    if is_pruned(drive):
+        drive["replay"] = await regenerate(drive)
+    
+    if is_chunked(drive):
+        manifest = drive["replay"]
+        play_count, scale = manifest["play_count"], manifest["scale"]
+        play = None
+        if 0 <= play_index < play_count:
+            play = await replay_store.get_play(drive["_id"], play_index)
+            if play is None:
+                print(f"⚠️ {ReplayChunkMissing(drive['_id'], play_index)}")
+                raise HTTPException(status_code=410, detail="Replay data for this play is no longer available")
+    else:
+        replay = drive.get("replay") or encode_replay(drive.get("frames", []))
+        plays = replay["plays"]
+        play_count, scale = len(plays), replay["scale"]
+        play = plays[play_index] if 0 <= play_index < play_count else None
+    
+    if play is None:
+        raise HTTPException(status_code=404, detail="Play not found")
+    
+    response = {"drive_id": drive_id, "play_index": play_index, "play_count": play_count}
+    if format == "compact":
+        response["play"] = play
+        response["scale"] = scale
+    else:
+        response["frames"] = expand_play(play, scale)
+    return response
+
+
+# ============= LLM HEALTH =============
+
+WORKER_HEALTH_MAX_AGE = 600  # seconds; drop snapshots from idle/dead workers
+worker_health = {}  # worker pid -> latest {"pid", "at", "backends"} from a finished drive
+
+
+def record_worker_health(snapshot: Optional[dict]):
+    if snapshot and snapshot["pid"] != os.getpid():  # Our own breakers are read directly
+        worker_health[snapshot["pid"]] = snapshot
+
+
+@app.get("/health/sessions")
+async def sessions_health():
+    """Interactive /drive/play sessions: live count, expirations and LRU evictions"""
+    return await session_store.stats()
+
+
+@app.get("/health/teams")
+async def teams_health():
+    """Team cache hit rate, size and invalidations (this process)"""
+    return team_cache.stats()
+
+
+@app.get("/health/replays")
+async def replays_health():
+    """Replay response cache: hit rate, coalesced loads, bytes held"""
+    return replay_cache.stats()
+
+
+@app.get("/health/db")
+async def db_health():
+    """Per collection/operation query timings, slow query counts and any missing indexes"""
+    return {**query_profiler.stats(), "missing_indexes": await missing_indexes(db)}
+
+
+@app.get("/health/llm")
+async def llm_health():
+    """Circuit breaker state per LLM backend: this process plus recent drive workers"""
+    now = time.time()
+    for pid in [pid for pid, snap in worker_health.items() if now - snap["at"] > WORKER_HEALTH_MAX_AGE]:
+        del worker_health[pid]
+    
+    workers = [
+        {"pid": snap["pid"], "age_s": round(now - snap["at"], 1), "backends": snap["backends"]}
+        for snap in worker_health.values()
+    ]
+    sources = [breaker_snapshot()] + [w["backends"] for w in workers]
+    
+    # Per backend: worst state seen anywhere, fallbacks summed
+    backends = {}
+    rank = {"closed": 0, "half_open": 1, "open": 2}
+    for source in sources:
+        for name, snap in source.items():
+            agg = backends.setdefault(name, {"state": "closed", "fallbacks": 0, "rejected": 0, "failures": 0})
+            if rank[snap["state"]] > rank[agg["state"]]:
+                agg["state"] = snap["state"]
+            for key in ("fallbacks", "rejected", "failures"):
+                agg[key] += snap[key]
+    
+    return {
+        "status": "degraded" if any(b["state"] != "closed" for b in backends.values()) else "ok",
+        "backends": backends,
+        "api": sources[0],
+        "workers": workers,
+        "defense_speculation": speculation_totals()
+    }
+
+
 # ============= LEGACY GAME ENDPOINT =============
 
 @app.post("/nfl/play")
 async def play_nfl_game():
     """Run a drive simulation with LLM coach (legacy)"""
-    return get_simulation_result(num_plays=10)
+    result = await drive_queue.run(run_drive, "Demo Team", "Play aggressive, go for big plays.")
+    record_worker_health(result.pop("llm_health", None))
+    return result
 
 
 # ============= AI-POWERED DRIVE PLAY =============
@@ -192,29 +693,6 @@ class PlayRequest(BaseModel):
     game_state: dict  # down, yards_to_go, field_position, etc.
 
 
-class GameSession:
-    """Simple in-memory game state (for MVP - should be Redis/DB later)"""
-    sessions = {}
-    
-    @classmethod
-    def get_or_create(cls, team_id: str) -> dict:
-        if team_id not in cls.sessions:
-            cls.sessions[team_id] = {
-                "down": 1,
-                "yards_to_go": 10,
-                "field_position": 20,
-                "score_user": 0,
-                "score_ai": 0,
-                "plays": []
-            }
-        return cls.sessions[team_id]
-    
-    @classmethod
-    def reset(cls, team_id: str):
-        if team_id in cls.sessions:
-            del cls.sessions[team_id]
-
-
 @app.post("/drive/play")
 async def execute_play(
     request: PlayRequest = Body(...),
@@ -223,25 +701,51 @@ async def execute_play(
     """
     Execute a single play with OpenClaw AI as defender.
     User picks offense, AI picks defense, physics engine resolves.
+    (The /drive/play/ws session has the AI's answer ready before the user picks.)
     """
-    from openclaw_client import get_ai_decision
-    import random
-    
-    # 1. Get game state
-    session = GameSession.get_or_create(request.team_id)
-    game_state = {
-        **session,
-        "user_play": request.user_play
+    # 1. Get game state (held until saved: the team's next play waits for this one)
+    try:
+        async with session_store.playing(request.team_id) as session:
+            game_state = {
+                **session,
+                "user_play": request.user_play
+            }
+            
+            # 2. Ask OpenClaw AI for defensive play
+            ai_decision = await get_ai_decision_async(game_state, role="defense")
+            return await play_and_save(request.team_id, session, request.user_play, ai_decision)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="Another play for this team landed first, refresh the drive")
+
+
+async def play_and_save(team_id: str, session: dict, user_play: str, ai_decision: dict) -> dict:
+    """resolve_play, then store the session (or drop it once the drive is over)"""
+    result = resolve_play(session, user_play, ai_decision)
+    if result["drive_over"]:
+        await session_store.reset(team_id)
+    else:
+        await session_store.save(team_id, session)
+    return result
+
+
+def session_state(session: dict) -> dict:
+    return {
+        "down": session["down"],
+        "yards_to_go": session["yards_to_go"],
+        "field_position": session["field_position"],
+        "score_user": session["score_user"],
+        "score_ai": session["score_ai"]
     }
-    
-    # 2. Ask OpenClaw AI for defensive play
-    ai_decision = get_ai_decision(game_state, role="defense")
+
+
+def resolve_play(session: dict, user_play: str, ai_decision: dict) -> dict:
+    """Resolve the user's play against the AI's defensive call and advance the session"""
     ai_play = ai_decision.get("play", "ZONE")
     trash_talk = ai_decision.get("trash_talk", "")
     
     # 3. Simulate play outcome
     # Calculate yards based on matchup
-    user_play = request.user_play.upper()
+    user_play = user_play.upper()
     
     if user_play == "PASS":
         if ai_play == "BLITZ":
@@ -276,7 +780,6 @@ async def execute_play(
     elif user_play == "PUNT":
         yards = -40  # Kick away
         event = "PUNT"
-        GameSession.reset(request.team_id)
         return {
             "result": "PUNT",
             "ai_play": ai_play,
@@ -292,7 +795,6 @@ async def execute_play(
         if random.random() < success_chance:
             session["score_user"] += 3
             event = "FIELD_GOAL"
-            GameSession.reset(request.team_id)
             return {
                 "result": "FIELD_GOAL",
                 "ai_play": ai_play,
@@ -303,7 +805,6 @@ async def execute_play(
             }
         else:
             event = "MISSED_FG"
-            GameSession.reset(request.team_id)
             return {
                 "result": "MISSED_FG",
                 "ai_play": ai_play,
@@ -318,17 +819,18 @@ async def execute_play(
     # 4. Update game state
     session["field_position"] += yards
     session["yards_to_go"] -= yards
+    session["play_count"] += 1
     session["plays"].append({
         "user": user_play,
         "ai": ai_play,
         "yards": yards,
         "event": event
     })
+    del session["plays"][:-SESSION_RECENT_PLAYS]  # Only recent plays are kept
     
     # Check for touchdown
     if session["field_position"] >= 100:
         session["score_user"] += 7
-        GameSession.reset(request.team_id)
         return {
             "result": "TOUCHDOWN",
             "yards": yards,
@@ -350,7 +852,6 @@ async def execute_play(
     
     # Check for turnover on downs
     if session["down"] > 4:
-        GameSession.reset(request.team_id)
         return {
             "result": "TURNOVER_ON_DOWNS",
             "yards": yards,
@@ -368,63 +869,84 @@ async def execute_play(
         "ai_play": ai_play,
         "ai_trash_talk": trash_talk,
         "drive_over": False,
-        "new_state": {
-            "down": session["down"],
-            "yards_to_go": session["yards_to_go"],
-            "field_position": session["field_position"],
-            "score_user": session["score_user"],
-            "score_ai": session["score_ai"]
-        }
+        "new_state": session_state(session)
     }
 
 
+@app.websocket("/drive/play/ws")
+async def play_session(websocket: WebSocket, team_id: str):
+    """
+    Interactive drive over a WebSocket: the same game as POST /drive/play,
+    but the AI's defense against every user play is requested as soon as a
+    state is reached, so a pick usually resolves without waiting on the LLM.
+    
+    Client -> {"user_play": "RUN"|"PASS"|"PUNT"|"FG"} or {"action": "reset"}
+    Server -> {"type": "state", "state"} and {"type": "result", ..., "speculation"}
+    """
+    await websocket.accept()
+    speculator = DefenseSpeculator()
+    
+    async def new_state():
+        state = session_state(await session_store.get_or_create(team_id))
+        speculator.speculate(state)
+        await websocket.send_json({"type": "state", "state": state, "speculation": speculator.stats()})
+    
+    try:
+        await new_state()
+        while True:
+            message = await websocket.receive_json()
+            if message.get("action") == "reset":
+                await session_store.reset(team_id)
+                await new_state()
+                continue
+            
+            user_play = str(message.get("user_play", "")).upper()
+            if user_play not in USER_PLAYS:
+                await websocket.send_json({"type": "error", "detail": f"Unknown play '{user_play}'"})
+                continue
+            
+            started = time.perf_counter()
+            try:
+                async with session_store.playing(team_id) as session:
+                    ai_decision, hit = await speculator.resolve(session_state(session), user_play)
+                    waited_ms = round((time.perf_counter() - started) * 1000, 1)
+                    result = await play_and_save(team_id, session, user_play, ai_decision)
+            except SessionConflict:
+                await websocket.send_json({"type": "error", "detail": "Another play for this team landed first"})
+                await new_state()
+                continue
+            await websocket.send_json({
+                "type": "result", **result,
+                "speculation": {"hit": hit, "wait_ms": waited_ms, **speculator.stats()}
+            })
+            await new_state()  # Next snap (a fresh drive if that one ended)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        speculator.discard()
+        print(f"LOG:> 🔮 Play session {team_id} closed: {speculator.stats()}")
+
+
 @app.post("/drive/reset")
 async def reset_drive(team_id: str = Body(..., embed=True)):
     """Reset the current drive session"""
-    GameSession.reset(team_id)
+    await session_store.reset(team_id)
     return {"status": "reset"}
 
 
 # ============= TOURNAMENT ENDPOINTS =============
 
-class TournamentStore:
-    """In-memory tournament storage (MVP - use MongoDB later)"""
-    tournaments = {}
-    counter = 0
-    
-    @classmethod
-    def create(cls, name: str, creator_team_id: str) -> dict:
-        cls.counter += 1
-        tournament = {
-            "id": f"tournament_{cls.counter}",
-            "name": name,
-            "status": "open",  # open, in_progress, completed
-            "participants": [creator_team_id],
-            "matches": [],
-            "winner": None,
-            "created_at": None  # Would use datetime in production
-        }
-        cls.tournaments[tournament["id"]] = tournament
-        return tournament
-    
-    @classmethod
-    def get(cls, tournament_id: str) -> dict:
-        return cls.tournaments.get(tournament_id)
-    
-    @classmethod
-    def list_open(cls) -> list:
-        return [t for t in cls.tournaments.values() if t["status"] == "open"]
-
-
 class TournamentRequest(BaseModel):
     team_id: str
     name: Optional[str] = "Super Sim Tournament"
+    format: Optional[str] = "round_robin"  # See tournament_formats.FORMATS
+    format_options: Optional[dict] = None  # e.g. {"rounds": 5} for swiss, {"group_size": 4, "advance": 2} for groups
 
 
 @app.get("/tournaments")
 async def list_tournaments():
     """List all open tournaments"""
-    return TournamentStore.list_open()
+    return await TournamentStore.list_open()
 
 
 @app.post("/tournaments/create")
@@ -435,7 +957,7 @@ async def create_tournament(
     """Create a new tournament (requires Level 5+)"""
     
     # 1. Fetch team and verify level
-    team = await teams.find_one({"_id": ObjectId(request.team_id)})
+    team = await team_cache.get(request.team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -450,7 +972,10 @@ async def create_tournament(
         raise HTTPException(status_code=403, detail="This is not your team")
     
     # 3. Create tournament
-    tournament = TournamentStore.create(request.name, request.team_id)
+    try:
+        tournament = await TournamentStore.create(request.name, request.team_id, request.format, request.format_options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "message": "🏆 Tournament created!",
@@ -467,7 +992,7 @@ async def join_tournament(
     """Join an existing tournament (requires Level 5+)"""
     
     # 1. Fetch team and verify level
-    team = await teams.find_one({"_id": ObjectId(request.team_id)})
+    team = await team_cache.get(request.team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -481,97 +1006,70 @@ async def join_tournament(
     if team.get("owner_wallet") and team["owner_wallet"] != x_wallet_address:
         raise HTTPException(status_code=403, detail="This is not your team")
     
-    # 3. Get tournament
-    tournament = TournamentStore.get(tournament_id)
+    # 3. Join (atomic, so simultaneous joins can't drop each other)
+    tournament, added = await TournamentStore.join(tournament_id, request.team_id)
     if not tournament:
-        raise HTTPException(status_code=404, detail="Tournament not found")
-    
-    if tournament["status"] != "open":
+        if not await TournamentStore.get(tournament_id):
+            raise HTTPException(status_code=404, detail="Tournament not found")
         raise HTTPException(status_code=400, detail="Tournament is not open for joining")
     
-    if request.team_id in tournament["participants"]:
+    if not added:
         raise HTTPException(status_code=400, detail="Already joined this tournament")
     
-    # 4. Join
-    tournament["participants"].append(request.team_id)
-    
     return {
         "message": "✅ Joined tournament!",
         "tournament": tournament
     }
 
 
-@app.post("/tournaments/{tournament_id}/start")
+@app.post("/tournaments/{tournament_id}/start", status_code=202)
 async def start_tournament(
     tournament_id: str,
     x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
 ):
-    """Start a tournament (runs AI vs AI matches)"""
-    from openclaw_client import get_ai_decision
-    import random
-    
-    tournament = TournamentStore.get(tournament_id)
+    """Start a tournament (AI vs AI matches run in the background; poll GET for progress)"""
+    tournament = await TournamentStore.get(tournament_id)
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
-    if len(tournament["participants"]) < 2:
-        raise HTTPException(status_code=400, detail="Need at least 2 participants")
-    
-    tournament["status"] = "in_progress"
+    # A failed tournament, or one whose worker died, picks up from its last finished match
+    if tournament["status"] in ("failed", "in_progress"):
+        claimed = await TournamentStore.claim(tournament_id)
+        if not claimed:
+            raise HTTPException(status_code=400, detail="Tournament is already in_progress")
+        tournaments.start(claimed)
+        return {
+            "message": f"🔁 Tournament resumed after {len(claimed['matches'])} matches",
+            "tournament": claimed
+        }
     
-    # Run round-robin matches (simplified for MVP)
-    participants = tournament["participants"]
-    matches = []
+    if tournament["status"] != "open":
+        raise HTTPException(status_code=400, detail=f"Tournament is already {tournament['status']}")
     
-    for i, team1_id in enumerate(participants):
-        for team2_id in participants[i+1:]:
-            # Simulate a quick match: each team gets 4 plays
-            team1_score = 0
-            team2_score = 0
-            plays = []
-            
-            for play_num in range(4):
-                # Team 1 offense
-                offense_play = get_ai_decision({"down": 1, "yards_to_go": 10}, "offense")
-                defense_play = get_ai_decision({"down": 1, "yards_to_go": 10, "user_play": offense_play["play"]}, "defense")
-                yards = random.randint(-2, 15) if offense_play["play"] == "PASS" else random.randint(1, 8)
-                if yards > 10:
-                    team1_score += 7
-                plays.append({"team": team1_id, "play": offense_play["play"], "yards": yards})
-                
-                # Team 2 offense
-                offense_play = get_ai_decision({"down": 1, "yards_to_go": 10}, "offense")
-                defense_play = get_ai_decision({"down": 1, "yards_to_go": 10, "user_play": offense_play["play"]}, "defense")
-                yards = random.randint(-2, 15) if offense_play["play"] == "PASS" else random.randint(1, 8)
-                if yards > 10:
-                    team2_score += 7
-                plays.append({"team": team2_id, "play": offense_play["play"], "yards": yards})
-            
-            match = {
-                "team1": team1_id,
-                "team2": team2_id,
-                "team1_score": team1_score,
-                "team2_score": team2_score,
-                "winner": team1_id if team1_score > team2_score else (team2_id if team2_score > team1_score else "TIE"),
-                "plays": plays
-            }
-            matches.append(match)
+    if len(tournament["participants"]) < 2:
+        raise HTTPException(status_code=400, detail="Need at least 2 participants")
     
-    tournament["matches"] = matches
-    tournament["status"] = "completed"
+    # Seed by coach level, then record
+    records = {}
+    async for team in teams.find(
+        {"_id": {"$in": [ObjectId(t) for t in tournament["participants"]]}},
+        {"coach_level": 1, "wins": 1, "losses": 1}
+    ):
+        records[str(team["_id"])] = (-team.get("coach_level", 1), -team.get("wins", 0), team.get("losses", 0))
+    seeds = sorted(tournament["participants"], key=lambda t: records.get(t, (0, 0, 0)))
     
-    # Determine overall winner (most match wins)
-    win_counts = {}
-    for match in matches:
-        winner = match["winner"]
-        if winner != "TIE":
-            win_counts[winner] = win_counts.get(winner, 0) + 1
+    try:
+        tournaments.tournament_format({**tournament, "seeds": seeds})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if win_counts:
-        tournament["winner"] = max(win_counts, key=win_counts.get)
+    tournament = await TournamentStore.begin(tournament_id, seeds)
+    if not tournament:
+        raise HTTPException(status_code=400, detail="Tournament was started by another request")
+    tournaments.start(tournament)
     
     return {
-        "message": "🏆 Tournament complete!",
+        "message": "🏆 Tournament started!",
         "tournament": tournament
     }
 
@@ -579,7 +1077,7 @@ async def start_tournament(
 @app.get("/tournaments/{tournament_id}")
 async def get_tournament(tournament_id: str):
     """Get tournament details"""
-    tournament = TournamentStore.get(tournament_id)
+    tournament = await TournamentStore.get(tournament_id)
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return tournament
@@ -625,37 +1123,50 @@ async def create_team(
     return team_dict
 
 
+TEAM_LIST_FIELDS = ["name", "coach_name", "coach_level", "wins", "losses", "team_color_primary", "team_color_secondary"]
+TEAM_FIELDS = set(TEAM_LIST_FIELDS) | {
+    "owner_wallet", "strategy_prompt", "attributes", "eliza_profile", "coach_xp", "last_played_at"
+}
+
+
 @app.get("/teams")
-async def list_teams():
-    """List all teams"""
-    cursor = teams.find()
-    result = []
-    async for team in cursor:
-        team["_id"] = str(team["_id"])
-        result.append(team)
-    return result
+async def list_teams(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    List teams, oldest first. Pages with ?after= from the Link header;
+    ?fields=a,b picks fields (default: the light list view).
+    """
+    query = {"_id": {"$gt": parse_object_id(after)}} if after else {}
+    projection = parse_fields(fields, TEAM_FIELDS, TEAM_LIST_FIELDS)
+    page = await teams.find(query, projection).sort("_id", 1).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = str(page[-1]["_id"])
+    return list_response(request, page, next_cursor)
 
 
 @app.get("/teams/mine")
 async def get_my_teams(
+    request: Request,
     x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
 ):
-    """Get teams owned by connected wallet"""
+    """Get teams owned by connected wallet (full documents, ETag for repeat polls)"""
     if not x_wallet_address:
         return []
     
-    cursor = teams.find({"owner_wallet": x_wallet_address})
-    result = []
-    async for team in cursor:
-        team["_id"] = str(team["_id"])
-        result.append(team)
-    return result
+    mine = await teams.find({"owner_wallet": x_wallet_address}).sort("_id", 1).to_list(None)
+    return list_response(request, mine)
 
 
 @app.get("/teams/{team_id}")
 async def get_team(team_id: str):
     """Get a specific team by ID"""
-    team = await teams.find_one({"_id": ObjectId(team_id)})
+    team = await team_cache.get(team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     team["_id"] = str(team["_id"])
@@ -669,7 +1180,7 @@ async def update_team(
     x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
 ):
     """Update team (must be owner)"""
-    existing = await teams.find_one({"_id": ObjectId(team_id)})
+    existing = await team_cache.get(team_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -681,12 +1192,15 @@ async def update_team(
     update_data.pop("_id", None)
     update_data.pop("id", None)
     
-    await teams.update_one(
+    updated = await teams.find_one_and_update(
         {"_id": ObjectId(team_id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated = await teams.find_one({"_id": ObjectId(team_id)})
+    if not updated:
+        team_cache.invalidate(team_id)
+        raise HTTPException(status_code=404, detail="Team not found")
+    team_cache.store(updated)
     updated["_id"] = str(updated["_id"])
     return updated
 
@@ -697,7 +1211,7 @@ async def delete_team(
     x_wallet_address: Optional[str] = Header(None, alias="x-wallet-address")
 ):
     """Delete team (must be owner)"""
-    existing = await teams.find_one({"_id": ObjectId(team_id)})
+    existing = await team_cache.get(team_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -705,6 +1219,7 @@ async def delete_team(
         raise HTTPException(status_code=403, detail="Not authorized to delete this team")
     
     await teams.delete_one({"_id": ObjectId(team_id)})
+    team_cache.invalidate(team_id)
     return {"status": "deleted", "team_id": team_id}
 
 
@@ -4,7 +4,7 @@ import json
 import time
 from dotenv import load_dotenv
 import asyncio
-from database import teams, drives
+from database import teams, drive_summaries
 
 # Load environment variables
 load_dotenv()
@@ -111,7 +111,7 @@ class MoltbookAgent:
 
     async def get_summary_stats(self):
         """Fetch summary stats from MongoDB (Async)"""
-        total_games = await drives.count_documents({})
+        total_games = await drive_summaries.estimated_document_count()
         
         # Aggregation for Top 3 teams by games played (wins + losses)
         pipeline = [
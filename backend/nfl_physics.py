@@ -2,12 +2,46 @@ import pymunk
 import math
 import random
 
+# Formation tables: (role, x offset from line of scrimmage, y)
+OFFENSE_FORMATION = [
+    ('QB', -5.0, 0), ('RB', -8.0, 0),
+    # OL
+    ('OL0', -1.0, -4), ('OL1', -1.0, -2), ('OL2', -1.0, 0), ('OL3', -1.0, 2), ('OL4', -1.0, 4),
+    # WRs
+    ('WR1', -1.0, 20), ('WR2', -1.0, -20),
+    ('WR3', -2.0, 10),  # Slot
+    ('TE', -1.0, 6),    # Tight End
+]
+DEFENSE_FORMATION = [
+    # DL (4 men front)
+    ('DL0', 1.0, -6), ('DL1', 1.0, -2), ('DL2', 1.0, 2), ('DL3', 1.0, 6),
+    # LBs (3 LBs - 4-3 defense)
+    ('LB1', 5.0, -5), ('LB2', 5.0, 0), ('LB3', 5.0, 5),  # LB2 = Middle
+    # Secondary (4 DBs)
+    ('CB1', 10.0, 20), ('CB2', 10.0, -20),
+    ('SS', 15.0, -5),  # Strong Safety
+    ('FS', 15.0, 5),   # Free Safety
+]
+RECEIVERS = ['WR1', 'WR2', 'WR3', 'TE', 'RB']
+
+
 class NFLPhysicsWorld:
+    ENGINE = "pymunk"
+    
     # Physics constants
     GRAVITY = -32.0  # feet/sec² (scaled for game feel)
     PASS_SPEED = 45.0  # yards/sec (average NFL pass ~50 mph)
     
-    def __init__(self):
+    # Dead ball: keep simulating this many steps after the whistle, then stop
+    DEAD_BALL_TAIL = 20  # 0.4s at 50 Hz
+    TACKLE_RANGE = 1.3  # yards between centers (2 * player radius + a bit)
+    TACKLE_HOLD = 15  # steps of unbroken contact to bring the carrier down (0.3s wrap-up)
+    GOAL_LINE_X = 50.0  # yard line 100 in world coords
+    
+    def __init__(self, rng=None):
+        # Per-world RNG (interception rolls) so plays can be reproduced
+        self.rng = rng or random.Random()
+        
         # Create Pymunk space
         self.space = pymunk.Space()
         self.space.gravity = (0, 0)
@@ -26,6 +60,8 @@ class NFLPhysicsWorld:
         self.ball_in_flight = False
         self.ball_carrier = None  # 'QB', 'RB', 'WR1', etc.
         self.pass_result = None  # 'complete', 'incomplete', 'interception'
+        self.dead_ball = None  # {"reason", "step"} once the play is whistled dead
+        self.contact_steps = 0  # Consecutive steps a defender has been on the ball carrier
         
         # Ball trail for visualization
         self.ball_trail = []
@@ -40,6 +76,59 @@ class NFLPhysicsWorld:
         # Scaling to GFootball coords (-1.0 to 1.0)
         self.world_to_gfoot_x = 1.0 / 50.0 
         self.world_to_gfoot_y = 0.42 / (self.FIELD_HEIGHT / 2.0)
+        
+        self.build_players()
+
+    def build_players(self):
+        """Create the 22 player bodies once; setup_formation resets them in place"""
+        for role, dx, y in OFFENSE_FORMATION:
+            self.add_player(1, (dx, y), role)
+        for role, dx, y in DEFENSE_FORMATION:
+            self.add_player(2, (dx, y), role)
+        self.formation = [
+            (body, dx, y) for body, (_, dx, y) in zip(
+                list(self.offense.values()) + list(self.defense.values()),
+                OFFENSE_FORMATION + DEFENSE_FORMATION
+            )
+        ]
+        self.reset(self.rng)
+
+    def reset(self, rng=None):
+        """
+        Prepare a reused world for a new drive: fresh RNG and the same bodies
+        re-added to a new Space in a canonical layout. Contact caches and the
+        spatial index depend on history, so this keeps a drive's simulation
+        identical to a fresh world's whatever ran in it before.
+        """
+        self.rng = rng or random.Random()
+        
+        # Cached contacts stay attached to the bodies across a Space swap:
+        # separate everyone and step until they expire
+        for body, dx, y in self.formation:
+            self.reset_body(body, dx, y)
+        for _ in range(self.space.collision_persistence + 1):
+            self.space.step(0.02)
+        
+        space = pymunk.Space()
+        space.gravity = self.space.gravity
+        space.damping = self.space.damping
+        for body, dx, y in self.formation:
+            shapes = list(body.shapes)
+            self.space.remove(body, *shapes)
+            self.reset_body(body, dx, y)
+            space.add(body, *shapes)
+        self.space = space
+        self.frames = []
+        self.clear_play()
+
+    @staticmethod
+    def reset_body(body, x, y):
+        body.position = (x, y)
+        body.velocity = (0, 0)
+        body.force = (0, 0)
+        body.angle = 0
+        body.angular_velocity = 0
+        body.torque = 0
 
     def add_player(self, team_id, pos, role):
         mass = 100.0
@@ -67,63 +156,103 @@ class NFLPhysicsWorld:
         # Yard Line 0-100. Map 0 to -50 in world coords
         x_start = yard_line - 50.0
         
-        # Clear existing
-        for b in list(self.space.bodies):
-            self.space.remove(b, *b.shapes)
-        self.offense = {}
-        self.defense = {}
+        # Line up the pooled bodies, at rest
+        for body, dx, y in self.formation:
+            self.reset_body(body, x_start + dx, y)
+        self.clear_play()
+
+    def clear_play(self):
+        """Ball, pass and whistle state back to the snap (players are placed by the caller)"""
         self.ball_trail = []
         self.pass_result = None
-        
-        # OFFENSE
-        self.add_player(1, (x_start - 5.0, 0), 'QB')
-        self.add_player(1, (x_start - 8.0, 0), 'RB')
-        # OL
-        for i, y in enumerate([-4, -2, 0, 2, 4]):
-            self.add_player(1, (x_start - 1.0, y), f'OL{i}')
-        # WRs
-        self.add_player(1, (x_start - 1.0, 20), 'WR1')
-        self.add_player(1, (x_start - 1.0, -20), 'WR2')
-        self.add_player(1, (x_start - 2.0, 10), 'WR3') # Slot
-        self.add_player(1, (x_start - 1.0, 6), 'TE')   # Tight End
+        self.dead_ball = None
+        self.contact_steps = 0
+        self.reset_ball()
 
-        # DEFENSE
-        # DL (4 men front usually, let's stick to 4DL)
-        for i, y in enumerate([-6, -2, 2, 6]):
-            self.add_player(2, (x_start + 1.0, y), f'DL{i}')
-        
-        # LBs (3 LBs - 4-3 defense)
-        self.add_player(2, (x_start + 5.0, -5), 'LB1')
-        self.add_player(2, (x_start + 5.0, 0), 'LB2') # Middle
-        self.add_player(2, (x_start + 5.0, 5), 'LB3')
-
-        # Secondary (4 DBs)
-        self.add_player(2, (x_start + 10.0, 20), 'CB1')
-        self.add_player(2, (x_start + 10.0, -20), 'CB2')
-        self.add_player(2, (x_start + 15.0, -5), 'SS') # Strong Safety
-        self.add_player(2, (x_start + 15.0, 5), 'FS')  # Free Safety
-        
+    def reset_ball(self):
         # Initialize ball at Center (Line of Scrimmage)
         self.ball_carrier = None # Snapping
         
         # Center is OL2
-        center = self.offense['OL2']
-        self.ball_x = center.position.x
-        self.ball_y = center.position.y
+        self.ball_x, self.ball_y = self.player_xy('OL2')
         self.ball_z = 0.1  # On ground
+        self.ball_vx = self.ball_vy = self.ball_vz = 0.0
         self.ball_in_flight = False
 
+    def player_xy(self, role):
+        """World position of an offensive player"""
+        pos = self.offense[role].position
+        return pos.x, pos.y
+
+    def team_positions(self):
+        """World positions of (offense, defense) as [x, y] lists"""
+        return (
+            [[b.position.x, b.position.y] for b in self.offense.values()],
+            [[b.position.x, b.position.y] for b in self.defense.values()]
+        )
+
+    def nearest_defender_distance(self, x, y):
+        return min(
+            math.sqrt((body.position.x - x)**2 + (body.position.y - y)**2)
+            for body in self.defense.values()
+        )
+
+    def dead_ball_reason(self):
+        """
+        Why the play is over ('incomplete', 'interception', 'touchdown', 'out_of_bounds', 'tackle'), or None.
+        Called once per step: a tackle needs TACKLE_HOLD steps of contact, so a carrier can break one.
+        """
+        if self.pass_result in ('incomplete', 'interception'):
+            return self.pass_result
+        if self.ball_in_flight or self.ball_carrier not in self.offense:
+            self.contact_steps = 0
+            return None
+        x, y = self.player_xy(self.ball_carrier)
+        if x >= self.GOAL_LINE_X:
+            return 'touchdown'
+        if abs(y) >= self.FIELD_HEIGHT / 2:
+            return 'out_of_bounds'
+        if self.nearest_defender_distance(x, y) < self.TACKLE_RANGE:
+            self.contact_steps += 1
+        else:
+            self.contact_steps = 0
+        if self.contact_steps >= self.TACKLE_HOLD:
+            return 'tackle'
+        return None
+
+    def dead_ball_end(self, step, end, tail):
+        """Play end step: `tail` steps after the first dead-ball step, else unchanged"""
+        if self.dead_ball is None:
+            reason = self.dead_ball_reason()
+            if reason:
+                self.dead_ball = {"reason": reason, "step": step}
+                return min(end, step + 1 + tail)
+        return end
+
+    def play_summary(self, steps):
+        """Terminal state of the last play (world coords, yards)"""
+        offense, defense = self.team_positions()
+        return {
+            "steps": steps,
+            "dead_ball": self.dead_ball,
+            "pass_result": self.pass_result,
+            "ball_carrier": self.ball_carrier,
+            "ball": [self.ball_x, self.ball_y, self.ball_z],
+            "offense": offense,
+            "defense": defense
+        }
+
     def throw_ball(self, target_role='WR1', throw_power=1.0):
         """Launch ball toward target with realistic trajectory"""
         if self.ball_carrier != 'QB':
             return
         
-        qb = self.offense['QB']
-        target = self.offense[target_role]
+        qb_x, qb_y = self.player_xy('QB')
+        target_x, target_y = self.player_xy(target_role)
         
         # Calculate distance to target
-        dx = target.position.x - qb.position.x
-        dy = target.position.y - qb.position.y
+        dx = target_x - qb_x
+        dy = target_y - qb_y
         distance = math.sqrt(dx*dx + dy*dy)
         
         # Calculate flight time based on distance and power
@@ -142,8 +271,8 @@ class NFLPhysicsWorld:
         self.ball_vz = -0.5 * self.GRAVITY * flight_time
         
         # Set ball position at QB's hands
-        self.ball_x = qb.position.x
-        self.ball_y = qb.position.y
+        self.ball_x = qb_x
+        self.ball_y = qb_y
         self.ball_z = 2.0
         
         self.ball_in_flight = True
@@ -170,33 +299,21 @@ class NFLPhysicsWorld:
         
         # Check for interception by defenders
         if self.ball_z < 4.0:  # Ball low enough to catch/intercept
-            for role, body in self.defense.items():
-                dist = math.sqrt(
-                    (body.position.x - self.ball_x)**2 + 
-                    (body.position.y - self.ball_y)**2
-                )
-                if dist < 2.0:  # Within 2 yards
-                    # Interception chance based on proximity
-                    int_chance = (2.0 - dist) / 2.0 * 0.3  # Max 30% chance
-                    if random.random() < int_chance:
-                        self.ball_in_flight = False
-                        self.pass_result = 'interception'
-                        self.ball_carrier = role
-                        return
+            interceptor = self.try_intercept()
+            if interceptor:
+                self.ball_in_flight = False
+                self.pass_result = 'interception'
+                self.ball_carrier = interceptor
+                return
         
         # Check for catch by receivers
         if self.ball_z < 3.0 and self.ball_z > 0.5:
-            for role in ['WR1', 'WR2']:
-                body = self.offense[role]
-                dist = math.sqrt(
-                    (body.position.x - self.ball_x)**2 + 
-                    (body.position.y - self.ball_y)**2
-                )
-                if dist < 1.5:  # Within catching range
-                    self.ball_in_flight = False
-                    self.pass_result = 'complete'
-                    self.ball_carrier = role
-                    return
+            receiver = self.try_catch()
+            if receiver:
+                self.ball_in_flight = False
+                self.pass_result = 'complete'
+                self.ball_carrier = receiver
+                return
         
         # Ball hits ground - incomplete
         if self.ball_z <= 0:
@@ -204,10 +321,44 @@ class NFLPhysicsWorld:
             self.ball_in_flight = False
             self.pass_result = 'incomplete'
 
-    def run_play(self, play_type, steps=100):
+    def try_intercept(self):
+        """Roll for an interception by any defender near the ball. Returns role or None."""
+        for role, body in self.defense.items():
+            dist = math.sqrt(
+                (body.position.x - self.ball_x)**2 + 
+                (body.position.y - self.ball_y)**2
+            )
+            if dist < 2.0:  # Within 2 yards
+                # Interception chance based on proximity
+                int_chance = (2.0 - dist) / 2.0 * 0.3  # Max 30% chance
+                if self.rng.random() < int_chance:
+                    return role
+        return None
+
+    def try_catch(self):
+        """Return the receiver in catching range of the ball, if any"""
+        for role in ['WR1', 'WR2']:
+            body = self.offense[role]
+            dist = math.sqrt(
+                (body.position.x - self.ball_x)**2 + 
+                (body.position.y - self.ball_y)**2
+            )
+            if dist < 1.5:  # Within catching range
+                return role
+        return None
+
+    def run_play(self, play_type, steps=100, record=True, keyframe_every=0, tail=DEAD_BALL_TAIL):
+        """
+        Simulate one play and return its play_summary().
+        record=False skips per-step frames (headless); keyframe_every=N then
+        keeps every Nth step plus the last one, tagged with its "step".
+        The play stops `tail` steps after a dead ball (tail=None runs all steps);
+        the summary's "steps" is the number actually simulated.
+        """
         dt = 0.02  # 50 Hz
         
         SNAP_STEPS = 15
+        end = steps + SNAP_STEPS
         
         # Center position (LoS)
         center_x = self.offense['OL2'].position.x # OL2 is middle (Center)
@@ -216,7 +367,8 @@ class NFLPhysicsWorld:
         target_carrier = 'QB' if play_type == 'PASS' else 'RB'
         target_body = self.offense[target_carrier]
         
-        for i in range(steps + SNAP_STEPS):
+        i = 0
+        while i < end:
             # SNAP PHASE
             if i < SNAP_STEPS:
                 t = i / float(SNAP_STEPS)
@@ -267,7 +419,7 @@ class NFLPhysicsWorld:
                     elif progress >= 0.3 and not self.ball_in_flight and self.ball_carrier == 'QB':
                         self.throw_ball('WR1', throw_power=1.0)
                     
-                    possible_receivers = ['WR1', 'WR2', 'WR3', 'TE', 'RB']
+                    possible_receivers = RECEIVERS
                     for role in possible_receivers:
                         if role in self.offense:
                             # Simple routes: WRs go deep, TE/RB go short/out
@@ -296,21 +448,33 @@ class NFLPhysicsWorld:
                 self.update_ball_physics(dt)
                 
                 # If receiver caught it, they run
-                if self.ball_carrier in ['WR1', 'WR2', 'WR3', 'TE', 'RB'] and self.pass_result == 'complete':
+                if self.ball_carrier in RECEIVERS and self.pass_result == 'complete':
                     receiver = self.offense[self.ball_carrier]
                     receiver.apply_force_at_local_point((35000, 0))
                     self.ball_x = receiver.position.x
                     self.ball_y = receiver.position.y
                     self.ball_z = 0.8
             
-            # Clamp players to field boundaries
+            self.space.step(dt)
+
+            # Clamp players to field boundaries (world x runs -50..50, the end lines)
             for body in list(self.offense.values()) + list(self.defense.values()):
-                x = max(0, min(self.FIELD_WIDTH, body.position.x))
+                x = max(-self.FIELD_WIDTH / 2, min(self.FIELD_WIDTH / 2, body.position.x))
                 y = max(-self.FIELD_HEIGHT / 2, min(self.FIELD_HEIGHT / 2, body.position.y))
                 body.position = pymunk.Vec2d(x, y)
+            if tail is not None and i >= SNAP_STEPS:
+                end = self.dead_ball_end(i, end, tail)
+            self.capture_frame(i, end, record, keyframe_every)
+            i += 1
+        
+        return self.play_summary(end)
 
-            self.space.step(dt)
+    def capture_frame(self, step, total_steps, record, keyframe_every):
+        if record:
+            self.record_frame()
+        elif keyframe_every and (step % keyframe_every == 0 or step == total_steps - 1):
             self.record_frame()
+            self.frames[-1]["step"] = step
 
     def record_frame(self):
         frame = {
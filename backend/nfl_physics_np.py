@@ -0,0 +1,245 @@
+"""
+Vectorized NumPy Physics Engine
+Drop-in alternative to the pymunk NFLPhysicsWorld. All 22 players live in
+position/velocity/force arrays, so pursuit, damping, clamping and
+offense-vs-defense collisions are a handful of array ops per step instead
+of thousands of pymunk body calls per play. Frames use the same schema.
+"""
+import random
+
+import numpy as np
+
+from nfl_physics import NFLPhysicsWorld, OFFENSE_FORMATION, DEFENSE_FORMATION, RECEIVERS
+
+
+class NumpyPhysicsWorld(NFLPhysicsWorld):
+    ENGINE = "numpy"
+
+    # Body constants (match NFLPhysicsWorld.add_player / Space settings)
+    MASS = 100.0
+    RADIUS = 0.6  # yards
+    ELASTICITY = 0.1
+    DAMPING = 0.5
+
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.space = None  # No pymunk space; bodies live in arrays
+
+        n_off = len(OFFENSE_FORMATION)
+        n_def = len(DEFENSE_FORMATION)
+        self.n_off = n_off
+
+        # Offense rows first, then defense
+        self.offense = {role: i for i, (role, _, _) in enumerate(OFFENSE_FORMATION)}
+        self.defense = {role: n_off + i for i, (role, _, _) in enumerate(DEFENSE_FORMATION)}
+        self.defense_roles = [role for role, _, _ in DEFENSE_FORMATION]
+        self.formation = np.array(
+            [(dx, y) for _, dx, y in OFFENSE_FORMATION + DEFENSE_FORMATION], dtype=float
+        )
+
+        self.pos = np.zeros((n_off + n_def, 2))
+        self.vel = np.zeros_like(self.pos)
+        self.force = np.zeros_like(self.pos)
+
+        # Index groups used every step
+        self.def_idx = np.arange(n_off, n_off + n_def)
+        self.dl_idx = np.array([i for r, i in self.defense.items() if r.startswith('DL')])
+        self.cover_idx = np.array([i for r, i in self.defense.items() if not r.startswith('DL')])
+        self.skill_idx = np.array([i for r, i in self.offense.items() if r in RECEIVERS])
+
+        # Pass routes: WRs go deep, TE/RB go short/out
+        self.route_idx = np.array([self.offense[r] for r in RECEIVERS])
+        self.route_force = np.array([
+            (30000, 0) if r.startswith('WR') else (20000, 5000 if r == 'TE' else -5000)
+            for r in RECEIVERS
+        ], dtype=float)
+
+        self.frame_scale = np.array([self.world_to_gfoot_x, self.world_to_gfoot_y])
+        self.field_min = np.array([-self.FIELD_WIDTH / 2, -self.FIELD_HEIGHT / 2])
+        self.field_max = np.array([self.FIELD_WIDTH / 2, self.FIELD_HEIGHT / 2])
+
+    def build_players(self):
+        pass  # Arrays are allocated in __init__
+
+    def reset(self, rng=None):
+        """New drive: fresh RNG, everyone at rest (no Space to rebuild)"""
+        self.rng = rng or random.Random()
+        self.pos[:] = 0.0
+        self.vel[:] = 0.0
+        self.force[:] = 0.0
+        self.frames = []
+        self.clear_play()
+
+    def setup_formation(self, yard_line=25):
+        x_start = yard_line - 50.0
+        self.pos[:] = self.formation
+        self.pos[:, 0] += x_start
+        self.vel[:] = 0.0
+        self.force[:] = 0.0
+        self.clear_play()
+
+    def player_xy(self, role):
+        x, y = self.pos[self.offense[role]]
+        return float(x), float(y)
+
+    def team_positions(self):
+        return self.pos[:self.n_off].tolist(), self.pos[self.n_off:].tolist()
+
+    def try_intercept(self):
+        d = self.pos[self.def_idx] - (self.ball_x, self.ball_y)
+        dist = np.hypot(d[:, 0], d[:, 1])
+        # Roll in formation order, same as the pymunk engine
+        for k in np.flatnonzero(dist < 2.0):
+            int_chance = (2.0 - dist[k]) / 2.0 * 0.3  # Max 30% chance
+            if self.rng.random() < int_chance:
+                return self.defense_roles[k]
+        return None
+
+    def nearest_defender_distance(self, x, y):
+        d = self.pos[self.def_idx] - (x, y)
+        return float(np.sqrt((d ** 2).sum(axis=1).min()))
+
+    def try_catch(self):
+        for role in ['WR1', 'WR2']:
+            x, y = self.pos[self.offense[role]]
+            if (x - self.ball_x) ** 2 + (y - self.ball_y) ** 2 < 1.5 ** 2:
+                return role
+        return None
+
+    def pursue(self, idx, target, force_mag):
+        """Push players at `idx` toward `target` (one point or one per player)"""
+        diff = target - self.pos[idx]
+        dist = np.hypot(diff[:, 0], diff[:, 1])
+        moving = dist > 0
+        self.force[idx[moving]] += diff[moving] / dist[moving, None] * force_mag
+
+    def integrate(self, dt):
+        """One step in Chipmunk order: positions, collisions, then velocities"""
+        pos, vel = self.pos, self.vel
+        pos += vel * dt
+        vel *= self.DAMPING ** dt
+        vel += self.force * (dt / self.MASS)
+        self.force[:] = 0.0
+        self.collide()
+
+    def collide(self):
+        """Resolve offense-vs-defense circle overlaps (teammates pass through)"""
+        n = self.n_off
+        pos, vel = self.pos, self.vel
+        d = pos[None, n:] - pos[:n, None]  # (off, def, 2), offense -> defense
+        dist = np.hypot(d[..., 0], d[..., 1])
+        hit = (dist < 2 * self.RADIUS) & (dist > 0)
+        if not hit.any():
+            return
+
+        normal = np.zeros_like(d)
+        normal[hit] = d[hit] / dist[hit, None]
+
+        # Split penetration evenly (equal masses)
+        push = normal * ((2 * self.RADIUS - dist) * hit * 0.5)[..., None]
+        pos[:n] -= push.sum(axis=1)
+        pos[n:] += push.sum(axis=0)
+
+        # Inelastic impulse along the contact normal for approaching pairs
+        rel = vel[None, n:] - vel[:n, None]
+        vn = (rel * normal).sum(axis=-1)
+        j = np.where(hit & (vn < 0), -(1 + self.ELASTICITY) * vn * 0.5, 0.0)
+        impulse = normal * j[..., None]
+        vel[:n] -= impulse.sum(axis=1)
+        vel[n:] += impulse.sum(axis=0)
+
+    def run_play(self, play_type, steps=100, record=True, keyframe_every=0, tail=NFLPhysicsWorld.DEAD_BALL_TAIL):
+        dt = 0.02  # 50 Hz
+
+        SNAP_STEPS = 15
+        end = steps + SNAP_STEPS
+
+        off = self.offense
+        pos, force = self.pos, self.force
+        center_x, center_y = pos[off['OL2']]
+        target_idx = off['QB' if play_type == 'PASS' else 'RB']
+
+        i = 0
+        while i < end:
+            # SNAP PHASE
+            if i < SNAP_STEPS:
+                t = i / float(SNAP_STEPS)
+                target_x, target_y = pos[target_idx]
+                self.ball_x = float(center_x + (target_x - center_x) * t)
+                self.ball_y = float(center_y + (target_y - center_y) * t)
+                self.ball_z = 0.1 + (0.8 - 0.1) * t # Lift to waist
+
+            # PLAY PHASE
+            else:
+                play_step = i - SNAP_STEPS
+                progress = play_step / float(steps)
+
+                if play_type == 'RUN':
+                    rb = off['RB']
+                    force[rb, 0] += 40000
+                    self.ball_x, self.ball_y = float(pos[rb, 0]), float(pos[rb, 1])
+                    self.ball_z = 0.8
+                    self.ball_carrier = 'RB'
+
+                    # Defense pursues RB
+                    self.pursue(self.def_idx, pos[rb], 30000)
+
+                elif play_type == 'PASS':
+                    qb = off['QB']
+
+                    # QB dropback (first 30%), throw at 30%
+                    if progress < 0.3:
+                        force[qb, 0] -= 10000
+                        self.ball_x, self.ball_y = float(pos[qb, 0]), float(pos[qb, 1])
+                        self.ball_z = 0.8
+                        self.ball_carrier = 'QB'
+                    elif not self.ball_in_flight and self.ball_carrier == 'QB':
+                        self.throw_ball('WR1', throw_power=1.0)
+
+                    force[self.route_idx] += self.route_force
+
+                    # DL rush the QB, everyone else covers the nearest skill player
+                    self.pursue(self.dl_idx, pos[qb], 15000)
+                    skills = pos[self.skill_idx]
+                    gap = skills[None, :, :] - pos[self.cover_idx][:, None, :]
+                    nearest = np.argmin((gap ** 2).sum(axis=-1), axis=1)
+                    self.pursue(self.cover_idx, skills[nearest], 25000)
+
+                # Update ball physics (only if in flight)
+                self.update_ball_physics(dt)
+
+                # If receiver caught it, they run
+                if self.ball_carrier in RECEIVERS and self.pass_result == 'complete':
+                    receiver = off[self.ball_carrier]
+                    force[receiver, 0] += 35000
+                    self.ball_x, self.ball_y = float(pos[receiver, 0]), float(pos[receiver, 1])
+                    self.ball_z = 0.8
+
+            self.integrate(dt)
+
+            # Clamp players to field boundaries (world x runs -50..50, the end lines)
+            np.clip(self.pos, self.field_min, self.field_max, out=self.pos)
+            if tail is not None and i >= SNAP_STEPS:
+                end = self.dead_ball_end(i, end, tail)
+            self.capture_frame(i, end, record, keyframe_every)
+            i += 1
+
+        return self.play_summary(end)
+
+    def record_frame(self):
+        scaled = (self.pos * self.frame_scale).tolist()
+        self.frames.append({
+            "ball": [
+                self.ball_x * self.world_to_gfoot_x,
+                self.ball_y * self.world_to_gfoot_y,
+                self.ball_z * 0.1  # Scale z for visual
+            ],
+            "ball_trail": [
+                [p[0] * self.world_to_gfoot_x, p[1] * self.world_to_gfoot_y, p[2] * 0.1]
+                for p in self.ball_trail
+            ],
+            "ball_in_flight": self.ball_in_flight,
+            "pass_result": self.pass_result,
+            "left_team": scaled[:self.n_off],
+            "right_team": scaled[self.n_off:]
+        })
@@ -1,7 +1,9 @@
 import random
 
 class NFLGame:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # Per-game RNG so a drive can be reproduced from its seed
+        self.rng = rng or random.Random()
         self.reset_game()
 
     def reset_game(self):
@@ -55,7 +57,7 @@ class NFLGame:
 
     def kickoff(self):
         # Simple kickoff logic
-        kick_dist = random.randint(40, 70)
+        kick_dist = self.rng.randint(40, 70)
         self.yards = 35 + kick_dist # Kicking from 35 standard
         if self.yards > 100:
             self.yards = 25 # Touchback
@@ -93,10 +95,10 @@ class NFLGame:
         }
 
         if action_type == 'PASS':
-            roll = random.random()
+            roll = self.rng.random()
             if roll < 0.6: # 60% completion
-                gain = random.randint(5, 20)
-                if random.random() < 0.1: gain += 30 # Big play
+                gain = self.rng.randint(5, 20)
+                if self.rng.random() < 0.1: gain += 30 # Big play
                 result["yards_gained"] = gain
                 self.yards += gain
                 self.yards_to_go -= gain
@@ -109,8 +111,8 @@ class NFLGame:
                 self.down += 1
 
         elif action_type == 'RUN':
-            gain = random.randint(-2, 8)
-            if random.random() < 0.05: gain += 20 # Breakaway
+            gain = self.rng.randint(-2, 8)
+            if self.rng.random() < 0.05: gain += 20 # Breakaway
             result["yards_gained"] = gain
             self.yards += gain
             self.yards_to_go -= gain
@@ -118,7 +120,7 @@ class NFLGame:
             if gain == 0: self.down += 1
 
         elif action_type == 'PUNT':
-            punt_dist = random.randint(30, 50)
+            punt_dist = self.rng.randint(30, 50)
             self.yards += punt_dist
             if self.yards > 100: self.yards = 80 # Touchback equivalent?
             self.switch_possession()
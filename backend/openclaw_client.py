@@ -1,30 +1,38 @@
 """
 OpenClaw Gateway Client
-Communicates with local OpenClaw gateway for AI decisions
+Communicates with local OpenClaw gateway for AI decisions.
+
+Talks to the gateway's OpenAI-compatible HTTP API over a pooled keep-alive
+client (llm_client), authenticated with OPENCLAW_TOKEN, with a deadline per
+call and a circuit breaker in front. The old path (one `openclaw agent` CLI
+process per decision) is kept as get_ai_decision_cli for comparison
+(bench_openclaw.py) and as OPENCLAW_TRANSPORT=cli.
 """
 import requests
 import json
 import os
+import asyncio
+import shlex
+import subprocess
+
+from llm_client import get_llm_client
+from circuit_breaker import get_breaker
 
 OPENCLAW_GATEWAY = os.getenv("OPENCLAW_GATEWAY", "http://127.0.0.1:18789")
 OPENCLAW_TOKEN = os.getenv("OPENCLAW_TOKEN", "supersim-secret-token")
+OPENCLAW_MODEL = os.getenv("OPENCLAW_MODEL", "openclaw")
+OPENCLAW_DEADLINE = float(os.getenv("OPENCLAW_DEADLINE", "8.0"))  # seconds per decision, queueing included
+OPENCLAW_TRANSPORT = os.getenv("OPENCLAW_TRANSPORT", "http")  # http | cli
+OPENCLAW_CLI = os.getenv("OPENCLAW_CLI", "openclaw")
+CHAT_PATH = "/v1/chat/completions"
 
+DEFENSE_PLAYS = ["BLITZ", "ZONE", "MAN", "PREVENT"]
+OFFENSE_PLAYS = ["RUN", "PASS", "PUNT", "FG"]
 
-def get_ai_decision(game_state: dict, role: str = "defense") -> dict:
-    """
-    Ask OpenClaw AI for a play decision based on game state.
-    
-    Args:
-        game_state: Current game situation (down, yards, position, etc.)
-        role: "defense" or "offense"
-    
-    Returns:
-        dict with 'play' (the AI's choice) and 'trash_talk' (optional message)
-    """
-    
-    # Build prompt for the AI
+
+def build_prompt(game_state: dict, role: str) -> str:
     if role == "defense":
-        prompt = f"""You are an AI defensive coordinator. The offense just called their play.
+        return f"""You are an AI defensive coordinator. The offense just called their play.
 
 GAME STATE:
 - Down: {game_state.get('down', 1)}
@@ -35,8 +43,7 @@ GAME STATE:
 Choose your defensive play. Respond with ONLY a JSON object:
 {{"play": "BLITZ" or "ZONE" or "MAN" or "PREVENT", "trash_talk": "short competitive message"}}
 """
-    else:
-        prompt = f"""You are an AI offensive coordinator.
+    return f"""You are an AI offensive coordinator.
 
 GAME STATE:
 - Down: {game_state.get('down', 1)}
@@ -47,56 +54,148 @@ Choose your offensive play. Respond with ONLY a JSON object:
 {{"play": "RUN" or "PASS" or "PUNT" or "FG", "trash_talk": "short competitive message"}}
 """
 
+
+def parse_decision(ai_text: str, role: str) -> dict:
+    """Pull {"play", "trash_talk"} out of the model's reply"""
+    # Try to extract JSON from response
+    start = ai_text.find("{")
+    end = ai_text.rfind("}") + 1
+    if start >= 0 and end > start:
+        try:
+            ai_decision = json.loads(ai_text[start:end])
+            return {
+                "play": ai_decision.get("play", "ZONE" if role == "defense" else "PASS"),
+                "trash_talk": ai_decision.get("trash_talk", "Let's see what you got! 🏈")
+            }
+        except ValueError:
+            pass
+
+    # Fallback: extract play from text
+    ai_upper = ai_text.upper()
+    plays = DEFENSE_PLAYS if role == "defense" else OFFENSE_PLAYS
+    play = next((p for p in plays if p in ai_upper), plays[1])
+    return {"play": play, "trash_talk": "Here comes the heat! 🔥"}
+
+
+def chat_payload(prompt: str) -> dict:
+    return {
+        "model": OPENCLAW_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": False
+    }
+
+
+def reply_text(body: dict) -> str:
+    """Assistant text from a chat completion (or a bare {"reply"} body)"""
+    choices = body.get("choices") or []
+    if choices:
+        return choices[0].get("message", {}).get("content", "")
+    return body.get("reply", body.get("content", ""))
+
+
+def _gateway_client():
+    return get_llm_client(
+        OPENCLAW_GATEWAY, timeout=OPENCLAW_DEADLINE,
+        headers={"Authorization": f"Bearer {OPENCLAW_TOKEN}"}
+    )
+
+
+async def get_ai_decision_async(game_state: dict, role: str = "defense", deadline: float = OPENCLAW_DEADLINE) -> dict:
+    """
+    Ask OpenClaw AI for a play decision over the pooled gateway connection.
+    `deadline` bounds the whole call (waiting for a slot included); on
+    timeout, errors or an open circuit the heuristic fallback answers.
+    """
+    if OPENCLAW_TRANSPORT == "cli":
+        return await asyncio.to_thread(get_ai_decision_cli, game_state, role, deadline)
+
+    breaker = get_breaker("openclaw")
+    if not breaker.allow():
+        breaker.record_fallback()
+        return _fallback_decision(game_state, role)
+
+    try:
+        # A cancelled call (e.g. a discarded speculation) releases its probe slot
+        with breaker.call():
+            body = await asyncio.wait_for(
+                _gateway_client().post_json(CHAT_PATH, chat_payload(build_prompt(game_state, role))),
+                timeout=deadline
+            )
+    except Exception as e:
+        print(f"OpenClaw error: {e!r}")
+        breaker.record_fallback()
+        return _fallback_decision(game_state, role)
+
+    return parse_decision(reply_text(body), role)
+
+
+_gateway_session = requests.Session()  # Keep-alive for blocking callers
+
+
+def get_ai_decision(game_state: dict, role: str = "defense", deadline: float = OPENCLAW_DEADLINE) -> dict:
+    """
+    Ask OpenClaw AI for a play decision based on game state.
+    Blocking version of get_ai_decision_async (scripts, threads).
+
+    Args:
+        game_state: Current game situation (down, yards, position, etc.)
+        role: "defense" or "offense"
+
+    Returns:
+        dict with 'play' (the AI's choice) and 'trash_talk' (optional message)
+    """
+    if OPENCLAW_TRANSPORT == "cli":
+        return get_ai_decision_cli(game_state, role, deadline)
+
+    breaker = get_breaker("openclaw")
+    if not breaker.allow():
+        breaker.record_fallback()
+        return _fallback_decision(game_state, role)
+
+    try:
+        with breaker.call():
+            response = _gateway_session.post(
+                OPENCLAW_GATEWAY + CHAT_PATH,
+                json=chat_payload(build_prompt(game_state, role)),
+                headers={"Authorization": f"Bearer {OPENCLAW_TOKEN}"},
+                timeout=deadline
+            )
+            response.raise_for_status()
+            body = response.json()
+    except Exception as e:
+        print(f"OpenClaw error: {e}")
+        breaker.record_fallback()
+        return _fallback_decision(game_state, role)
+
+    return parse_decision(reply_text(body), role)
+
+
+def get_ai_decision_cli(game_state: dict, role: str = "defense", deadline: float = 30) -> dict:
+    """The original transport: one `openclaw agent` process per decision"""
     try:
-        import subprocess
-        
         # Use openclaw CLI to get AI decision
         result = subprocess.run(
-            [
-                "openclaw", "agent",
+            shlex.split(OPENCLAW_CLI) + [
+                "agent",
                 "--to", "+15550000000",
-                "--message", prompt,
+                "--message", build_prompt(game_state, role),
                 "--json"
             ],
             capture_output=True,
             text=True,
-            timeout=30
+            timeout=deadline
         )
-        
+
         if result.returncode == 0:
-            import json as json_mod
             try:
-                response = json_mod.loads(result.stdout)
-                ai_text = response.get("reply", response.get("content", ""))
-                
-                # Try to extract JSON from response
-                start = ai_text.find("{")
-                end = ai_text.rfind("}") + 1
-                if start >= 0 and end > start:
-                    ai_decision = json.loads(ai_text[start:end])
-                    return {
-                        "play": ai_decision.get("play", "ZONE"),
-                        "trash_talk": ai_decision.get("trash_talk", "Let's see what you got! 🏈")
-                    }
-            except:
-                pass
-            
-            # Fallback: extract play from text
-            ai_upper = result.stdout.upper()
-            if "BLITZ" in ai_upper:
-                play = "BLITZ"
-            elif "MAN" in ai_upper:
-                play = "MAN"
-            elif "PREVENT" in ai_upper:
-                play = "PREVENT"
-            else:
-                play = "ZONE"
-            
-            return {"play": play, "trash_talk": "Here comes the heat! 🔥"}
+                ai_text = reply_text(json.loads(result.stdout))
+            except ValueError:
+                ai_text = result.stdout
+            return parse_decision(ai_text, role)
         else:
             print(f"OpenClaw CLI error: {result.stderr}")
             return _fallback_decision(game_state, role)
-            
+
     except Exception as e:
         print(f"OpenClaw error: {e}")
         return _fallback_decision(game_state, role)
@@ -106,7 +205,7 @@ def _fallback_decision(game_state: dict, role: str) -> dict:
     """Fallback AI when OpenClaw is unavailable"""
     down = game_state.get('down', 1)
     yards = game_state.get('yards_to_go', 10)
-    
+
     if role == "defense":
         # Simple heuristic
         if down >= 3 and yards > 5:
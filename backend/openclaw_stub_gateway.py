@@ -0,0 +1,121 @@
+"""
+Stand-in OpenClaw gateway for tests and benchmarks.
+Serves the OpenAI-compatible POST /v1/chat/completions with bearer auth
+and canned football decisions; also mimics `openclaw agent ... --json`
+so the CLI path can be exercised without the real binary.
+
+    python openclaw_stub_gateway.py --port 18789 [--delay 0.05]
+    OPENCLAW_CLI="python openclaw_stub_gateway.py" python bench_openclaw.py
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TOKEN = os.getenv("OPENCLAW_TOKEN", "supersim-secret-token")
+
+
+def canned_reply(prompt):
+    """Deterministic decision for a prompt (defense if it mentions the defense)"""
+    if "defensive" in prompt:
+        play = ["BLITZ", "ZONE", "MAN", "PREVENT"][len(prompt) % 4]
+    else:
+        play = ["RUN", "PASS"][len(prompt) % 2]
+    return json.dumps({"play": play, "trash_talk": "Stub says hi 🦞"})
+
+
+class StubGatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real gateway
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+    token = DEFAULT_TOKEN
+    delay = 0.0
+    requests_served = 0
+    connections = set()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        type(self).connections.add(self.client_address)
+
+        if self.path != "/v1/chat/completions":
+            return self.reply(404, {"error": "not found"})
+        if self.headers.get("Authorization") != f"Bearer {self.token}":
+            return self.reply(401, {"error": "unauthorized"})
+
+        if self.delay:
+            time.sleep(self.delay)
+        type(self).requests_served += 1
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        self.reply(200, {
+            "id": f"stub-{self.requests_served}",
+            "object": "chat.completion",
+            "model": body.get("model", "openclaw"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": canned_reply(prompt)}, "finish_reason": "stop"}]
+        })
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except ConnectionError:
+            pass  # Client gave up (deadline tests)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_gateway(port=0, delay=0.0, token=DEFAULT_TOKEN):
+    """Serve on a background thread. Returns (server, base_url); server.shutdown() stops it."""
+    handler = type("Handler", (StubGatewayHandler,), {"delay": delay, "token": token, "connections": set()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_cli(argv):
+    """`agent --message <prompt> --json`: answer like the openclaw CLI (via the gateway if one is set)"""
+    parser = argparse.ArgumentParser(prog="openclaw")
+    parser.add_argument("command")
+    parser.add_argument("--to")
+    parser.add_argument("--message", required=True)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    gateway = os.getenv("OPENCLAW_GATEWAY")
+    if gateway:
+        import requests
+        response = requests.post(
+            gateway + "/v1/chat/completions",
+            json={"messages": [{"role": "user", "content": args.message}]},
+            headers={"Authorization": f"Bearer {DEFAULT_TOKEN}"},
+            timeout=30
+        )
+        content = response.json()["choices"][0]["message"]["content"]
+    else:
+        content = canned_reply(args.message)
+    print(json.dumps({"reply": content}))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "agent":
+        run_cli(sys.argv[1:])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18789)
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated model latency (seconds)")
+    args = parser.parse_args()
+    server, url = start_stub_gateway(args.port, args.delay)
+    print(f"🦞 Stub OpenClaw gateway on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,88 @@
+"""
+Query Profiler
+A pymongo command listener on the Mongo client that times every CRUD
+command, per collection and operation (e.g. "teams.find"). Commands
+slower than SLOW_QUERY_MS are logged with their filter shape (field
+names, never values) and counted, so a query that turned into a
+collection scan shows up as the data grows (/health/db).
+"""
+import os
+import threading
+
+from pymongo import monitoring
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))  # Log/count commands slower than this
+
+TRACKED = {"find", "getMore", "aggregate", "count", "distinct", "insert", "update", "delete", "findAndModify"}
+
+
+def command_target(name: str, command: dict) -> str:
+    """Collection a command runs against (getMore names it separately)"""
+    target = command.get("collection") if name == "getMore" else command.get(name)
+    return target if isinstance(target, str) else "?"
+
+
+def filter_shape(name: str, command: dict) -> list:
+    """Field names the command filters/sorts on (values are left out of the logs)"""
+    if name == "aggregate":
+        stages = command.get("pipeline") or [{}]
+        query = stages[0].get("$match", {})
+    elif name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or [{}]
+        query = statements[0].get("q", {})
+    else:
+        query = command.get("filter") or command.get("query") or {}
+    shape = sorted(query)
+    if command.get("sort"):
+        shape.append(f"sort:{','.join(command['sort'])}")
+    return shape
+
+
+class QueryProfiler(monitoring.CommandListener):
+    def __init__(self, slow_ms=SLOW_QUERY_MS):
+        self.slow_ms = slow_ms
+        self.lock = threading.Lock()
+        self.pending = {}  # (connection, request id) -> (operation key, filter shape)
+        self.operations = {}  # "collection.command" -> counters
+
+    def started(self, event):
+        if event.command_name not in TRACKED:
+            return
+        key = f"{command_target(event.command_name, event.command)}.{event.command_name}"
+        with self.lock:
+            self.pending[(event.connection_id, event.request_id)] = (key, filter_shape(event.command_name, event.command))
+
+    def record(self, event, failed=False):
+        with self.lock:
+            started = self.pending.pop((event.connection_id, event.request_id), None)
+            if started is None:
+                return
+            key, shape = started
+            ms = event.duration_micros / 1000
+            op = self.operations.setdefault(key, {"count": 0, "slow": 0, "failed": 0, "total_ms": 0.0, "max_ms": 0.0})
+            op["count"] += 1
+            op["total_ms"] += ms
+            op["max_ms"] = max(op["max_ms"], ms)
+            op["failed"] += failed
+            slow = ms >= self.slow_ms
+            op["slow"] += slow
+        if slow:
+            print(f"LOG:> 🐢 Slow query {key} {ms:.0f} ms on {shape or ['(all)']}")
+
+    def succeeded(self, event):
+        self.record(event)
+
+    def failed(self, event):
+        self.record(event, failed=True)
+
+    def stats(self) -> dict:
+        with self.lock:
+            operations = {
+                key: {**op, "total_ms": round(op["total_ms"], 1), "max_ms": round(op["max_ms"], 1),
+                      "avg_ms": round(op["total_ms"] / op["count"], 2) if op["count"] else 0.0}
+                for key, op in sorted(self.operations.items())
+            }
+        return {"slow_query_ms": self.slow_ms, "operations": operations}
+
+
+query_profiler = QueryProfiler()
@@ -0,0 +1,162 @@
+"""
+Replay Response Cache
+A drive's replay never changes once committed, so GET /drives/{id} bodies
+are built once and kept as bytes:
+
+- size-bounded LRU (REPLAY_CACHE_BYTES) keyed by (drive id, format)
+- gzip/brotli variants compressed on first demand and cached alongside
+  (brotli only if the `brotli` package is installed)
+- concurrent misses for the same replay share one load (a Moltbook post
+  sends a burst of viewers at a fresh drive)
+- bodies too big for the cache (admits()) are streamed by the caller
+  instead of being built in memory
+- hit/miss/coalesced/eviction counters (stats())
+
+Responses carry a strong ETag per (drive, format, encoding) and
+`Cache-Control: immutable`; held_etag() matches If-None-Match against every
+variant a drive could have been served as.
+"""
+import asyncio
+import gzip
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from replay_codec import REPLAY_FORMAT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+REPLAY_CACHE_BYTES = int(os.getenv("REPLAY_CACHE_BYTES", str(64 * 1024 * 1024)))  # Cached replay bodies, all variants
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Best of br/gzip the client accepts (q > 0), else identity"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip") if brotli else ("gzip",):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+
+def replay_etag(drive_id: str, format: str, encoding: str) -> str:
+    return f'"{drive_id}-{format}-v{REPLAY_FORMAT}-{encoding}"'
+
+
+def held_etag(if_none_match: Optional[str], drive_id: str, format: str, encoding: str) -> Optional[str]:
+    """
+    The If-None-Match tag still current for this replay, else None.
+    Replays never change, so a copy in the negotiated encoding or a streamed
+    (identity) one are both good.
+    """
+    tags = {tag.strip() for tag in (if_none_match or "").split(",")}
+    for encoding in (encoding, "identity"):
+        etag = replay_etag(drive_id, format, encoding)
+        if etag in tags or "*" in tags:
+            return etag
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class ReplayResponseCache:
+    def __init__(self, max_bytes=REPLAY_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> {encoding: bytes}, least recently used first
+        self.size = 0
+        self.loading = {}  # key -> task building the body
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "too_large": 0}
+
+    def holds(self, key) -> bool:
+        """Cached, or being loaded right now"""
+        return key in self.entries or key in self.loading
+
+    def admits(self, size: int) -> bool:
+        """Whether a body of `size` bytes may be cached (larger ones should be streamed)"""
+        if size > self.max_bytes // 4:
+            self.counters["too_large"] += 1
+            return False
+        return True
+
+    async def body(self, key, load) -> bytes:
+        """Uncompressed body for `key`; `load()` builds it on a miss (once, however many callers wait)"""
+        variants = self.entries.get(key)
+        if variants is not None:
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return variants["identity"]
+
+        task = self.loading.get(key)
+        if task is None:
+            self.counters["misses"] += 1
+            task = asyncio.ensure_future(load())
+            self.loading[key] = task
+            task.add_done_callback(lambda done: self._loaded(key, done))
+        else:
+            self.counters["coalesced"] += 1
+        # A caller that disconnects doesn't cancel the load for the others
+        return await asyncio.shield(task)
+
+    def _loaded(self, key, task):
+        self.loading.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._add(key, "identity", task.result())
+
+    def _add(self, key, encoding, data: bytes):
+        if not self.admits(len(data)):
+            return
+        variants = self.entries.setdefault(key, {})
+        if encoding in variants:
+            return
+        variants[encoding] = data
+        self.size += len(data)
+        self.entries.move_to_end(key)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= sum(len(v) for v in evicted.values())
+            self.counters["evictions"] += 1
+
+    async def encoded(self, key, body: bytes, encoding: str) -> bytes:
+        """`body` in `encoding`, compressed off the event loop the first time"""
+        if encoding == "identity":
+            return body
+        variants = self.entries.get(key) or {}
+        data = variants.get(encoding)
+        if data is not None:
+            self.entries.move_to_end(key)
+        else:
+            data = await asyncio.to_thread(compress, body, encoding)
+            if key in self.entries:
+                self._add(key, encoding, data)
+        return data
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"] + self.counters["coalesced"]
+        return {
+            **self.counters,
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round((self.counters["hits"] + self.counters["coalesced"]) / lookups, 3) if lookups else 0.0,
+            "brotli": brotli is not None,
+        }
@@ -0,0 +1,201 @@
+"""
+Compact Replay Codec
+Versioned columnar encoding for drive replays.
+
+Each play is stored once as struct-of-arrays instead of ~135 frame dicts:
+- player and ball coordinates quantized to int16 (1e-4 field units),
+  keyframes absolute and everything in between as per-frame deltas,
+  packed little-endian and base64'd
+- ball_in_flight / pass_result as change points
+- the ball trail derived from the ball track (throw origin + flight window)
+- game_state stored once per play
+
+expand_replay() turns it back into the legacy frame list for old clients.
+The same decoder lives in frontend/index.html (decodeReplay).
+"""
+import base64
+import numpy as np
+
+REPLAY_FORMAT = 1
+SCALE = 10000  # quantization steps per field unit
+KEYFRAME_INTERVAL = 25
+MAX_TRAIL_LENGTH = 15  # NFLPhysicsWorld.MAX_TRAIL_LENGTH
+INT16_MAX = 32767
+
+
+def _quantize(values):
+    return np.clip(np.rint(np.asarray(values, dtype=float) * SCALE), -INT16_MAX, INT16_MAX).astype(np.int32)
+
+
+def _pack(q, keyframes):
+    """Delta-encode rows of q (frame-major) against the previous row, except keyframes"""
+    enc = q.copy()
+    enc[1:] -= q[:-1]
+    enc[keyframes] = q[keyframes]
+    return base64.b64encode(enc.astype("<i2").tobytes()).decode("ascii")
+
+
+def _unpack(data, n, keyframes):
+    q = np.frombuffer(base64.b64decode(data), dtype="<i2").astype(np.int32).reshape(n, -1)
+    is_key = np.zeros(n, dtype=bool)
+    is_key[keyframes] = True
+    for i in range(1, n):
+        if not is_key[i]:
+            q[i] += q[i - 1]
+    return q
+
+
+def _keyframes(*tracks):
+    """Regular keyframes plus any frame whose delta would overflow int16"""
+    n = len(tracks[0])
+    key = np.zeros(n, dtype=bool)
+    key[::KEYFRAME_INTERVAL] = True
+    for q in tracks:
+        if n > 1:
+            key[1:] |= np.abs(np.diff(q, axis=0)).reshape(n - 1, -1).max(axis=1) > INT16_MAX
+    return np.flatnonzero(key)
+
+
+def _change_points(values):
+    points = []
+    for i, v in enumerate(values):
+        if not points or points[-1][1] != v:
+            points.append([i, v])
+    return points
+
+
+def _expand_changes(points, n):
+    values = []
+    for k, (start, v) in enumerate(points):
+        end = points[k + 1][0] if k + 1 < len(points) else n
+        values.extend([v] * (end - start))
+    return values
+
+
+def _derive_trails(ball, trail):
+    """
+    Rebuild per-frame trails from the ball track. The physics engine appends
+    the pre-step ball position on every in-flight step: the throw origin
+    first, then the previous frame's ball, capped at MAX_TRAIL_LENGTH.
+    """
+    n = len(ball)
+    trails = [[] for _ in range(n)]
+    if trail is None:
+        return trails
+    start, end, origin = trail["start"], trail["end"], trail["origin"]
+    for i in range(start, n):
+        last = min(i, end)
+        points = [origin] + [ball[k - 1] for k in range(max(start + 1, last - MAX_TRAIL_LENGTH + 1), last + 1)]
+        trails[i] = points[-MAX_TRAIL_LENGTH:]
+    return trails
+
+
+def split_plays(frames):
+    """Group a legacy flat frame list into plays by their game_state"""
+    plays = []
+    for frame in frames:
+        if not plays or frame.get("game_state") != plays[-1][0].get("game_state"):
+            plays.append([])
+        plays[-1].append(frame)
+    return plays
+
+
+def encode_play(frames):
+    """Encode one play's frames (all sharing a game_state)"""
+    n = len(frames)
+    n_left = len(frames[0]["left_team"])
+    n_right = len(frames[0]["right_team"])
+
+    players = _quantize([f["left_team"] + f["right_team"] for f in frames])  # (n, 22, 2)
+    ball = _quantize([f["ball"] for f in frames])  # (n, 3)
+    keyframes = _keyframes(players, ball)
+
+    play = {
+        "n": n,
+        "teams": [n_left, n_right],
+        "game_state": frames[0].get("game_state"),
+        "keyframes": keyframes.tolist(),
+        "players": _pack(players.reshape(n, -1), keyframes),
+        "ball": _pack(ball, keyframes),
+        "ball_in_flight": _change_points([f["ball_in_flight"] for f in frames]),
+        "pass_result": _change_points([f["pass_result"] for f in frames]),
+        "trail": None,
+    }
+
+    # Trail: derive from the ball track, keep it explicit only if that doesn't reproduce it
+    actual = [_quantize(f["ball_trail"]).reshape(-1, 3).tolist() for f in frames]
+    start = next((i for i, t in enumerate(actual) if t), None)
+    if start is not None:
+        end = max(i for i in range(start, n) if i == start or actual[i] != actual[i - 1])
+        play["trail"] = {"start": start, "end": end, "origin": actual[start][0]}
+    if _derive_trails(ball.tolist(), play["trail"]) != actual:
+        play["trail"] = None
+        play["trails"] = actual
+
+    return play
+
+
+def encode_replay(frames, frame_counts=None):
+    """
+    Encode a drive's flat frame list. frame_counts gives frames per play
+    (run_drive's plays[i]["frame_count"]); legacy lists are split by game_state.
+    """
+    if frame_counts is None:
+        plays = split_plays(frames)
+    else:
+        plays, offset = [], 0
+        for count in frame_counts:
+            plays.append(frames[offset:offset + count])
+            offset += count
+    return {
+        "v": REPLAY_FORMAT,
+        "scale": SCALE,
+        "plays": [encode_play(p) for p in plays if p],
+    }
+
+
+def expand_play(play, scale=SCALE):
+    """Decode one compact play back into legacy frame dicts"""
+    n = play["n"]
+    n_left, n_right = play["teams"]
+    players = _unpack(play["players"], n, play["keyframes"]).reshape(n, n_left + n_right, 2) / scale
+    ball_q = _unpack(play["ball"], n, play["keyframes"])
+    ball = (ball_q / scale).tolist()
+
+    if "trails" in play:
+        trails = [(np.asarray(t, dtype=float).reshape(-1, 3) / scale).tolist() for t in play["trails"]]
+    else:
+        trail = play["trail"]
+        if trail:
+            trail = dict(trail, origin=[c / scale for c in trail["origin"]])
+        trails = _derive_trails(ball, trail)
+
+    in_flight = _expand_changes(play["ball_in_flight"], n)
+    pass_result = _expand_changes(play["pass_result"], n)
+    game_state = play.get("game_state")
+
+    frames = []
+    for i in range(n):
+        positions = players[i].tolist()
+        frame = {
+            "ball": ball[i],
+            "ball_trail": trails[i],
+            "ball_in_flight": in_flight[i],
+            "pass_result": pass_result[i],
+            "left_team": positions[:n_left],
+            "right_team": positions[n_left:]
+        }
+        if game_state is not None:
+            frame["game_state"] = game_state
+        frames.append(frame)
+    return frames
+
+
+def expand_replay(replay):
+    """Decode a compact replay into the legacy flat frame list"""
+    if replay.get("v") != REPLAY_FORMAT:
+        raise ValueError(f"Unsupported replay format: {replay.get('v')}")
+    frames = []
+    for play in replay["plays"]:
+        frames.extend(expand_play(play, replay.get("scale", SCALE)))
+    return frames
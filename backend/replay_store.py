@@ -0,0 +1,172 @@
+"""
+Replay Blob Store
+Keeps replay payloads out of the `drives` collection. Each play of a
+compact replay (see replay_codec) is written as its own zlib-compressed
+JSON chunk keyed by (drive_id, play_index), so a replay can be streamed
+play by play and a single play fetched without loading the rest.
+
+Backends:
+- gridfs: GridFS bucket `replays` in the app database (default)
+- file:   local directory (REPLAY_DIR), a stand-in for an object store
+"""
+import abc
+import asyncio
+import json
+import os
+import zlib
+
+REPLAY_STORE = os.getenv("REPLAY_STORE", "gridfs")
+REPLAY_DIR = os.getenv("REPLAY_DIR", os.path.join(os.path.dirname(__file__), "replays"))
+COMPRESSION_LEVEL = 6
+
+
+def play_json(play):
+    return json.dumps(play, separators=(",", ":")).encode()
+
+
+def pack_chunk(raw):
+    """Encoded play JSON bytes -> chunk bytes"""
+    return zlib.compress(raw, COMPRESSION_LEVEL)
+
+
+def unpack_chunk(data):
+    """Chunk bytes -> encoded play JSON bytes (not parsed)"""
+    return zlib.decompress(data)
+
+
+class ReplayChunkMissing(LookupError):
+    """A chunk the drive's manifest lists isn't in the store (lost or deleted)"""
+
+    def __init__(self, drive_id, index):
+        super().__init__(f"Replay chunk {drive_id}/{index} missing")
+        self.drive_id = drive_id
+        self.index = index
+
+
+class ReplayStore(abc.ABC):
+    """Per-play replay chunks keyed by drive id and play index"""
+    name = None
+
+    @abc.abstractmethod
+    async def put_chunk(self, drive_id, index, data):
+        pass
+
+    @abc.abstractmethod
+    async def get_chunk(self, drive_id, index):
+        """Compressed chunk bytes, or None if missing"""
+
+    @abc.abstractmethod
+    async def delete(self, drive_id):
+        pass
+
+    async def put_replay(self, drive_id, replay):
+        """Write every play of an encoded replay. Returns the manifest for the drive doc."""
+        size = 0
+        for index, play in enumerate(replay["plays"]):
+            raw = play_json(play)
+            size += len(raw)
+            await self.put_chunk(drive_id, index, pack_chunk(raw))
+        return {
+            "v": replay["v"],
+            "scale": replay["scale"],
+            "play_count": len(replay["plays"]),
+            "bytes": size,  # Play JSON, uncompressed (sizes the response before reading any chunk)
+            "store": self.name,
+        }
+
+    async def get_play_json(self, drive_id, index):
+        """Encoded play as raw JSON bytes, or None"""
+        data = await self.get_chunk(drive_id, index)
+        return unpack_chunk(data) if data is not None else None
+
+    async def get_play(self, drive_id, index):
+        raw = await self.get_play_json(drive_id, index)
+        return json.loads(raw) if raw is not None else None
+
+    async def iter_play_json(self, drive_id, play_count):
+        """Every play's raw JSON in order; ReplayChunkMissing if one is gone"""
+        for index in range(play_count):
+            raw = await self.get_play_json(drive_id, index)
+            if raw is None:
+                raise ReplayChunkMissing(drive_id, index)
+            yield raw
+
+
+class GridFSReplayStore(ReplayStore):
+    name = "gridfs"
+
+    def __init__(self, database, bucket_name="replays"):
+        from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+        self.bucket = AsyncIOMotorGridFSBucket(database, bucket_name=bucket_name)
+
+    @staticmethod
+    def filename(drive_id, index):
+        return f"{drive_id}/{index:04d}"
+
+    async def put_chunk(self, drive_id, index, data):
+        await self.bucket.upload_from_stream(
+            self.filename(drive_id, index), data,
+            metadata={"drive_id": str(drive_id), "play": index}
+        )
+
+    async def get_chunk(self, drive_id, index):
+        from gridfs.errors import NoFile
+        try:
+            stream = await self.bucket.open_download_stream_by_name(self.filename(drive_id, index))
+        except NoFile:
+            return None
+        return await stream.read()
+
+    async def delete(self, drive_id):
+        cursor = self.bucket.find({"metadata.drive_id": str(drive_id)})
+        async for grid_out in cursor:
+            await self.bucket.delete(grid_out._id)
+
+
+class FileReplayStore(ReplayStore):
+    name = "file"
+
+    def __init__(self, root=REPLAY_DIR):
+        self.root = root
+
+    def path(self, drive_id, index):
+        return os.path.join(self.root, str(drive_id), f"play_{index:04d}.json.z")
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _delete(self, drive_id):
+        folder = os.path.join(self.root, str(drive_id))
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                os.remove(os.path.join(folder, name))
+            os.rmdir(folder)
+
+    async def put_chunk(self, drive_id, index, data):
+        await asyncio.to_thread(self._write, self.path(drive_id, index), data)
+
+    async def get_chunk(self, drive_id, index):
+        return await asyncio.to_thread(self._read, self.path(drive_id, index))
+
+    async def delete(self, drive_id):
+        await asyncio.to_thread(self._delete, drive_id)
+
+
+def get_replay_store(database=None):
+    """Build the configured replay store (REPLAY_STORE=gridfs|file)"""
+    if REPLAY_STORE == "file":
+        return FileReplayStore()
+    if database is None:
+        from database import db as database
+    return GridFSReplayStore(database)
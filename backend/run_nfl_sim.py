@@ -1,27 +1,70 @@
-import requests
 import json
 import sys
 from nfl_sim import NFLGame
 from nfl_physics import NFLPhysicsWorld
+from nfl_physics_np import NumpyPhysicsWorld
+from replay_codec import encode_replay, encode_play, REPLAY_FORMAT, SCALE
+from coach_cache import coach_cache
+from llm_client import get_llm_client
+from circuit_breaker import get_breaker, breaker_snapshot
 
 import os
 import random
+import threading
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
-LLM_OFFLINE = False
+OLLAMA_BREAKER = "ollama"  # circuit_breaker name for the coach backend
+
+# Physics backends selectable per drive
+PHYSICS_ENGINES = {
+    "pymunk": NFLPhysicsWorld,
+    "numpy": NumpyPhysicsWorld,
+}
+PHYSICS_ENGINE = os.getenv("PHYSICS_ENGINE", "pymunk")
+PHYSICS_POOL_SIZE = int(os.getenv("PHYSICS_POOL_SIZE", "4"))  # Idle worlds kept per engine
+DRIVE_PIPELINE = os.getenv("DRIVE_PIPELINE", "1") == "1"  # Overlap physics with the next coach call
+
+# Bump whenever game rules or physics change in a way that alters frames
+# for the same (seed, decisions): stored replays can only be regenerated
+# by the engine version that produced them.
+ENGINE_VERSION = 4
+
+
+def drive_rngs(seed):
+    """Independent per-drive RNG streams, so e.g. coach fallbacks never shift physics rolls"""
+    return {
+        name: random.Random(f"{seed}:{name}")
+        for name in ("game", "physics", "coach")
+    }
+
+_idle_worlds = {}  # engine -> worlds waiting for the next drive in this process
+_worlds_lock = threading.Lock()
+
+
+def acquire_physics_world(engine, rng=None):
+    """A pooled physics world for `engine`, reset for a new drive (bodies are reused)"""
+    with _worlds_lock:
+        idle = _idle_worlds.get(engine)
+        world = idle.pop() if idle else None
+    if world is None:
+        return PHYSICS_ENGINES[engine](rng=rng)
+    world.reset(rng)
+    return world
 
-def call_nfl_agent(game_state, strategy_prompt="Win the game"):
-    """
-    Calls Ollama to decide the next play. 
-    Falls back to simple logic if LLM is offline.
-    """
-    global LLM_OFFLINE
-    
-    # 1. FAILSAVE MODE
-    if LLM_OFFLINE:
-        return simple_coach_logic(game_state)
 
-    prompt = f"""
+def release_physics_world(world):
+    with _worlds_lock:
+        idle = _idle_worlds.setdefault(world.ENGINE, [])
+        if len(idle) < PHYSICS_POOL_SIZE:
+            idle.append(world)
+
+
+def coach_prompt(game_state, strategy_prompt):
+    return f"""
     You are the Head Coach of an American Football team. 
     Your coaching style: {strategy_prompt}
     
@@ -35,40 +78,71 @@ def call_nfl_agent(game_state, strategy_prompt="Win the game"):
     Provide your reasoning strictly in this format:
     ACTION: <RUN or PASS> | REASON: <Short explanation>
     """
+
+
+def parse_coach_reply(result):
+    """'ACTION: PASS | REASON: ...' -> (action, reason)"""
+    action = "RUN"
+    reason = "Default decision"
+    
+    for line in result.split('\n'):
+        if "ACTION:" in line.upper():
+            parts = line.split("|")
+            action = parts[0].split(":")[1].strip().upper()
+            if len(parts) > 1 and "REASON:" in parts[1].upper():
+                reason = parts[1].split(":", 1)[1].strip()
+    
+    # Sanity check
+    if action not in ["RUN", "PASS"]: action = "RUN"
+    return action, reason
+
+
+def ollama_payload(game_state, strategy_prompt):
+    return {
+        "model": "llama3.2:1b", 
+        "prompt": coach_prompt(game_state, strategy_prompt),
+        "stream": False
+    }
+
+
+def coach_fallback(game_state, breaker, rng=None, counters=None):
+    """Offline coach decision while the LLM circuit is open or a call failed"""
+    breaker.record_fallback()
+    if counters is not None:
+        counters["fallbacks"] = counters.get("fallbacks", 0) + 1
+    return simple_coach_logic(game_state, reason_prefix="[Offline] ", rng=rng)
+
+
+async def call_nfl_agent_async(game_state, strategy_prompt="Win the game", rng=None, counters=None):
+    """
+    Calls Ollama to decide the next play, over the shared async connection pool.
+    Falls back to simple logic while the LLM circuit breaker is open.
+    counters: per-drive cache hits/misses/explores and fallbacks.
+    """
+    cached = await coach_cache.get_async(strategy_prompt, game_state, rng=rng, counters=counters)
+    if cached:
+        return cached
+    
+    breaker = get_breaker(OLLAMA_BREAKER)
+    if not breaker.allow():
+        return coach_fallback(game_state, breaker, rng, counters)
     
+    client = get_llm_client(OLLAMA_URL)
     try:
-        response = requests.post(OLLAMA_URL, json={
-            "model": "llama3.2:1b", 
-            "prompt": prompt,
-            "stream": False
-        }, timeout=float(os.getenv("OLLAMA_TIMEOUT", "5.0")))
-        
-        if response.status_code == 200:
-            result = response.json().get("response", "")
-            action = "RUN"
-            reason = "Default decision"
-            
-            for line in result.split('\n'):
-                if "ACTION:" in line.upper():
-                    parts = line.split("|")
-                    action = parts[0].split(":")[1].strip().upper()
-                    if len(parts) > 1 and "REASON:" in parts[1].upper():
-                        reason = parts[1].split(":", 1)[1].strip()
-            
-            # Sanity check
-            if action not in ["RUN", "PASS"]: action = "RUN"
-            return action, reason
-            
+        # Cancellation (abandoned stream) frees a half-open probe slot instead of leaking it
+        with breaker.call():
+            body = await client.post_json(urlsplit(OLLAMA_URL).path, ollama_payload(game_state, strategy_prompt))
+            action, reason = parse_coach_reply(body.get("response", ""))
     except Exception as e:
-        print(f"LOG:> ⚠️ LLM Connection Failed: {e}. Switching to Offline Coach.")
-        LLM_OFFLINE = True
-        return simple_coach_logic(game_state, reason_prefix="[Offline] ")
-
-    return "RUN", "LLM failed (Status)"
+        print(f"LOG:> ⚠️ LLM call failed: {e!r}. Using Offline Coach.")
+        return coach_fallback(game_state, breaker, rng, counters)
+    
+    await coach_cache.put_async(strategy_prompt, game_state, action, reason)
+    return action, reason
 
-def simple_coach_logic(game_state, reason_prefix=""):
+def simple_coach_logic(game_state, reason_prefix="", rng=None):
     """Fallback logic when LLM is down"""
-    import random
+    rng = rng or random
     
     down = game_state['down']
     to_go = game_state['to_go']
@@ -85,7 +159,7 @@ def simple_coach_logic(game_state, reason_prefix=""):
         reason = "Long way to go, airing it out."
     else:
         # Mix it up
-        if random.random() > 0.5:
+        if rng.random() > 0.5:
             action = "PASS"
             reason = "Balanced playcalling."
         else:
@@ -95,14 +169,144 @@ def simple_coach_logic(game_state, reason_prefix=""):
     return action, f"{reason_prefix}{reason}"
 
 
-def run_drive(team_name="Team", strategy_prompt="Play to win"):
+def simulate_play(physics_world, action, start_yard, record, keyframe_every):
+    """Render one play's physics. Returns (summary, frames, seconds)."""
+    started = time.perf_counter()
+    print(f"LOG:> Simulating physical {action} play at {start_yard} yard line...")
+    physics_world.setup_formation(start_yard)
+    summary = physics_world.run_play(action, steps=120, record=record, keyframe_every=keyframe_every)
+    frames = physics_world.frames
+    physics_world.frames = []
+    return summary, frames, time.perf_counter() - started
+
+
+_drive_loops = threading.local()
+
+
+def drive_loop():
+    """
+    This thread's long-lived event loop for blocking drives. The pooled LLM
+    clients are bound to a loop, so reusing one keeps their keep-alive
+    connections and concurrency limit across drives (asyncio.run per
+    drive left a new, never-closed client behind each time).
+    """
+    loop = getattr(_drive_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _drive_loops.loop = asyncio.new_event_loop()
+    return loop
+
+
+def run_drive(team_name="Team", strategy_prompt="Play to win", engine=None,
+              record=True, keyframe_every=0, seed=None, decisions=None, pipeline=DRIVE_PIPELINE):
+    """Blocking run_drive_async, for worker processes and scripts (no running event loop)"""
+    return drive_loop().run_until_complete(run_drive_async(
+        team_name, strategy_prompt, engine=engine, record=record, keyframe_every=keyframe_every,
+        seed=seed, decisions=decisions, pipeline=pipeline
+    ))
+
+
+def run_drive_streaming(events, stop, team_name="Team", strategy_prompt="Play to win", engine=None,
+                        pipeline=DRIVE_PIPELINE):
+    """
+    run_drive for a streaming worker (DriveJobQueue.submit(stream=True)):
+    each play event goes on `events` as soon as it's rendered, with that
+    play's compact replay chunk in place of its frames. Stops after the
+    current play once `stop` is set (returns None).
+    Returns the result with the replay already encoded (no frames).
+    """
+    return drive_loop().run_until_complete(stream_drive_async(
+        events, stop, team_name, strategy_prompt, engine=engine, pipeline=pipeline
+    ))
+
+
+async def stream_drive_async(events, stop, team_name="Team", strategy_prompt="Play to win", engine=None,
+                             pipeline=DRIVE_PIPELINE):
+    replay_plays = []  # Encoded per play; raw frames are dropped once sent
+    result = None
+    drive = drive_events(team_name, strategy_prompt, engine, pipeline=pipeline)
+    try:
+        async for event in drive:
+            if event["type"] == "play":
+                # That play alone as a compact replay (decodes like any other)
+                frames = event.pop("frames")
+                chunk = [encode_play(frames)] if frames else []
+                replay_plays.extend(chunk)
+                event["replay"] = {"v": REPLAY_FORMAT, "scale": SCALE, "plays": chunk}
+                events.put(event)
+                if stop.is_set():
+                    print("LOG:> Streamed drive abandoned, stopping")
+                    return None
+            else:
+                result = event["result"]
+    finally:
+        await drive.aclose()  # Cancels the coach's call for the next play right away
+    result["replay"] = {"v": REPLAY_FORMAT, "scale": SCALE, "plays": replay_plays}
+    return result
+
+
+async def run_drive_async(team_name="Team", strategy_prompt="Play to win", engine=None,
+                          record=True, keyframe_every=0, seed=None, decisions=None, pipeline=DRIVE_PIPELINE):
     """
-    Run a single drive challenge.
+    Run a single drive challenge (drive_events, collected).
+    engine: "pymunk" or "numpy" (defaults to PHYSICS_ENGINE)
+    record=False runs headless (outcomes only): frames holds just the
+    keyframes sampled every `keyframe_every` steps, or nothing at all.
+    seed: drives all randomness (a fresh one is picked if None).
+    decisions: recorded [action, reason] per play; when given, the coach
+    isn't called and the drive replays exactly (see regenerate_drive).
     Returns structured result with win/lose outcome.
     """
-    game = NFLGame()
-    physics_world = NFLPhysicsWorld()
     all_frames = []
+    async for event in drive_events(
+        team_name, strategy_prompt, engine=engine, record=record, keyframe_every=keyframe_every,
+        seed=seed, decisions=decisions, pipeline=pipeline
+    ):
+        if event["type"] == "play":
+            all_frames.extend(event["frames"])
+        else:
+            result = event["result"]
+    result["frames"] = all_frames
+    return result
+
+
+async def drive_events(team_name="Team", strategy_prompt="Play to win", engine=None,
+                       record=True, keyframe_every=0, seed=None, decisions=None, pipeline=DRIVE_PIPELINE):
+    """
+    Run a single drive challenge, yielding each play as soon as it's rendered:
+      {"type": "play", "play": n, "action", "reason", "result", "game_state", "logs", "frames", "physics"}
+      {"type": "result", "result": {...}}  last; run_drive_async's result without frames
+    Frames are handed off per play and never accumulated here.
+    pipeline: the coach decides play N+1 (it only needs the game state)
+    while play N's physics renders on the drive's own render thread (so
+    concurrent drives don't queue behind each other). Plays are still
+    simulated one at a time, in order, so results are identical.
+    Arguments as for run_drive_async.
+    """
+    drive_started = time.perf_counter()
+    coach_counts = {"hits": 0, "misses": 0, "explores": 0, "fallbacks": 0}  # This drive's alone
+    engine = engine or PHYSICS_ENGINE
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**53)  # JSON-safe
+    rngs = drive_rngs(seed)
+    game = NFLGame(rng=rngs["game"])
+    physics_world = acquire_physics_world(engine, rngs["physics"])
+    loop = asyncio.get_running_loop()
+    recorded = []  # Coach decisions, for regeneration
+    plays = []  # Per-play outcome + terminal physics state
+    timing = {"coach_s": 0.0, "coach_wait_s": 0.0, "physics_s": 0.0, "physics_wait_s": 0.0}
+    next_decision = None  # Coach call for the next play, running while this one renders
+    # One render thread per drive: its world is only ever touched one play at a time
+    physics_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="physics") if pipeline else None
+    
+    async def decide(play_num, state):
+        """Call LLM with team's strategy (or replay the recorded call)"""
+        started = time.perf_counter()
+        if decisions is not None:
+            decision = decisions[play_num - 1]
+        else:
+            decision = await call_nfl_agent_async(state, strategy_prompt, rng=rngs["coach"], counters=coach_counts)
+        timing["coach_s"] += time.perf_counter() - started
+        return decision
     
     # Track stats for XP calculation
     stats = {
@@ -120,81 +324,129 @@ def run_drive(team_name="Team", strategy_prompt="Play to win"):
     outcome = "in_progress"
     max_plays = 20  # Safety limit
     
-    while outcome == "in_progress" and stats["plays"] < max_plays:
-        stats["plays"] += 1
-        
-        # Get State
-        state = game.get_state()
-        
-        # Add current state to frames for UI
-        current_state = {
-            "down": state["down"],
-            "to_go": state["to_go"],
-            "yard_line": state["yards"],
-            "score": state["score"]
-        }
-        
-        # Call LLM with team's strategy
-        action, reason = call_nfl_agent(state, strategy_prompt)
-        
-        # Log Reasoning
-        reason_log = f"🧠 Coach: {reason}"
-        game.log(reason_log)
-        print(f"LOG:> {reason_log}")
-        
-        # Record start position
-        start_yard = game.yards
-        prev_down = game.down
-        
-        # Execute Play
-        result = game.step(action)
-        
-        # Track yards
-        stats["total_yards"] += result["yards_gained"]
-        
-        # Track completions
-        if action == "PASS":
-            if result["event"] == "complete":
-                stats["completions"] += 1
+    try:
+        while outcome == "in_progress" and stats["plays"] < max_plays:
+            stats["plays"] += 1
+            log_mark = len(game.game_log)
+            
+            # Get State
+            state = game.get_state()
+            
+            # Add current state to frames for UI
+            current_state = {
+                "down": state["down"],
+                "to_go": state["to_go"],
+                "yard_line": state["yards"],
+                "score": state["score"]
+            }
+            
+            waited = time.perf_counter()
+            if next_decision is not None:
+                action, reason = await next_decision
+                next_decision = None
+            else:
+                action, reason = await decide(stats["plays"], state)
+            timing["coach_wait_s"] += time.perf_counter() - waited
+            recorded.append([action, reason])
+            
+            # Log Reasoning
+            reason_log = f"🧠 Coach: {reason}"
+            game.log(reason_log)
+            print(f"LOG:> {reason_log}")
+            
+            # Record start position
+            start_yard = game.yards
+            prev_down = game.down
+            
+            # Execute Play
+            result = game.step(action)
+            
+            # Track yards
+            stats["total_yards"] += result["yards_gained"]
+            
+            # Track completions
+            if action == "PASS":
+                if result["event"] == "complete":
+                    stats["completions"] += 1
+                else:
+                    stats["incompletions"] += 1
+            
+            # Check for first down
+            if game.down == 1 and prev_down != 1 and result["event"] != "TOUCHDOWN":
+                stats["first_downs"] += 1
+            
+            play = {
+                "action": action,
+                "event": result["event"],
+                "yards_gained": result["yards_gained"],
+                "start_yard": start_yard
+            }
+            plays.append(play)
+            
+            # Log Outcome
+            outcome_log = f"Play {stats['plays']}: {result['type']} - {result['event']} ({result['yards_gained']} yds)"
+            print(f"LOG:> {outcome_log}")
+            
+            # Check win condition (TD)
+            if result["event"] == "TOUCHDOWN":
+                outcome = "win"
+                print(f"LOG:> 🎉 TOUCHDOWN! DRIVE SUCCESSFUL!")
+            
+            # Check lose conditions
+            elif game.possession != 1:  # Possession changed = turnover
+                outcome = "lose"
+                print(f"LOG:> ❌ TURNOVER! DRIVE FAILED!")
+            
+            elif game.down > 4:  # 4th down stop
+                outcome = "lose"
+                print(f"LOG:> ❌ STOPPED ON DOWNS! DRIVE FAILED!")
+            
+            # Execute Physics (the world renders one play at a time)
+            args = (physics_world, action, start_yard, record, keyframe_every)
+            if pipeline:
+                future = loop.run_in_executor(physics_thread, simulate_play, *args)
+                if outcome == "in_progress" and stats["plays"] < max_plays:
+                    next_decision = asyncio.ensure_future(decide(stats["plays"] + 1, game.get_state()))
+                waited = time.perf_counter()
+                summary, frames, seconds = await future
+                timing["physics_wait_s"] += time.perf_counter() - waited
             else:
-                stats["incompletions"] += 1
-        
-        # Check for first down
-        if game.down == 1 and prev_down != 1 and result["event"] != "TOUCHDOWN":
-            stats["first_downs"] += 1
-        
-        # Execute Physics
-        print(f"LOG:> Simulating physical {action} play at {start_yard} yard line...")
-        physics_world.setup_formation(start_yard)
-        physics_world.run_play(action, steps=120)
-        
-        # Add game state to each frame
-        for frame in physics_world.frames:
-            frame["game_state"] = current_state
-        
-        all_frames.extend(physics_world.frames)
-        physics_world.frames = []
-        
-        # Log Outcome
-        outcome_log = f"Play {stats['plays']}: {result['type']} - {result['event']} ({result['yards_gained']} yds)"
-        print(f"LOG:> {outcome_log}")
-        
-        # Check win condition (TD)
-        if result["event"] == "TOUCHDOWN":
-            outcome = "win"
-            print(f"LOG:> 🎉 TOUCHDOWN! DRIVE SUCCESSFUL!")
-            break
-        
-        # Check lose conditions
-        if game.possession != 1:  # Possession changed = turnover
-            outcome = "lose"
-            print(f"LOG:> ❌ TURNOVER! DRIVE FAILED!")
-            break
-        
-        if game.down > 4:  # 4th down stop
-            outcome = "lose"
-            print(f"LOG:> ❌ STOPPED ON DOWNS! DRIVE FAILED!")
-            break
+                summary, frames, seconds = simulate_play(*args)
+                timing["physics_wait_s"] += seconds
+            timing["physics_s"] += seconds
+            
+            # Add game state to each frame
+            for frame in frames:
+                frame["game_state"] = current_state
+            play["frame_count"] = len(frames)
+            play["physics"] = summary
+            
+            yield {
+                "type": "play",
+                "play": stats["plays"],
+                "action": action,
+                "reason": reason,
+                "result": {k: result[k] for k in ("type", "event", "yards_gained")},
+                "game_state": current_state,
+                "logs": game.game_log[log_mark:],
+                "frames": frames,
+                "physics": summary
+            }
+    finally:
+        if next_decision is not None:
+            next_decision.cancel()  # Consumer went away mid-drive
+        if physics_thread is not None:
+            physics_thread.shutdown(wait=False)  # A play still rendering finishes, then the thread exits
+    
+    # Back to the pool (a drive that raised or was abandoned just drops its world)
+    release_physics_world(physics_world)
+    
+    # Pipelining saves whatever coach and physics time overlapped
+    timing["wall_s"] = time.perf_counter() - drive_started
+    timing["saved_s"] = max(0.0, timing["coach_s"] + timing["physics_s"] - timing["coach_wait_s"] - timing["physics_wait_s"])
+    stats["timing"] = {k: round(v, 3) for k, v in timing.items()}
+    stats["coach_cache"] = {k: coach_counts[k] for k in ("hits", "misses", "explores")}
+    stats["coach_fallbacks"] = coach_counts["fallbacks"]
     
     # Calculate XP
     xp_earned = 0
@@ -207,18 +459,35 @@ def run_drive(team_name="Team", strategy_prompt="Play to win"):
     xp_earned += stats["first_downs"] * 10
     
     # Final Result
-    result = {
+    yield {"type": "result", "result": {
         "outcome": outcome,
         "team_name": team_name,
         "score": f"{game.points_team_1}-{game.points_team_2}",
         "stats": stats,
         "xp_earned": xp_earned,
         "final_yard_line": game.yards,
-        "frames": all_frames,
-        "logs": game.game_log
-    }
-    
-    return result
+        "plays": plays,
+        "logs": game.game_log,
+        "seed": seed,
+        "decisions": recorded,
+        "engine": engine,
+        "engine_version": ENGINE_VERSION,
+        # This worker's LLM breaker state, for the API's /health/llm
+        "llm_health": {"pid": os.getpid(), "at": time.time(), "backends": breaker_snapshot()}
+    }}
+
+
+def regenerate_drive(seed, decisions, engine, engine_version=ENGINE_VERSION):
+    """Rebuild a drive's frames from its seed and recorded coach decisions"""
+    if engine_version != ENGINE_VERSION:
+        raise ValueError(f"Drive was simulated by engine v{engine_version}, this is v{ENGINE_VERSION}")
+    return run_drive(seed=seed, decisions=decisions, engine=engine)
+
+
+def regenerate_replay(seed, decisions, engine, engine_version=ENGINE_VERSION):
+    """regenerate_drive, returned in the compact replay format (cheap to ship from a worker)"""
+    result = regenerate_drive(seed, decisions, engine, engine_version)
+    return encode_replay(result["frames"], [play["frame_count"] for play in result["plays"]])
 
 
 def get_simulation_result(num_plays=10):
@@ -0,0 +1,79 @@
+"""
+Team Cache
+Read-through cache of team documents for the checks most endpoints start
+with (does the team exist, who owns it, what level is it), so a hot team
+doesn't cost a Mongo round trip per request.
+
+- bounded LRU (TEAM_CACHE_SIZE) with a short TTL (TEAM_CACHE_TTL)
+- every write path in the API refreshes (store) or drops (invalidate) the
+  entry; the TTL bounds how stale a write made by another worker can look
+- callers get their own copy, so mutating a team (e.g. str(_id)) is safe
+- hit/miss/expired/eviction/invalidation counters (stats())
+"""
+import copy
+import os
+import time
+from collections import OrderedDict
+
+from bson import ObjectId
+
+TEAM_CACHE_SIZE = int(os.getenv("TEAM_CACHE_SIZE", "5000"))
+TEAM_CACHE_TTL = float(os.getenv("TEAM_CACHE_TTL", "10"))  # Seconds a cached team is trusted
+
+
+class TeamCache:
+    """LRU+TTL cache in front of the `teams` collection"""
+
+    def __init__(self, collection, max_size=TEAM_CACHE_SIZE, ttl=TEAM_CACHE_TTL):
+        self.collection = collection
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # team id -> (expires_at, team doc)
+        self.generation = 0  # Bumped by every write, so a read that raced one isn't cached
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    async def get(self, team_id: str):
+        """The team document (a private copy), or None if there's no such team"""
+        team_id = str(team_id)
+        entry = self.entries.get(team_id)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(team_id)
+                self.counters["hits"] += 1
+                return copy.deepcopy(entry[1])
+            del self.entries[team_id]
+            self.counters["expired"] += 1
+
+        self.counters["misses"] += 1
+        generation = self.generation
+        team = await self.collection.find_one({"_id": ObjectId(team_id)})
+        if team is not None and generation == self.generation:
+            self._put(team_id, team)
+        return team
+
+    def _put(self, team_id: str, team: dict):
+        self.entries[team_id] = (time.monotonic() + self.ttl, copy.deepcopy(team))
+        self.entries.move_to_end(team_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def store(self, team: dict):
+        """Cache a team just written (e.g. find_one_and_update's AFTER document)"""
+        self.generation += 1
+        self._put(str(team["_id"]), team)
+
+    def invalidate(self, team_id: str):
+        self.generation += 1
+        self.counters["invalidations"] += 1
+        self.entries.pop(str(team_id), None)
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "size": len(self.entries),
+            "ttl_s": self.ttl,
+            "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
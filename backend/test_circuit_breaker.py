@@ -0,0 +1,64 @@
+"""
+Circuit breaker: probe slots survive cancelled calls.
+
+    python test_circuit_breaker.py   (or: pytest test_circuit_breaker.py)
+"""
+import asyncio
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def half_open_breaker(probes=2):
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=0, half_open_probes=probes)
+    breaker.allow()
+    breaker.record_failure(RuntimeError("down"))
+    assert breaker.state == OPEN
+    return breaker
+
+
+async def probe(breaker, started):
+    assert breaker.allow()
+    with breaker.call():
+        started.set()
+        await asyncio.sleep(10)
+
+
+def test_cancelled_probe_releases_its_slot():
+    async def run():
+        breaker = half_open_breaker()
+        started = [asyncio.Event(), asyncio.Event()]
+        tasks = [asyncio.ensure_future(probe(breaker, event)) for event in started]
+        for event in started:
+            await event.wait()
+        assert breaker.state == HALF_OPEN and breaker.probes_in_flight == 2
+        assert not breaker.allow()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert breaker.probes_in_flight == 0 and breaker.counters["cancelled"] == 2
+        assert breaker.state == HALF_OPEN  # Cancellation is no verdict either way
+
+        for _ in range(2):
+            assert breaker.allow()
+            with breaker.call():
+                pass
+        assert breaker.state == CLOSED
+    asyncio.run(run())
+
+
+def test_call_records_failures():
+    breaker = half_open_breaker(probes=1)
+    assert breaker.allow()
+    try:
+        with breaker.call():
+            raise ConnectionError("still down")
+    except ConnectionError:
+        pass
+    assert breaker.state == OPEN and breaker.probes_in_flight == 0
+
+
+if __name__ == "__main__":
+    test_cancelled_probe_releases_its_slot()
+    test_call_records_failures()
+    print("✅ Cancelled calls give their half-open probe slot back")
@@ -0,0 +1,29 @@
+"""
+Coach decision cache: per-drive counters and the async path.
+
+    python test_coach_cache.py   (or: pytest test_coach_cache.py)
+"""
+import asyncio
+import random
+
+from coach_cache import CoachDecisionCache
+
+STATE = {"down": 1, "to_go": 10, "yards": 25, "score": "0-0"}
+
+
+def test_counters_are_per_caller():
+    async def run():
+        cache = CoachDecisionCache(explore=0.0)
+        mine, theirs = {}, {}
+        assert await cache.get_async("Win", STATE, rng=random.Random(1), counters=mine) is None
+        await cache.put_async("Win", STATE, "RUN", "Pound it")
+        assert await cache.get_async("Win", STATE, rng=random.Random(1), counters=mine) == ("RUN", "Pound it")
+        assert cache.get("Win", STATE, counters=theirs) == ("RUN", "Pound it")
+        assert mine == {"misses": 1, "hits": 1} and theirs == {"hits": 1}
+        assert cache.stats()["hits"] == 2
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_counters_are_per_caller()
+    print("✅ Coach cache counts each drive on its own")
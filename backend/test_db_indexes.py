@@ -0,0 +1,96 @@
+"""
+Declared Mongo indexes cover the app's queries; the query profiler times
+commands per collection/operation and flags slow ones.
+With MONGO_URI set, the query shapes also run through explain() on a
+scratch database.
+
+    python test_db_indexes.py   (or: pytest test_db_indexes.py)
+"""
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from pymongo import DESCENDING, MongoClient
+
+from db_indexes import INDEXES, QUERIES, covering_index, index_fields, index_name
+from query_profiler import QueryProfiler
+
+MONGO_URI = os.getenv("MONGO_URI")
+
+
+def test_every_query_has_an_index():
+    for collection, filter_fields, sort, used_by in QUERIES:
+        assert covering_index(collection, filter_fields, sort), f"No index for {used_by} on {collection}"
+    assert covering_index("teams", ["coach_level"]) is None
+    # Sorting on a field the index doesn't continue with means an in-memory sort
+    assert covering_index("drive_summaries", ["team_id"], [("xp_earned", DESCENDING)]) is None
+
+
+def plan_stages(plan) -> list:
+    """Every stage name in an explain() plan (classic and slot-based layouts)"""
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in plan_stages(item)]
+    if not isinstance(plan, dict):
+        return []
+    stages = [plan["stage"]] if isinstance(plan.get("stage"), str) else []
+    return stages + [stage for key, value in plan.items() if key != "stage" for stage in plan_stages(value)]
+
+
+@pytest.mark.skipif(not MONGO_URI, reason="MONGO_URI not set")
+def test_queries_use_indexes_on_the_server():
+    client = MongoClient(MONGO_URI)
+    database = client[f"supersim_index_test_{uuid.uuid4().hex[:8]}"]
+    try:
+        for collection, models in INDEXES.items():
+            database[collection].create_indexes(models)
+        for collection, filter_fields, sort, used_by in QUERIES:
+            cursor = database[collection].find({field: None for field in filter_fields})
+            if sort:
+                cursor = cursor.sort(sort)
+            stages = plan_stages(cursor.explain()["queryPlanner"]["winningPlan"])
+            assert "COLLSCAN" not in stages, f"{used_by}: {stages}"
+            assert "SORT" not in stages, f"{used_by} sorts in memory: {stages}"
+    finally:
+        client.drop_database(database.name)
+        client.close()
+
+
+def test_indexes_are_not_redundant():
+    for collection, models in INDEXES.items():
+        names = [index_name(m) for m in models]
+        assert len(names) == len(set(names)), collection
+        keys = [index_fields(m) for m in models]
+        for i, a in enumerate(keys):
+            # An index that is a prefix of another one is dead weight
+            assert not any(j != i and b[:len(a)] == a for j, b in enumerate(keys)), f"{collection}: {a}"
+
+
+def command(profiler, request_id, name, target, ms, **fields):
+    body = {name: target, **fields}
+    profiler.started(SimpleNamespace(command_name=name, command=body, connection_id=("db", 27017), request_id=request_id))
+    profiler.succeeded(SimpleNamespace(connection_id=("db", 27017), request_id=request_id, duration_micros=int(ms * 1000)))
+
+
+def test_profiler_counts_slow_queries():
+    profiler = QueryProfiler(slow_ms=50)
+    command(profiler, 1, "find", "teams", 2, filter={"owner_wallet": "w1"})
+    command(profiler, 2, "find", "teams", 80, filter={"owner_wallet": "w2"})
+    command(profiler, 3, "aggregate", "teams", 120, pipeline=[{"$project": {"name": 1}}])
+    profiler.started(SimpleNamespace(command_name="ping", command={"ping": 1}, connection_id=None, request_id=4))
+    profiler.succeeded(SimpleNamespace(connection_id=None, request_id=4, duration_micros=999000))
+
+    ops = profiler.stats()["operations"]
+    assert set(ops) == {"teams.find", "teams.aggregate"}
+    assert ops["teams.find"]["count"] == 2 and ops["teams.find"]["slow"] == 1
+    assert ops["teams.find"]["max_ms"] == 80 and ops["teams.find"]["avg_ms"] == 41
+    assert ops["teams.aggregate"]["slow"] == 1
+
+
+if __name__ == "__main__":
+    test_every_query_has_an_index()
+    test_indexes_are_not_redundant()
+    test_profiler_counts_slow_queries()
+    if MONGO_URI:
+        test_queries_use_indexes_on_the_server()
+    print("✅ Indexes cover every query and the profiler flags slow ones")
@@ -0,0 +1,75 @@
+"""
+Defense speculation against the stand-in gateway: discarded calls must not
+wedge the OpenClaw circuit breaker.
+
+    python test_defense_speculation.py   (or: pytest test_defense_speculation.py)
+"""
+import asyncio
+
+import openclaw_client
+from circuit_breaker import CLOSED, HALF_OPEN, get_breaker
+from defense_speculation import DefenseSpeculator
+from openclaw_stub_gateway import start_stub_gateway
+
+STATE = {"down": 2, "yards_to_go": 6, "field_position": 40, "score_user": 0, "score_ai": 0}
+
+
+def with_gateway(test, **stub):
+    server, url = start_stub_gateway(**stub)
+    gateway = openclaw_client.OPENCLAW_GATEWAY
+    openclaw_client.OPENCLAW_GATEWAY = url
+    try:
+        return test()
+    finally:
+        openclaw_client.OPENCLAW_GATEWAY = gateway
+        server.shutdown()
+
+
+def test_discarded_speculation_frees_half_open_probes():
+    async def run():
+        breaker = get_breaker("openclaw")
+        breaker.__init__("openclaw", min_calls=1, open_seconds=0, half_open_probes=2)
+        breaker.allow()
+        breaker.record_failure(RuntimeError("gateway down"))
+
+        speculator = DefenseSpeculator()
+        speculator.speculate(STATE)
+        await asyncio.sleep(0.1)  # Two probes in flight, the other two fell back
+        assert breaker.state == HALF_OPEN and breaker.probes_in_flight == 2
+        speculator.discard()
+        await asyncio.sleep(0.05)
+        assert breaker.probes_in_flight == 0
+
+        # The breaker still recovers: two good probes close it
+        for play in ("RUN", "PASS"):
+            decision, hit = await speculator.resolve(STATE, play)
+            assert decision["trash_talk"] == "Stub says hi 🦞" and not hit
+        assert breaker.state == CLOSED
+        breaker.__init__("openclaw")
+    with_gateway(lambda: asyncio.run(run()), delay=0.5)
+
+
+def test_no_speculation_for_cli_transport():
+    async def run():
+        calls = []
+
+        async def decide(state, role):
+            calls.append(state["user_play"])
+            return {"play": "ZONE", "trash_talk": "cli"}
+
+        transport = openclaw_client.OPENCLAW_TRANSPORT
+        openclaw_client.OPENCLAW_TRANSPORT = "cli"
+        try:
+            speculator = DefenseSpeculator(decide)
+        finally:
+            openclaw_client.OPENCLAW_TRANSPORT = transport
+        speculator.speculate(STATE)
+        decision, hit = await speculator.resolve(STATE, "RUN")
+        assert calls == ["RUN"] and not hit and speculator.stats()["wasted"] == 0
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_discarded_speculation_frees_half_open_probes()
+    test_no_speculation_for_cli_transport()
+    print("✅ Discarded speculation leaves the breaker usable")
@@ -0,0 +1,44 @@
+"""
+Drive job queue: streaming workers send their events back and stop on cancel.
+
+    python test_drive_jobs.py   (or: pytest test_drive_jobs.py)
+"""
+import asyncio
+import time
+
+from drive_jobs import DriveJobQueue
+
+
+def counting_drive(events, stop, plays):
+    """Stand-in streaming worker: one event per play, stops early when asked"""
+    for play in range(1, plays + 1):
+        events.put({"play": play})
+        if stop.is_set():
+            return None
+        time.sleep(0.05)
+    return {"plays": plays}
+
+
+def test_streaming_job_events_and_cancel():
+    async def run():
+        queue = DriveJobQueue(max_workers=1)
+        try:
+            job = queue.submit(counting_drive, 3, stream=True)
+            await job.done.wait()
+            assert job.status == "done" and job.result == {"plays": 3}
+            assert [event["play"] for event in job.events] == [1, 2, 3]
+
+            job = queue.submit(counting_drive, 1000, stream=True)
+            while not job.events:
+                await asyncio.sleep(0.05)
+            assert queue.cancel(job.id)
+            await asyncio.wait_for(job.done.wait(), timeout=10)  # Not after 1000 plays
+            assert job.status == "cancelled" and len(job.events) < 1000
+        finally:
+            queue.shutdown()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_streaming_job_events_and_cancel()
+    print("✅ Streaming drive jobs relay their plays and stop when cancelled")
@@ -0,0 +1,58 @@
+"""
+GET /drives/{id} revalidation against a real server: a replay streamed because
+it is too big for the cache still answers If-None-Match with 304, and a
+deleted drive 404s instead.
+
+    MONGO_URI=mongodb://localhost:27017 python test_drive_replay_api.py   (or: pytest test_drive_replay_api.py)
+"""
+import os
+
+import pytest
+from bson import ObjectId
+
+# Keep the coach offline so drives use the seeded fallback logic
+os.environ.setdefault("OLLAMA_URL", "http://127.0.0.1:9/api/generate")
+
+from replay_codec import encode_replay
+from run_nfl_sim import run_drive
+
+MONGO_URI = os.getenv("MONGO_URI")
+
+
+@pytest.mark.skipif(not MONGO_URI, reason="MONGO_URI not set")
+def test_streamed_replay_revalidates():
+    from fastapi.testclient import TestClient
+    import main
+
+    result = run_drive("Test Team", engine="numpy", seed=0)
+    replay = encode_replay(result["frames"], [play["frame_count"] for play in result["plays"]])
+    drive_id = ObjectId()
+    url = f"/drives/{drive_id}?format=compact"
+    max_bytes = main.replay_cache.max_bytes
+    with TestClient(main.app) as client:
+        manifest = client.portal.call(main.replay_store.put_replay, drive_id, replay)
+        client.portal.call(main.drives.insert_one, {"_id": drive_id, "team_id": ObjectId(), "replay": manifest})
+        try:
+            main.replay_cache.max_bytes = 1  # Nothing fits: the replay is streamed
+            first = client.get(url, headers={"accept-encoding": "gzip"})
+            assert first.status_code == 200 and first.headers["etag"].endswith('-identity"')
+            assert "content-encoding" not in first.headers
+
+            again = client.get(url, headers={"accept-encoding": "gzip", "if-none-match": first.headers["etag"]})
+            assert again.status_code == 304 and again.headers["etag"] == first.headers["etag"]
+
+            client.portal.call(main.drives.delete_one, {"_id": drive_id})
+            gone = client.get(url, headers={"accept-encoding": "gzip", "if-none-match": first.headers["etag"]})
+            assert gone.status_code == 404
+        finally:
+            main.replay_cache.max_bytes = max_bytes
+            client.portal.call(main.drives.delete_one, {"_id": drive_id})
+            client.portal.call(main.replay_store.delete, drive_id)
+
+
+if __name__ == "__main__":
+    if MONGO_URI:
+        test_streamed_replay_revalidates()
+        print("✅ Streamed replays revalidate, deleted drives 404")
+    else:
+        print("⏭️  MONGO_URI not set, nothing to check")
@@ -0,0 +1,102 @@
+"""
+In-memory play session store: packing, LRU eviction and idle expiry.
+
+    python test_game_sessions.py   (or: pytest test_game_sessions.py)
+"""
+import asyncio
+import time
+
+from game_sessions import SESSION_RECENT_PLAYS, MemorySessionStore, SessionConflict, new_session, pack, unpack
+
+
+def played_session(plays: int) -> dict:
+    session = new_session()
+    session.update({"down": 3, "yards_to_go": 4, "field_position": 62, "score_user": 7, "play_count": plays})
+    session["plays"] = [{"user": "RUN", "ai": "BLITZ", "yards": i, "event": "TACKLE"} for i in range(plays)]
+    return session
+
+
+def test_pack_keeps_recent_plays():
+    session = played_session(SESSION_RECENT_PLAYS + 5)
+    restored = unpack(pack(session))
+    assert restored["play_count"] == SESSION_RECENT_PLAYS + 5
+    assert restored["plays"] == session["plays"][-SESSION_RECENT_PLAYS:]
+    assert {k: v for k, v in restored.items() if k != "plays"} == {k: v for k, v in session.items() if k != "plays"}
+
+
+def test_lru_eviction():
+    async def run():
+        store = MemorySessionStore(ttl=60, max_size=2)
+        await store.save("a", played_session(1))
+        await store.save("b", played_session(2))
+        session = await store.get_or_create("a")
+        session["play_count"] = 3
+        await store.save("a", session)  # a is now the most recent
+        await store.save("c", played_session(1))
+        assert (await store.get_or_create("b"))["play_count"] == 0  # evicted
+        assert (await store.get_or_create("a"))["play_count"] == 3
+        stats = await store.stats()
+        assert stats["live"] == 2 and stats["evictions"] == 1 and stats["created"] == 3
+    asyncio.run(run())
+
+
+def test_idle_sessions_expire():
+    async def run():
+        store = MemorySessionStore(ttl=0.05)
+        await store.save("a", played_session(1))
+        await store.save("b", played_session(1))
+        time.sleep(0.1)
+        await store.save("b", played_session(2))  # b played again, a went idle
+        stats = await store.stats()
+        assert stats["live"] == 1 and stats["expired"] == 1
+        assert (await store.get_or_create("a"))["play_count"] == 0
+        await store.reset("b")
+        assert (await store.stats())["live"] == 0
+    asyncio.run(run())
+
+
+def test_reads_keep_a_session_live():
+    async def run():
+        store = MemorySessionStore(ttl=0.15, max_size=2)
+        await store.save("a", played_session(1))
+        await store.save("b", played_session(1))
+        time.sleep(0.1)
+        await store.get_or_create("a")  # Looked at: fresh TTL, most recently used
+        await store.save("c", played_session(1))
+        time.sleep(0.1)
+        assert (await store.get_or_create("a"))["play_count"] == 1
+        assert store.counters["evictions"] == 1 and "b" not in store.entries
+    asyncio.run(run())
+
+
+def test_plays_for_a_team_are_serialized():
+    async def run():
+        store = MemorySessionStore()
+
+        async def play():
+            async with store.playing("a") as session:
+                await asyncio.sleep(0.01)  # The coach thinking
+                session["play_count"] += 1
+                await store.save("a", session)
+
+        await asyncio.gather(*[play() for _ in range(5)])
+        assert (await store.get_or_create("a"))["play_count"] == 5 and not store.locks
+
+        # Without playing(), the later save of a stale copy is refused
+        first, second = await store.get_or_create("a"), await store.get_or_create("a")
+        await store.save("a", first)
+        try:
+            await store.save("a", second)
+            assert False
+        except SessionConflict:
+            assert store.counters["conflicts"] == 1
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_pack_keeps_recent_plays()
+    test_lru_eviction()
+    test_idle_sessions_expire()
+    test_reads_keep_a_session_live()
+    test_plays_for_a_team_are_serialized()
+    print("✅ Play session store packs, evicts and expires sessions")
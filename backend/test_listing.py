@@ -0,0 +1,52 @@
+"""
+Listing helpers: cursors, field selection and weak ETags.
+
+    python test_listing.py   (or: pytest test_listing.py)
+"""
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from listing import after_time_cursor, etag_matches, parse_fields, time_cursor, weak_etag
+
+
+def test_time_cursor_round_trip():
+    created_at, _id = datetime(2026, 3, 1, 12, 30, 5, 123000), ObjectId()
+    query = after_time_cursor(time_cursor(created_at, _id))
+    assert query["$or"][0]["created_at"]["$lt"] == created_at
+    assert query["$or"][1] == {"created_at": created_at, "_id": {"$lt": _id}}
+    for bad in ("nope", "12_xyz", "_"):
+        try:
+            after_time_cursor(bad)
+            assert False, bad
+        except HTTPException as e:
+            assert e.status_code == 400
+
+
+def test_parse_fields():
+    assert parse_fields(None, {"a", "b", "c"}, ["a"]) == {"a": 1}
+    assert parse_fields("b, c", {"a", "b", "c"}, ["a"]) == {"b": 1, "c": 1}
+    try:
+        parse_fields("a,owner_secret", {"a"}, ["a"])
+        assert False
+    except HTTPException as e:
+        assert e.status_code == 400 and "owner_secret" in e.detail
+
+
+def test_weak_etags():
+    page = [{"_id": ObjectId(), "name": "A", "wins": 3}]
+    etag = weak_etag(page)
+    assert etag.startswith('W/"') and etag == weak_etag([dict(page[0])])
+    assert weak_etag([{**page[0], "wins": 4}]) != etag
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('W/"other"', etag)
+
+
+if __name__ == "__main__":
+    test_time_cursor_round_trip()
+    test_parse_fields()
+    test_weak_etags()
+    print("✅ Cursors, field selection and ETags behave")
@@ -0,0 +1,31 @@
+"""
+Pooled LLM clients: one per backend + options, reused across blocking drives.
+
+    python test_llm_client.py   (or: pytest test_llm_client.py)
+"""
+from llm_client import get_llm_client
+from run_nfl_sim import drive_loop
+
+
+def test_clients_keyed_on_headers_and_options():
+    a = get_llm_client("http://llm.test:1/api/generate", headers={"Authorization": "Bearer a"})
+    assert get_llm_client("http://llm.test:1/other", headers={"Authorization": "Bearer a"}) is a
+    assert get_llm_client("http://llm.test:1/api/generate", headers={"Authorization": "Bearer b"}) is not a
+    assert get_llm_client("http://llm.test:1/api/generate", headers={"Authorization": "Bearer a"}, timeout=1.0) is not a
+
+
+def test_blocking_drives_share_one_http_client():
+    client = get_llm_client("http://llm.test:2")
+
+    async def bind():
+        return client._bind()
+
+    bound = [drive_loop().run_until_complete(bind()) for _ in range(3)]
+    assert bound[0] is bound[1] is bound[2] and not bound[0].is_closed
+    drive_loop().run_until_complete(client.aclose())
+
+
+if __name__ == "__main__":
+    test_clients_keyed_on_headers_and_options()
+    test_blocking_drives_share_one_http_client()
+    print("✅ LLM clients are shared per backend and outlive a drive")
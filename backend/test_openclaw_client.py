@@ -0,0 +1,61 @@
+"""
+OpenClaw client against the stand-in gateway (no real gateway needed).
+
+    python test_openclaw_client.py   (or: pytest test_openclaw_client.py)
+"""
+import asyncio
+
+import openclaw_client
+from circuit_breaker import get_breaker
+from openclaw_stub_gateway import start_stub_gateway
+
+STATE = {"down": 3, "yards_to_go": 7, "field_position": 45, "user_play": "PASS"}
+
+
+def with_gateway(test, **stub):
+    server, url = start_stub_gateway(**stub)
+    gateway = openclaw_client.OPENCLAW_GATEWAY
+    openclaw_client.OPENCLAW_GATEWAY = url
+    get_breaker("openclaw").__init__("openclaw")  # Fresh breaker per test
+    try:
+        return test(server)
+    finally:
+        openclaw_client.OPENCLAW_GATEWAY = gateway
+        server.shutdown()
+
+
+def test_decisions_share_one_connection():
+    def run(server):
+        async def decide():
+            return [await openclaw_client.get_ai_decision_async(STATE, role) for role in ("defense", "offense") * 5]
+        decisions = asyncio.run(decide())
+        assert all(d["trash_talk"] == "Stub says hi 🦞" for d in decisions)
+        assert all(d["play"] in openclaw_client.DEFENSE_PLAYS for d in decisions[::2])
+        assert all(d["play"] in openclaw_client.OFFENSE_PLAYS for d in decisions[1::2])
+        assert server.RequestHandlerClass.requests_served == 10
+        assert len(server.RequestHandlerClass.connections) == 1
+
+        assert openclaw_client.get_ai_decision(STATE)["trash_talk"] == "Stub says hi 🦞"
+    with_gateway(run)
+
+
+def test_bad_token_falls_back():
+    def run(server):
+        decision = openclaw_client.get_ai_decision(STATE, "defense")
+        assert decision == openclaw_client._fallback_decision(STATE, "defense")
+        assert get_breaker("openclaw").counters["fallbacks"] == 1
+    with_gateway(run, token="someone-else")
+
+
+def test_deadline_falls_back():
+    def run(server):
+        decision = asyncio.run(openclaw_client.get_ai_decision_async(STATE, "offense", deadline=0.05))
+        assert decision == openclaw_client._fallback_decision(STATE, "offense")
+    with_gateway(run, delay=0.5)
+
+
+if __name__ == "__main__":
+    test_decisions_share_one_connection()
+    test_bad_token_falls_back()
+    test_deadline_falls_back()
+    print("✅ OpenClaw client works against the stub gateway")
@@ -0,0 +1,93 @@
+"""
+Replay response cache: coalesced loads, byte-bounded LRU and encodings.
+
+    python test_replay_cache.py   (or: pytest test_replay_cache.py)
+"""
+import asyncio
+import gzip
+
+from replay_cache import ReplayResponseCache, negotiate_encoding, replay_etag, held_etag
+
+
+def test_concurrent_misses_load_once():
+    async def run():
+        cache = ReplayResponseCache()
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.02)
+            return b'{"frames": []}'
+
+        bodies = await asyncio.gather(*[cache.body(("d1", "frames"), load) for _ in range(10)])
+        assert bodies == [b'{"frames": []}'] * 10 and len(loads) == 1
+        await cache.body(("d1", "frames"), load)
+        stats = cache.stats()
+        assert stats["misses"] == 1 and stats["coalesced"] == 9 and stats["hits"] == 1
+    asyncio.run(run())
+
+
+def test_failed_load_is_not_cached():
+    async def run():
+        cache = ReplayResponseCache()
+
+        async def missing():
+            raise LookupError("Drive not found")
+
+        for _ in range(2):
+            try:
+                await cache.body(("d404", "frames"), missing)
+                assert False
+            except LookupError:
+                pass
+        assert cache.stats()["misses"] == 2 and cache.stats()["entries"] == 0
+    asyncio.run(run())
+
+
+def test_bytes_bound_and_compressed_variants():
+    async def run():
+        cache = ReplayResponseCache(max_bytes=4000)
+        body = b'{"frames": [' + b"[1, 2, 3]," * 90 + b"0]}"  # ~900 bytes
+        for i in range(5):
+            await cache.body(i, lambda: asyncio.sleep(0, body))
+        assert cache.stats()["evictions"] == 1 and cache.size <= 4000
+        gzipped = await cache.encoded(4, body, "gzip")
+        assert gzip.decompress(gzipped) == body and cache.entries[4]["gzip"] is gzipped
+        assert await cache.encoded(4, body, "identity") is body
+        assert await cache.body("huge", lambda: asyncio.sleep(0, b"x" * 2000)) and "huge" not in cache.entries
+        assert not cache.admits(2000) and cache.admits(900)
+
+        # Serving a cached variant counts as a use: 1 (oldest again) survives the next eviction
+        gzipped = await cache.encoded(1, body, "gzip")
+        for key in (2, 3, 4):
+            await cache.body(key, lambda: asyncio.sleep(0, body))
+        assert list(cache.entries)[0] == 1 and await cache.encoded(1, body, "gzip") is gzipped
+        await cache.body(5, lambda: asyncio.sleep(0, body))
+        assert 1 in cache.entries and 2 not in cache.entries
+    asyncio.run(run())
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") == "identity"
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding(None) == "identity"
+
+
+def test_held_etag_matches_any_served_variant():
+    gzip_tag, streamed_tag = replay_etag("d1", "frames", "gzip"), replay_etag("d1", "frames", "identity")
+    assert held_etag(gzip_tag, "d1", "frames", "gzip") == gzip_tag
+    # Streamed last time (too big for the cache): still the same replay
+    assert held_etag(f'"other", {streamed_tag}', "d1", "frames", "gzip") == streamed_tag
+    assert held_etag(gzip_tag, "d1", "compact", "gzip") is None
+    assert held_etag(replay_etag("d1", "frames", "br"), "d1", "frames", "gzip") is None
+    assert held_etag(None, "d1", "frames", "gzip") is None
+
+
+if __name__ == "__main__":
+    test_concurrent_misses_load_once()
+    test_failed_load_is_not_cached()
+    test_bytes_bound_and_compressed_variants()
+    test_negotiate_encoding()
+    test_held_etag_matches_any_served_variant()
+    print("✅ Replay cache coalesces loads and stays within its byte budget")
@@ -0,0 +1,101 @@
+"""
+Replay regeneration must be bit-for-bit: a drive re-simulated from its
+seed + recorded coach decisions has to reproduce the archived replay.
+
+test_replay_determinism.json archives one drive per engine (seed, decisions,
+play results and a hash of the compact replay), so a change that simulates
+differently without bumping ENGINE_VERSION fails here. After a deliberate
+bump, re-record it:
+
+    python test_replay_determinism.py   (or: pytest test_replay_determinism.py)
+    python test_replay_determinism.py --update-fixture
+"""
+import hashlib
+import json
+import os
+import sys
+
+# Keep the coach offline so drives use the seeded fallback logic
+os.environ.setdefault("OLLAMA_URL", "http://127.0.0.1:9/api/generate")
+
+from replay_codec import encode_replay
+from run_nfl_sim import run_drive, regenerate_drive, regenerate_replay, PHYSICS_ENGINES, ENGINE_VERSION
+
+SEEDS = [0, 7, 12345, 2**52 + 1]
+FIXTURE = os.path.join(os.path.dirname(__file__), "test_replay_determinism.json")
+FIXTURE_SEED = 2025
+
+
+def archive(result):
+    """What commit_drive stores: the compact replay, via JSON"""
+    replay = encode_replay(result["frames"], [play["frame_count"] for play in result["plays"]])
+    return json.loads(json.dumps(replay))
+
+
+def replay_hash(replay):
+    return hashlib.sha256(json.dumps(replay, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def fixture_entry(result):
+    return {
+        "seed": result["seed"],
+        "decisions": result["decisions"],
+        "outcome": result["outcome"],
+        "plays": [[play["action"], play["event"], play["yards_gained"], play["physics"]["dead_ball"]] for play in result["plays"]],
+        "replay_sha256": replay_hash(archive(result))
+    }
+
+
+def record_fixture():
+    drives = {engine: fixture_entry(run_drive("Test Team", "Balanced attack", engine=engine, seed=FIXTURE_SEED))
+              for engine in PHYSICS_ENGINES}
+    with open(FIXTURE, "w") as f:
+        json.dump({"engine_version": ENGINE_VERSION, "drives": drives}, f, indent=1)
+        f.write("\n")
+
+
+def test_archived_drives_still_replay():
+    with open(FIXTURE) as f:
+        fixture = json.load(f)
+    assert fixture["engine_version"] == ENGINE_VERSION, \
+        "ENGINE_VERSION changed: re-record with python test_replay_determinism.py --update-fixture"
+    for engine, archived in fixture["drives"].items():
+        result = regenerate_drive(archived["seed"], archived["decisions"], engine)
+        entry = fixture_entry(result)
+        assert entry["plays"] == archived["plays"] and entry["outcome"] == archived["outcome"], \
+            f"{engine}: drive plays out differently, bump ENGINE_VERSION"
+        assert entry["replay_sha256"] == archived["replay_sha256"], f"{engine}: frames drifted, bump ENGINE_VERSION"
+
+
+def test_regeneration_is_identical():
+    for engine in PHYSICS_ENGINES:
+        for seed in SEEDS:
+            original = run_drive("Test Team", "Balanced attack", engine=engine, seed=seed)
+            decisions = json.loads(json.dumps(original["decisions"]))
+
+            again = regenerate_drive(seed, decisions, engine)
+            assert again["frames"] == original["frames"], f"{engine}/{seed}: frames differ"
+            assert again["logs"] == original["logs"], f"{engine}/{seed}: logs differ"
+            assert again["outcome"] == original["outcome"]
+
+            replay = json.loads(json.dumps(regenerate_replay(seed, decisions, engine)))
+            assert replay == archive(original), f"{engine}/{seed}: compact replay differs"
+
+
+def test_engine_version_mismatch_is_rejected():
+    try:
+        regenerate_drive(0, [], "pymunk", engine_version=-1)
+    except ValueError:
+        return
+    raise AssertionError("regenerate_drive accepted a stale engine_version")
+
+
+if __name__ == "__main__":
+    if "--update-fixture" in sys.argv:
+        record_fixture()
+        print(f"📼 Recorded {FIXTURE} (engine v{ENGINE_VERSION})")
+        raise SystemExit
+    test_archived_drives_still_replay()
+    test_regeneration_is_identical()
+    test_engine_version_mismatch_is_rejected()
+    print("✅ Replay regeneration is deterministic")
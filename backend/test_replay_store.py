@@ -0,0 +1,41 @@
+"""
+Replay store: a chunk missing from a stored replay is reported as such.
+
+    python test_replay_store.py   (or: pytest test_replay_store.py)
+"""
+import asyncio
+import os
+import tempfile
+
+from replay_store import FileReplayStore, ReplayChunkMissing, ReplayStore
+
+
+def test_missing_chunk_is_a_domain_error():
+    async def run():
+        with tempfile.TemporaryDirectory() as root:
+            store = FileReplayStore(root)
+            manifest = await store.put_replay("d1", {"v": 1, "scale": 10000, "plays": [{"n": 0}, {"n": 1}]})
+            assert manifest["play_count"] == 2 and manifest["bytes"] == len(b'{"n":0}') * 2
+            os.remove(store.path("d1", 1))
+            played = []
+            try:
+                async for raw in store.iter_play_json("d1", manifest["play_count"]):
+                    played.append(raw)
+                assert False
+            except ReplayChunkMissing as e:
+                assert played == [b'{"n":0}'] and e.index == 1
+    asyncio.run(run())
+
+
+def test_store_base_is_abstract():
+    try:
+        ReplayStore()
+        assert False
+    except TypeError:
+        pass
+
+
+if __name__ == "__main__":
+    test_missing_chunk_is_a_domain_error()
+    test_store_base_is_abstract()
+    print("✅ Replay store reports missing chunks")
@@ -0,0 +1,98 @@
+"""
+Team cache: read-through hits, write refresh/invalidation and races.
+
+    python test_team_cache.py   (or: pytest test_team_cache.py)
+"""
+import asyncio
+import time
+
+from bson import ObjectId
+
+from team_cache import TeamCache
+
+
+class Collection:
+    """Just enough of a motor collection: find_one by _id, counting reads"""
+
+    def __init__(self, *docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.reads = 0
+        self.before_read = None
+
+    async def find_one(self, query):
+        self.reads += 1
+        if self.before_read:
+            self.before_read()
+        await asyncio.sleep(0)
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+
+def team(level=1):
+    return {"_id": ObjectId(), "name": "Cache Kings", "owner_wallet": "w1", "coach_level": level}
+
+
+def test_hits_skip_mongo_and_return_copies():
+    async def run():
+        doc = team()
+        teams = Collection(doc)
+        cache = TeamCache(teams, ttl=60)
+        first = await cache.get(str(doc["_id"]))
+        first["_id"] = str(first["_id"])  # What the endpoints do before returning it
+        for _ in range(9):
+            assert (await cache.get(str(doc["_id"])))["_id"] == doc["_id"]
+        assert teams.reads == 1
+        assert await cache.get(str(ObjectId())) is None  # Unknown teams aren't cached
+        stats = cache.stats()
+        assert stats["hits"] == 9 and stats["misses"] == 2 and stats["hit_rate"] == 0.818
+    asyncio.run(run())
+
+
+def test_writes_refresh_and_invalidate():
+    async def run():
+        doc = team()
+        teams = Collection(doc)
+        cache = TeamCache(teams, ttl=60)
+        team_id = str(doc["_id"])
+        await cache.get(team_id)
+        cache.store({**doc, "coach_level": 5})  # e.g. after an XP update
+        assert (await cache.get(team_id))["coach_level"] == 5 and teams.reads == 1
+        del teams.docs[doc["_id"]]
+        cache.invalidate(team_id)  # DELETE
+        assert await cache.get(team_id) is None
+    asyncio.run(run())
+
+
+def test_ttl_and_lru():
+    async def run():
+        docs = [team() for _ in range(3)]
+        teams = Collection(*docs)
+        cache = TeamCache(teams, max_size=2, ttl=0.05)
+        for doc in docs:
+            await cache.get(str(doc["_id"]))
+        assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+        time.sleep(0.1)
+        await cache.get(str(docs[2]["_id"]))
+        assert cache.stats()["expired"] == 1 and teams.reads == 4
+    asyncio.run(run())
+
+
+def test_read_racing_a_write_is_not_cached():
+    async def run():
+        doc = team()
+        teams = Collection(doc)
+        cache = TeamCache(teams, ttl=60)
+        # The write lands while the (old) read is in flight
+        teams.before_read = lambda: cache.invalidate(str(doc["_id"]))
+        await cache.get(str(doc["_id"]))
+        teams.before_read = None
+        assert cache.stats()["size"] == 0
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_hits_skip_mongo_and_return_copies()
+    test_writes_refresh_and_invalidate()
+    test_ttl_and_lru()
+    test_read_racing_a_write_is_not_cached()
+    print("✅ Team cache serves hits and stays consistent with writes")
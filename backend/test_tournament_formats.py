@@ -0,0 +1,137 @@
+"""
+Tournament formats play out with random results (no AI, no database).
+
+    python test_tournament_formats.py   (or: pytest test_tournament_formats.py)
+"""
+import random
+
+from tournament_formats import build_format, bracket_order, check_format, resume_round
+
+TEAMS = [f"team{i}" for i in range(1, 23)]  # Best seed first
+
+
+def play_out(fmt, seed=7, first_distinct_round=1):
+    """Run every round with coin-flip results; returns (matches, rounds)"""
+    rng = random.Random(seed)
+    matches, rounds = [], 0
+    while True:
+        pairs = fmt.next_round(matches)
+        if not pairs:
+            return matches, rounds
+        rounds += 1
+        assert rounds <= 100, "format never finished"
+        teams_this_round = [t for pair in pairs for t in pair if t]
+        if rounds >= first_distinct_round:
+            assert len(teams_this_round) == len(set(teams_this_round)), "team scheduled twice in a round"
+        for team1, team2 in pairs:
+            if team2 is None:
+                matches.append({"team1": team1, "team2": None, "bye": True, "winner": team1,
+                                "team1_score": 0, "team2_score": 0, "round": rounds})
+                continue
+            score1, score2 = rng.choice([0, 7, 14]), rng.choice([0, 7, 14])
+            winner = team1 if score1 > score2 else (team2 if score2 > score1 else "TIE")
+            matches.append({"team1": team1, "team2": team2, "team1_score": score1, "team2_score": score2,
+                            "winner": winner, "round": rounds})
+
+
+def test_bracket_order():
+    assert bracket_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+
+
+def test_swiss_has_no_rematches():
+    fmt = build_format("swiss", TEAMS)
+    matches, rounds = play_out(fmt)
+    assert rounds == 5  # ceil(log2(22))
+    games = [frozenset((m["team1"], m["team2"])) for m in matches if not m.get("bye")]
+    assert len(games) == len(set(games))
+    assert fmt.winner(matches) == fmt.standings(matches)[0]["team"]
+
+
+def test_single_elimination():
+    fmt = build_format("single_elimination", TEAMS)
+    matches, rounds = play_out(fmt)
+    assert len(matches) == len(TEAMS) - 1
+    assert rounds == 5
+    first_round = {t for m in matches if m["round"] == 1 for t in (m["team1"], m["team2"])}
+    assert not first_round & set(TEAMS[:10])  # 32-slot bracket: the top 10 seeds get byes
+    assert fmt.winner(matches) in TEAMS
+
+
+def test_double_elimination():
+    fmt = build_format("double_elimination", TEAMS)
+    for seed in range(5):
+        matches, _ = play_out(fmt, seed)
+        champion = fmt.winner(matches)
+        assert champion is not None
+        assert fmt.losses(matches)[champion] <= 1
+        assert len(matches) in (2 * len(TEAMS) - 2, 2 * len(TEAMS) - 1)
+
+
+def test_group_stage():
+    fmt = build_format("groups", TEAMS, group_size=4, advance=2)
+    assert sorted(len(g) for g in fmt.groups) == [3, 3, 4, 4, 4, 4]
+    matches, _ = play_out(fmt, first_distinct_round=2)  # Group games are all round 1
+    assert len(matches) == fmt.estimated_matches()
+    assert fmt.winner(matches) in TEAMS
+
+
+def test_resume_half_played_round():
+    fmt = build_format("swiss", TEAMS)
+    matches, _ = play_out(fmt)
+    round_two = [m for m in matches if m["round"] == 2]
+    crashed = [m for m in matches if m["round"] < 2] + round_two[:4]
+    round_num, pairs = resume_round(fmt, crashed)
+    assert round_num == 2
+    assert {frozenset(p) for p in pairs} == {frozenset((m["team1"], m["team2"])) for m in round_two[4:]}
+
+
+def test_unknown_format():
+    try:
+        build_format("king_of_the_hill", TEAMS)
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def test_swiss_pairs_large_fields():
+    teams = [f"team{i}" for i in range(3000)]
+    fmt = build_format("swiss", teams, rounds=2)
+    first = fmt.next_round([])
+    matches = [{"team1": a, "team2": b, "team1_score": 7, "team2_score": 0, "winner": a, "round": 1} for a, b in first]
+    met = {frozenset(pair) for pair in first}
+    second = fmt.next_round(matches)
+    assert len(second) == 1500 and not met & {frozenset(pair) for pair in second}
+
+
+def test_swiss_pairing_backtracks():
+    fmt = build_format("swiss", ["a", "b", "c", "d"])
+    # a-b looks fine, but then c and d have met: the only way out is a-c, b-d
+    played = {"a": set(), "b": set(), "c": {"d"}, "d": {"c"}}
+    assert fmt.pair_without_rematches(["a", "b", "c", "d"], played) == [("a", "c"), ("b", "d")]
+    played = {"a": {"b", "c", "d"}, "b": {"a"}, "c": {"a"}, "d": {"a"}}
+    assert fmt.pair_without_rematches(["a", "b", "c", "d"], played) is None
+
+
+def test_check_format():
+    check_format("swiss", rounds=5)
+    check_format("groups", group_size=4, advance=2)
+    for name, options in (("king_of_the_hill", {}), ("swiss", {"round": 5}), ("groups", {"group_size": 1})):
+        try:
+            check_format(name, **options)
+        except ValueError:
+            continue
+        raise AssertionError(f"{name} {options} accepted")
+
+
+if __name__ == "__main__":
+    test_bracket_order()
+    test_swiss_has_no_rematches()
+    test_single_elimination()
+    test_double_elimination()
+    test_group_stage()
+    test_resume_half_played_round()
+    test_unknown_format()
+    test_swiss_pairs_large_fields()
+    test_swiss_pairing_backtracks()
+    test_check_format()
+    print("✅ Tournament formats schedule correctly")
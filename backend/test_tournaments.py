@@ -0,0 +1,49 @@
+"""
+Tournament runner: matches, lease and store writes stubbed out (no AI, no database).
+
+    python test_tournaments.py   (or: pytest test_tournaments.py)
+"""
+import asyncio
+import os
+
+# Motor connects lazily and every store write below is stubbed: no server needed
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+
+import tournaments
+from tournaments import LeaseLost, TournamentStore
+
+TEAMS = [f"team{i}" for i in range(1, 9)]
+
+
+def test_lease_lost_mid_round_cancels_the_round():
+    started, played, writes = [], [], []
+
+    async def play_match(team1_id, team2_id):
+        started.append(team1_id)
+        await asyncio.sleep(0.01 * len(started))
+        played.append((team1_id, team2_id))
+        return {"team1": team1_id, "team2": team2_id, "team1_score": 7, "team2_score": 0, "winner": team1_id, "plays": []}
+
+    async def update(tournament_id, fields=None, push_match=None):
+        if push_match is not None:
+            writes.append(push_match)
+            raise LeaseLost(tournament_id)  # Another worker took over before the first result landed
+
+    async def run():
+        tournament = {"id": "t1", "format": "round_robin", "participants": TEAMS, "seeds": TEAMS, "matches": []}
+        await tournaments.run_tournament(tournament, concurrency=8)
+        await asyncio.sleep(0.2)  # Long enough for every other match of the round to have finished
+
+    saved = tournaments.play_match, TournamentStore.update
+    tournaments.play_match, TournamentStore.update = play_match, update
+    try:
+        asyncio.run(run())
+    finally:
+        tournaments.play_match, TournamentStore.update = saved
+    assert len(started) > 1, "round had a single match"
+    assert len(played) == 1 and len(writes) == 1, f"siblings kept playing: {played}"
+
+
+if __name__ == "__main__":
+    test_lease_lost_mid_round_cancels_the_round()
+    print("✅ Losing the lease stops the whole round")
@@ -0,0 +1,325 @@
+"""
+Tournament Formats
+How a tournament pairs its teams, one round at a time.
+
+Every format works out the next round from the matches played so far
+(plus the seeding), so rounds are scheduled incrementally and the matches
+inside a round can all run in parallel. Byes come back as (team, None).
+
+    round_robin         every pair once (n²/2 matches, one round)
+    swiss               ~log2(n) rounds, score groups, no rematches
+    single_elimination  seeded bracket, n-1 matches
+    double_elimination  out after two losses, ~2n matches
+    groups              round-robin groups, top teams into a bracket
+"""
+import math
+
+FORMATS = {}
+
+
+def register_format(cls):
+    """Class decorator: make a format available by its `name`"""
+    FORMATS[cls.name] = cls
+    return cls
+
+
+def build_format(name: str, teams: list, **options):
+    """Format instance for `teams` (best seed first). ValueError on an unknown name or bad options."""
+    if name not in FORMATS:
+        raise ValueError(f"Unknown tournament format '{name}' (choose from {', '.join(FORMATS)})")
+    try:
+        return FORMATS[name](teams, **options)
+    except TypeError as e:
+        raise ValueError(f"Bad options for {name}: {e}")
+
+
+def check_format(name: str, **options):
+    """ValueError for an unknown format or bad options, before any team has joined"""
+    build_format(name, ["team1", "team2"], **options)
+
+
+def loser_of(match: dict, seed: dict):
+    """Loser of a played match; a tie goes against the lower seed"""
+    if match["winner"] == "TIE":
+        return max(match["team1"], match["team2"], key=lambda t: seed.get(t, len(seed)))
+    return match["team2"] if match["winner"] == match["team1"] else match["team1"]
+
+
+def resume_round(fmt, matches: list):
+    """
+    (round number, pairs still to play) for the next batch of matches.
+    Pairings depend only on earlier rounds, so a round that was cut short
+    (crash, restart) is rebuilt exactly and only its unplayed pairs return.
+    """
+    current = max((m["round"] for m in matches), default=0)
+    if current:
+        done = {frozenset((m["team1"], m["team2"])) for m in matches if m["round"] == current}
+        pending = [p for p in fmt.next_round([m for m in matches if m["round"] < current]) if frozenset(p) not in done]
+        if pending:
+            return current, pending
+    return current + 1, fmt.next_round(matches)
+
+
+def bracket_order(size: int) -> list:
+    """Seed numbers in bracket position order, e.g. 8 -> [1, 8, 4, 5, 2, 7, 3, 6]"""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [s for seed in order for s in (seed, total - seed)]
+    return order
+
+
+class TournamentFormat:
+    """Base format: seeding, standings and the round-by-round contract"""
+    name = None
+
+    def __init__(self, teams: list):
+        if len(teams) < 2:
+            raise ValueError("Need at least 2 participants")
+        self.teams = list(teams)
+        self.seed = {team: i for i, team in enumerate(self.teams)}
+
+    def next_round(self, matches: list) -> list:
+        """Pairs for the next round ([] when the tournament is over)"""
+        raise NotImplementedError
+
+    def winner(self, matches: list):
+        raise NotImplementedError
+
+    def estimated_matches(self) -> int:
+        raise NotImplementedError
+
+    def standings(self, matches: list) -> list:
+        """Teams by points (win 1, tie 0.5, bye 1), then seed"""
+        table = {team: {"team": team, "wins": 0, "losses": 0, "ties": 0, "points": 0.0, "scored": 0, "allowed": 0}
+                 for team in self.teams}
+        for match in matches:
+            team1, team2 = match["team1"], match["team2"]
+            if match.get("bye"):
+                table[team1]["wins"] += 1
+                table[team1]["points"] += 1
+                continue
+            for team, scored, allowed in ((team1, match["team1_score"], match["team2_score"]),
+                                          (team2, match["team2_score"], match["team1_score"])):
+                row = table[team]
+                row["scored"] += scored
+                row["allowed"] += allowed
+                if match["winner"] == "TIE":
+                    row["ties"] += 1
+                    row["points"] += 0.5
+                elif match["winner"] == team:
+                    row["wins"] += 1
+                    row["points"] += 1
+                else:
+                    row["losses"] += 1
+        return sorted(table.values(), key=lambda row: (-row["points"], self.seed[row["team"]]))
+
+
+@register_format
+class RoundRobin(TournamentFormat):
+    """Every pair plays once, all in a single round"""
+    name = "round_robin"
+
+    def next_round(self, matches):
+        if matches:
+            return []
+        return [(team1, team2) for i, team1 in enumerate(self.teams) for team2 in self.teams[i+1:]]
+
+    def winner(self, matches):
+        """Most match wins (None if every match tied)"""
+        win_counts = {}
+        for match in matches:
+            if match["winner"] != "TIE":
+                win_counts[match["winner"]] = win_counts.get(match["winner"], 0) + 1
+        return max(win_counts, key=win_counts.get) if win_counts else None
+
+    def estimated_matches(self):
+        return len(self.teams) * (len(self.teams) - 1) // 2
+
+
+@register_format
+class Swiss(TournamentFormat):
+    """Teams meet others on the same score; nobody plays the same opponent twice"""
+    name = "swiss"
+
+    def __init__(self, teams, rounds: int = None):
+        super().__init__(teams)
+        self.rounds = min(rounds or max(1, math.ceil(math.log2(len(self.teams)))), len(self.teams) - 1)
+
+    def next_round(self, matches):
+        if len({m["round"] for m in matches}) >= self.rounds:
+            return []
+
+        order = [row["team"] for row in self.standings(matches)]
+        played = {team: set() for team in self.teams}
+        had_bye = set()
+        for match in matches:
+            if match.get("bye"):
+                had_bye.add(match["team1"])
+            else:
+                played[match["team1"]].add(match["team2"])
+                played[match["team2"]].add(match["team1"])
+
+        pairs = []
+        if len(order) % 2:
+            # Lowest-ranked team that hasn't had a bye sits out
+            bye = next((t for t in reversed(order) if t not in had_bye), order[-1])
+            order.remove(bye)
+            pairs.append((bye, None))
+
+        paired = self.pair_without_rematches(order, played)
+        if paired is None:
+            paired = list(zip(order[::2], order[1::2]))  # Everyone has met: allow rematches
+        return paired + pairs
+
+    def pair_without_rematches(self, order, played):
+        """Top-down pairing, each team with the nearest fresh opponent (backtracks if stuck)"""
+        pairs = []
+        stack = [(list(order), 1)]  # (teams left to pair, next opponent to try for the first of them)
+        while stack:
+            rest, i = stack.pop()
+            if not rest:
+                return pairs
+            first = rest[0]
+            while i < len(rest) and rest[i] in played[first]:
+                i += 1
+            if i == len(rest):
+                if pairs:
+                    pairs.pop()  # Stuck: undo the pair above and try its next opponent
+                continue
+            stack.append((rest, i + 1))
+            pairs.append((first, rest[i]))
+            stack.append((rest[1:i] + rest[i + 1:], 1))
+        return None
+
+    def standings(self, matches):
+        """Points, then Buchholz (opponents' points), then seed"""
+        rows = super().standings(matches)
+        points = {row["team"]: row["points"] for row in rows}
+        for row in rows:
+            row["buchholz"] = 0.0
+        by_team = {row["team"]: row for row in rows}
+        for match in matches:
+            if not match.get("bye"):
+                by_team[match["team1"]]["buchholz"] += points[match["team2"]]
+                by_team[match["team2"]]["buchholz"] += points[match["team1"]]
+        return sorted(rows, key=lambda row: (-row["points"], -row["buchholz"], self.seed[row["team"]]))
+
+    def winner(self, matches):
+        return self.standings(matches)[0]["team"]
+
+    def estimated_matches(self):
+        return self.rounds * math.ceil(len(self.teams) / 2)
+
+
+@register_format
+class Elimination(TournamentFormat):
+    """Seeded bracket; a team is out after `max_losses` losses"""
+    name = "single_elimination"
+    max_losses = 1
+
+    def __init__(self, teams):
+        super().__init__(teams)
+        size = 1 << (len(self.teams) - 1).bit_length()
+        positions = [s for s in bracket_order(size) if s <= len(self.teams)]
+        self.position = {self.teams[s - 1]: i for i, s in enumerate(positions)}
+
+    def losses(self, matches):
+        losses = {team: 0 for team in self.teams}
+        for match in matches:
+            if not match.get("bye"):
+                losses[loser_of(match, self.seed)] += 1
+        return losses
+
+    def alive(self, matches):
+        losses = self.losses(matches)
+        return [team for team in self.teams if losses[team] < self.max_losses], losses
+
+    def pair_bracket(self, group):
+        """
+        Pair a group down to a power of two: the best seeds get byes, the
+        rest meet their bracket neighbours (1v8, 4v5, ... then 1v4, 2v3)
+        """
+        if len(group) < 2:
+            return []
+        power = 1 << (len(group).bit_length() - 1)
+        games = len(group) - power if len(group) != power else power // 2
+        byes = set(sorted(group, key=self.seed.get)[:len(group) - 2 * games])
+        playing = sorted((t for t in group if t not in byes), key=self.position.get)
+        return list(zip(playing[::2], playing[1::2]))
+
+    def next_round(self, matches):
+        alive, losses = self.alive(matches)
+        if len(alive) < 2:
+            return []
+        pairs = []
+        for count in range(self.max_losses):
+            pairs += self.pair_bracket([t for t in alive if losses[t] == count])
+        if not pairs:
+            # One team left per bracket: the final
+            pairs = self.pair_bracket(alive)
+        return pairs
+
+    def winner(self, matches):
+        alive, _ = self.alive(matches)
+        return alive[0] if len(alive) == 1 else None
+
+    def estimated_matches(self):
+        return self.max_losses * len(self.teams) - 1
+
+
+@register_format
+class DoubleElimination(Elimination):
+    """Winners and losers brackets; the final is replayed if the unbeaten team loses it"""
+    name = "double_elimination"
+    max_losses = 2
+
+
+@register_format
+class GroupStage(TournamentFormat):
+    """Snake-seeded round-robin groups; the top `advance` of each go into a single-elimination bracket"""
+    name = "groups"
+
+    def __init__(self, teams, group_size: int = 4, advance: int = 2):
+        super().__init__(teams)
+        if group_size < 2 or advance < 1:
+            raise ValueError("group_size must be >= 2 and advance >= 1")
+        count = math.ceil(len(self.teams) / group_size)
+        self.groups = [[] for _ in range(count)]
+        for i, team in enumerate(self.teams):
+            lap, slot = divmod(i, count)
+            self.groups[slot if lap % 2 == 0 else count - 1 - slot].append(team)
+        self.advance = advance
+
+    def group_matches(self, matches):
+        return [m for m in matches if m["round"] == 1]
+
+    def knockout(self, matches):
+        """Bracket of group qualifiers, seeded group winners first"""
+        ranked = []
+        for group in self.groups:
+            group_format = RoundRobin(group) if len(group) > 1 else None
+            members = set(group)
+            played = [m for m in self.group_matches(matches) if m["team1"] in members]
+            rows = group_format.standings(played) if group_format else [{"team": group[0], "points": 0, "scored": 0, "allowed": 0}]
+            rows.sort(key=lambda row: (-row["points"], row["allowed"] - row["scored"], self.seed[row["team"]]))
+            ranked.append([row["team"] for row in rows[:self.advance]])
+        qualifiers = [group[place] for place in range(self.advance) for group in ranked if place < len(group)]
+        return Elimination(qualifiers) if len(qualifiers) > 1 else None
+
+    def next_round(self, matches):
+        if not matches:
+            return [pair for group in self.groups if len(group) > 1 for pair in RoundRobin(group).next_round([])]
+        bracket = self.knockout(matches)
+        return bracket.next_round([m for m in matches if m["round"] > 1]) if bracket else []
+
+    def winner(self, matches):
+        bracket = self.knockout(matches)
+        if bracket is None:
+            return self.standings(matches)[0]["team"]
+        return bracket.winner([m for m in matches if m["round"] > 1])
+
+    def estimated_matches(self):
+        group_games = sum(len(g) * (len(g) - 1) // 2 for g in self.groups)
+        qualifiers = sum(min(len(g), self.advance) for g in self.groups)
+        return group_games + max(qualifiers - 1, 0)
@@ -0,0 +1,281 @@
+"""
+Tournaments
+Storage plus the background runner for AI vs AI tournament matches.
+
+Tournaments live in the `tournaments` collection: joins are atomic
+($addToSet) and every finished match is pushed to the document as it
+completes, so a crash loses at most the matches that were in flight.
+The tournament's format (tournament_formats) schedules one round at a
+time and the round's matches run several at once (TOURNAMENT_CONCURRENCY).
+
+A runner holds a lease on the tournament (runner id + heartbeat). If the
+process dies the lease goes stale after TOURNAMENT_LEASE seconds and any
+worker's resumer picks the tournament up again from its last finished match.
+"""
+import asyncio
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from database import tournaments as tournament_docs
+from openclaw_client import get_ai_decision_async
+from tournament_formats import FORMATS, build_format, check_format, resume_round
+
+TOURNAMENT_CONCURRENCY = int(os.getenv("TOURNAMENT_CONCURRENCY", "8"))  # Matches in flight per tournament
+TOURNAMENT_LEASE = float(os.getenv("TOURNAMENT_LEASE", "60"))  # Seconds without a heartbeat before another worker resumes
+PLAYS_PER_TEAM = 4
+RUNNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaseLost(Exception):
+    """Another worker has taken over this tournament"""
+
+
+class TournamentStore:
+    """Tournaments in MongoDB: one document each, matches appended as they finish"""
+    formats = FORMATS  # name -> format class (tournament_formats.register_format adds more)
+
+    @staticmethod
+    def public(doc):
+        """API view of a tournament document"""
+        if doc is None:
+            return None
+        doc = dict(doc)
+        doc["id"] = doc.pop("_id")
+        doc.pop("runner", None)
+        return doc
+
+    @classmethod
+    async def create(cls, name: str, creator_team_id: str, format: str = "round_robin", format_options: dict = None) -> dict:
+        check_format(format, **(format_options or {}))  # Bad options fail here, not when the tournament starts
+        tournament = {
+            "_id": f"tournament_{ObjectId()}",
+            "name": name,
+            "status": "open",  # open, in_progress, completed, failed
+            "format": format,
+            "format_options": format_options or {},
+            "participants": [creator_team_id],
+            "seeds": None,  # Participants best first, set on start
+            "matches": [],
+            "round": 0,
+            "standings": [],
+            "progress": None,
+            "winner": None,
+            "created_at": datetime.utcnow()
+        }
+        await tournament_docs.insert_one(tournament)
+        return cls.public(tournament)
+
+    @classmethod
+    async def get(cls, tournament_id: str) -> dict:
+        return cls.public(await tournament_docs.find_one({"_id": tournament_id}))
+
+    @classmethod
+    async def list_open(cls, limit: int = 100) -> list:
+        cursor = tournament_docs.find({"status": "open"}, {"matches": 0, "standings": 0}).sort("created_at", -1).limit(limit)
+        return [cls.public(doc) async for doc in cursor]
+
+    @classmethod
+    async def join(cls, tournament_id: str, team_id: str):
+        """
+        Atomically add a participant to an open tournament.
+        Returns (tournament, added); tournament is None if it isn't open.
+        """
+        before = await tournament_docs.find_one_and_update(
+            {"_id": tournament_id, "status": "open"},
+            {"$addToSet": {"participants": team_id}},
+            return_document=ReturnDocument.BEFORE
+        )
+        if before is None:
+            return None, False
+        added = team_id not in before["participants"]
+        if added:
+            before["participants"].append(team_id)
+        return cls.public(before), added
+
+    @staticmethod
+    def lease():
+        return {"id": RUNNER_ID, "heartbeat": datetime.utcnow()}
+
+    @classmethod
+    async def begin(cls, tournament_id: str, seeds: list):
+        """open -> in_progress, taking the runner lease (None if it was not open)"""
+        return cls.public(await tournament_docs.find_one_and_update(
+            {"_id": tournament_id, "status": "open"},
+            {"$set": {"status": "in_progress", "seeds": seeds, "runner": cls.lease(), "started_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        ))
+
+    @classmethod
+    async def claim(cls, tournament_id: str):
+        """Take over a failed tournament, or one whose runner stopped heartbeating (None if neither)"""
+        stale = datetime.utcnow() - timedelta(seconds=TOURNAMENT_LEASE)
+        return cls.public(await tournament_docs.find_one_and_update(
+            {"_id": tournament_id, "$or": [
+                {"status": "failed"},
+                {"status": "in_progress", "runner.heartbeat": {"$lt": stale}}
+            ]},
+            {"$set": {"status": "in_progress", "runner": cls.lease()}, "$unset": {"error": ""}},
+            return_document=ReturnDocument.AFTER
+        ))
+
+    @classmethod
+    async def stale_ids(cls) -> list:
+        stale = datetime.utcnow() - timedelta(seconds=TOURNAMENT_LEASE)
+        cursor = tournament_docs.find({"status": "in_progress", "runner.heartbeat": {"$lt": stale}}, {"_id": 1})
+        return [doc["_id"] async for doc in cursor]
+
+    @classmethod
+    async def update(cls, tournament_id: str, fields: dict = None, push_match: dict = None):
+        """Write as the lease holder (heartbeat included); LeaseLost if another worker took over"""
+        update = {"$set": {**(fields or {}), "runner.heartbeat": datetime.utcnow()}}
+        if push_match is not None:
+            update["$push"] = {"matches": push_match}
+        result = await tournament_docs.update_one({"_id": tournament_id, "runner.id": RUNNER_ID}, update)
+        if result.matched_count == 0:
+            raise LeaseLost(tournament_id)
+
+
+async def play_match(team1_id: str, team2_id: str) -> dict:
+    """Quick AI vs AI match: each team gets PLAYS_PER_TEAM offensive plays"""
+    scores = {team1_id: 0, team2_id: 0}
+    plays = []
+
+    for play_num in range(PLAYS_PER_TEAM):
+        for team_id in (team1_id, team2_id):
+            # Only the offensive call decides the yards (no defense call needed)
+            offense_play = await get_ai_decision_async({"down": 1, "yards_to_go": 10}, "offense")
+            yards = random.randint(-2, 15) if offense_play["play"] == "PASS" else random.randint(1, 8)
+            if yards > 10:
+                scores[team_id] += 7
+            plays.append({"team": team_id, "play": offense_play["play"], "yards": yards})
+
+    team1_score, team2_score = scores[team1_id], scores[team2_id]
+    return {
+        "team1": team1_id,
+        "team2": team2_id,
+        "team1_score": team1_score,
+        "team2_score": team2_score,
+        "winner": team1_id if team1_score > team2_score else (team2_id if team2_score > team1_score else "TIE"),
+        "plays": plays
+    }
+
+
+def tournament_format(tournament: dict):
+    """Format instance for a tournament (ValueError on bad format/options)"""
+    return build_format(
+        tournament["format"],
+        tournament.get("seeds") or tournament["participants"],
+        **tournament.get("format_options", {})
+    )
+
+
+def progress(round_num: int, done: int, total: int) -> dict:
+    return {
+        "round": round_num,
+        "matches_done": done,
+        "matches_total": max(total, done),
+        "percent": min(round(100.0 * done / total, 1), 100.0) if total else 100.0
+    }
+
+
+async def keep_lease(tournament_id: str):
+    """Heartbeat while matches are running (a single match can outlast the lease)"""
+    try:
+        while True:
+            await asyncio.sleep(TOURNAMENT_LEASE / 3)
+            await TournamentStore.update(tournament_id)
+    except LeaseLost:
+        pass  # run_tournament notices on its next write
+
+
+async def run_tournament(tournament: dict, concurrency: int = TOURNAMENT_CONCURRENCY):
+    """Play round after round from wherever the tournament left off, `concurrency` matches at a time"""
+    tournament_id = tournament["id"]
+    slots = asyncio.Semaphore(concurrency)
+    matches = list(tournament["matches"])
+    heartbeat = asyncio.create_task(keep_lease(tournament_id))
+
+    async def run_match(team1_id, team2_id, round_num):
+        if team2_id is None:
+            match = {"team1": team1_id, "team2": None, "bye": True, "winner": team1_id,
+                     "team1_score": 0, "team2_score": 0, "plays": []}
+        else:
+            async with slots:
+                match = await play_match(team1_id, team2_id)
+        match["round"] = round_num
+        matches.append(match)
+        await TournamentStore.update(tournament_id, {"progress": progress(round_num, len(matches), total)}, push_match=match)
+
+    try:
+        fmt = tournament_format(tournament)
+        total = fmt.estimated_matches()
+        if matches:
+            print(f"LOG:> 🔁 Resuming tournament {tournament_id} after {len(matches)} matches")
+        while True:
+            round_num, pairs = resume_round(fmt, matches)
+            if not pairs:
+                break
+            await TournamentStore.update(tournament_id, {"round": round_num, "progress": progress(round_num, len(matches), total)})
+            try:
+                # One match failing (or the lease going) cancels the rest of the round
+                async with asyncio.TaskGroup() as round_matches:
+                    for team1_id, team2_id in pairs:
+                        round_matches.create_task(run_match(team1_id, team2_id, round_num))
+            except ExceptionGroup as failed:
+                raise failed.exceptions[0]
+            await TournamentStore.update(tournament_id, {"standings": fmt.standings(matches)})
+
+        await TournamentStore.update(tournament_id, {
+            "status": "completed",
+            "winner": fmt.winner(matches),
+            "progress": progress(round_num - 1, len(matches), len(matches)),
+            "finished_at": datetime.utcnow()
+        })
+        print(f"LOG:> 🏆 Tournament {tournament_id} complete ({tournament['format']}, "
+              f"{round_num - 1} rounds, {len(matches)} matches)")
+    except LeaseLost:
+        print(f"LOG:> ⚠️ Tournament {tournament_id} was taken over by another worker")
+    except Exception as e:
+        print(f"LOG:> ❌ Tournament {tournament_id} failed: {e}")
+        try:
+            await TournamentStore.update(tournament_id, {"status": "failed", "error": str(e)})
+        except Exception:
+            pass  # Lease lost or Mongo down: the resumer retries once the lease is stale
+    finally:
+        heartbeat.cancel()
+
+
+_running = {}  # tournament id -> asyncio.Task (keeps the task referenced)
+
+
+def start(tournament: dict) -> asyncio.Task:
+    """Run a tournament (already begun or claimed by this worker) in the background"""
+    task = asyncio.create_task(run_tournament(tournament))
+    _running[tournament["id"]] = task
+    task.add_done_callback(lambda _: _running.pop(tournament["id"], None))
+    return task
+
+
+async def resume_stale():
+    """Claim and restart every tournament whose runner went away"""
+    for tournament_id in await TournamentStore.stale_ids():
+        if tournament_id in _running:
+            continue
+        tournament = await TournamentStore.claim(tournament_id)
+        if tournament:
+            start(tournament)
+
+
+async def run_resumer(interval: float = TOURNAMENT_LEASE / 2):
+    while True:
+        try:
+            await resume_stale()
+        except Exception as e:
+            print(f"LOG:> ⚠️ Tournament resumer: {e}")
+        await asyncio.sleep(interval)
@@ -26,43 +26,49 @@ async def test_backend():
         team_id = team["_id"]
         print(f"Found Team: {team['name']} ({team_id})")
 
-    # 2. Insert Dummy Drive
+    # 2. Insert Dummy Drive (payload + summary share the same _id)
+    drive_id = ObjectId()
+    created_at = datetime.utcnow()
     drive_data = {
+        "_id": drive_id,
         "team_id": team_id,
-        "team_name": team.get("name", "Test Team"),
+        "created_at": created_at,
+        "replay": {"v": 1, "scale": 10000, "play_count": 0, "store": "gridfs"}, # Empty for test
+        "logs": ["Log 1", "Log 2"]
+    }
+    summary_data = {
+        "_id": drive_id,
+        "team_id": team_id,
+        "team_name": team.get("name", "Test Team") if team else "Test Team",
         "opponent": "Commanders",
         "outcome": "win",
         "score": "24-17",
         "xp_earned": 100,
-        "created_at": datetime.utcnow(),
-        "frames": [], # Empty for test
-        "logs": ["Log 1", "Log 2"],
-        "stats": {"plays": 10}
+        "created_at": created_at,
+        "stats": {"plays": 10},
+        "moltbook_url": None
     }
     
-    res = await db.drives.insert_one(drive_data)
-    drive_id = res.inserted_id
+    await db.drives.insert_one(drive_data)
+    await db.drive_summaries.insert_one(summary_data)
     print(f"Inserted Drive: {drive_id}")
     
     # 3. Verify Fetch (Simulation of API)
     # Get History
-    cursor = db.drives.find(
-        {"team_id": team_id},
-        {"frames": 0, "logs": 0}
-    ).sort("created_at", -1)
+    cursor = db.drive_summaries.find({"team_id": team_id}).sort("created_at", -1)
     
     print("\n--- Drive History (API /teams/{id}/drives) ---")
     async for drive in cursor:
         print(f"- {drive['created_at']} | {drive['outcome'].upper()} {drive['score']} vs {drive['opponent']} (ID: {drive['_id']})")
-        if "frames" in drive:
-            print("  ERROR: Frames included in history list!")
+        if "frames" in drive or "replay" in drive:
+            print("  ERROR: Replay included in history list!")
             
     # Get Single Drive
     print(f"\n--- Single Replay (API /drives/{drive_id}) ---")
     replay = await db.drives.find_one({"_id": drive_id})
     if replay:
         print(f"Found Replay: {replay['_id']}")
-        print(f"Frames Count: {len(replay['frames'])}")
+        print(f"Play Count: {replay['replay']['play_count']}")
         print(f"Logs Count: {len(replay['logs'])}")
     else:
         print("ERROR: Replay not found.")